@@ -0,0 +1,115 @@
+from collections.abc import Mapping
+
+
+def frozen_value(value):
+    """
+    Immutable and hashable copy of a result value.
+
+    Args:
+        value: Scalar, list, tuple or array (e.g. of numpy), nested to any depth.
+
+    Returns:
+        Scalars unchanged, lists and arrays as nested tuples.
+    """
+    if hasattr(value, 'tolist') and hasattr(value, 'ndim'):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return tuple(frozen_value(item) for item in value)
+    return value
+
+
+def thawed_value(value):
+    """
+    Result value with the nested tuples of frozen_value() as nested lists.
+
+    Args:
+        value: Scalar or nested tuple.
+
+    Returns:
+        Scalars unchanged, tuples as nested lists.
+    """
+    if isinstance(value, tuple):
+        return [thawed_value(item) for item in value]
+    return value
+
+
+# ======================================================================================
+#                   COST RESULT
+# ======================================================================================
+
+
+class CostResult(Mapping):
+    # Position of every result name per layout, shared by all results with the same names (e.g. of one category)
+    _layouts = {}
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, values=(), **kwargs):
+        """
+        Initialize an immutable snapshot of the results of one calc_costs() call.
+
+        A CostResult is read like the former result dictionaries (e.g. result['cost per pkm'] or result.items()),
+        but cannot be changed, so it can be shared by several ExternalCostsCalculators and cached without copies.
+        Lists and arrays (e.g. the costs by energy type, also per sample) are stored as nested tuples, see frozen_value().
+
+        Args:
+            values (dict): Results per name.
+            **kwargs: Further results per name.
+        """
+        values = dict(values, **kwargs)
+        names = tuple(values)
+        layout = CostResult._layouts.get(names)
+        if layout is None:
+            layout = CostResult._layouts.setdefault(names, {name: position for position, name in enumerate(names)})
+
+        object.__setattr__(self, '_layout', layout)
+        object.__setattr__(self, '_values', tuple(frozen_value(value) for value in values.values()))
+
+    def __getitem__(self, name):
+        return self._values[self._layout[name]]
+
+    def __iter__(self):
+        return iter(self._layout)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, name):
+        return name in self._layout
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __hash__(self):
+        return hash((tuple(self._layout), self._values))
+
+    def __reduce__(self):
+        # Rebuilt from a dictionary, e.g. when a result is sent back from a worker process
+        return (type(self), (dict(zip(self._layout, self._values)),))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({dict(zip(self._layout, self._values))!r})'
+
+    def replace(self, **changes):
+        """
+        New result with some values replaced, this result stays unchanged.
+
+        Args:
+            **changes: New values per result name.
+
+        Returns:
+            CostResult: Result with the changed values.
+        """
+        return type(self)(dict(zip(self._layout, self._values)), **changes)
+
+    def to_dict(self):
+        """
+        Results as a new dictionary, e.g. for JSON serialization.
+
+        Returns:
+            dict: Results per name, nested tuples as nested lists.
+        """
+        return {name: thawed_value(value) for name, value in zip(self._layout, self._values)}
@@ -0,0 +1,135 @@
+import os
+import sys
+import numpy as np
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+# Pure rate of time preference of the time preference methods, the cost rates of the methods are the nodes of the interpolation
+time_preference_rates = {
+    '0_time_pref': 0.0,
+    '1_time_pref': 0.01,
+}
+
+# Interpolation between the nodes: linear in the logarithm of the cost rates (discounting is exponential) or linear
+interpolation_methods = ['log', 'linear']
+
+
+# ======================================================================================
+#                   COST RATE INTERPOLATION
+# ======================================================================================
+
+
+def interpolate_cost_rates(discount_rates, node_rates, node_values, interpolation='log'):
+    """
+    Interpolate cost rates between the discount rates of the time preference methods.
+
+    At the nodes the cost rates of the methods are returned unchanged, so a sweep over the node rates
+    reproduces the results of the time preference methods. Discount rates outside the nodes are rejected.
+
+    Args:
+        discount_rates (np.ndarray): Discount rates to evaluate, e.g. np.linspace(0, 0.01, 11).
+        node_rates (list): Discount rates of the nodes in ascending order, e.g. [0.0, 0.01].
+        node_values (np.ndarray): Cost rates of the nodes, shape (nodes, ...), e.g. one rate per energy type.
+        interpolation (str): 'log' or 'linear'.
+
+    Returns:
+        np.ndarray: Cost rates with the discount rates on the last axis, shape (..., discount rates).
+    """
+    discount_rates = np.atleast_1d(np.asarray(discount_rates, dtype=np.float64))
+    node_rates = np.asarray(node_rates, dtype=np.float64)
+    node_values = np.asarray(node_values, dtype=np.float64)
+
+    if interpolation not in interpolation_methods:
+        raise ValueError(f"Unknown interpolation '{interpolation}', expected one of {', '.join(interpolation_methods)}.")
+    if np.any(np.diff(node_rates) <= 0):
+        raise ValueError("The discount rates of the nodes have to be ascending.")
+    if np.any(discount_rates < node_rates[0]) or np.any(discount_rates > node_rates[-1]):
+        raise ValueError(f"Discount rates have to be between {node_rates[0]} and {node_rates[-1]}, the rates of the time preference methods.")
+    if interpolation == 'log' and np.any(node_values <= 0):
+        raise ValueError("Logarithmic interpolation requires positive cost rates.")
+
+    # Interval of every discount rate and the position within it
+    lower = np.clip(np.searchsorted(node_rates, discount_rates, side='right') - 1, 0, len(node_rates) - 2)
+    position = (discount_rates - node_rates[lower]) / (node_rates[lower + 1] - node_rates[lower])
+    position = position.reshape((-1,) + (1,) * (node_values.ndim - 1))
+
+    lower_values = node_values[lower]
+    upper_values = node_values[lower + 1]
+    if interpolation == 'log':
+        values = np.exp((1 - position) * np.log(lower_values) + position * np.log(upper_values))
+    else:
+        values = (1 - position) * lower_values + position * upper_values
+
+    # Exact cost rates of the methods at the nodes
+    values = np.where(position == 0, lower_values, np.where(position == 1, upper_values, values))
+    return np.moveaxis(values, 0, -1)
+
+
+def time_preference_cost_rates(input_object, cost_rate_attributes, discount_rates, keys=None, interpolation='log'):
+    """
+    Interpolate the cost rates of the time preference methods of a calculator.
+
+    Args:
+        input_object: Input instance of the calculator, e.g. InputClimateChange.
+        cost_rate_attributes (dict): Attribute with the cost rate per time preference method, e.g. ClimateChangeCalculator.COST_RATES.
+        discount_rates (np.ndarray): Discount rates to evaluate.
+        keys (list): Keys of cost rates given per key, e.g. the energy types (default: the cost rates are scalars).
+        interpolation (str): 'log' or 'linear'.
+
+    Returns:
+        np.ndarray: Cost rates of shape (discount rates,), or (keys, discount rates) if keys are given.
+    """
+    methods = sorted(cost_rate_attributes, key=time_preference_rates.get)
+    node_values = [getattr(input_object, cost_rate_attributes[method]) for method in methods]
+    if keys is not None:
+        node_values = [[values[key] for key in keys] for values in node_values]
+
+    return interpolate_cost_rates(discount_rates, [time_preference_rates[method] for method in methods], node_values, interpolation)
+
+
+# ======================================================================================
+#                   DISCOUNT RATE SWEEP
+# ======================================================================================
+
+
+def discount_rate_sweep(discount_rates, modes=None, interpolation='log'):
+    """
+    Evaluate the climate change and upstream processes costs for all discount rates in one vectorized pass per category.
+
+    Args:
+        discount_rates (np.ndarray): Discount rates to evaluate.
+        modes (list): Vehicle modes (default: all modes of the calculators).
+        interpolation (str): 'log' or 'linear'.
+
+    Returns:
+        pd.DataFrame: One row per category, mode and discount rate with the columns 'category', 'mode',
+            'discount_rate' and the cost columns.
+    """
+    import pandas as pd
+    from calculation.external_costs_calculator import cost_columns
+    from calculation.external_costs.climate_change import ClimateChangeCalculator
+    from calculation.external_costs.upstream_processes import UpstreamProcessesCalculator
+
+    discount_rates = np.atleast_1d(np.asarray(discount_rates, dtype=np.float64))
+
+    frames = []
+    for calculator in [ClimateChangeCalculator(), UpstreamProcessesCalculator()]:
+        category_modes = list(calculator.modes) if modes is None else modes
+        costs = calculator.calc_costs_sweep(discount_rates, category_modes, interpolation)
+        frames.append(pd.DataFrame({
+            'category': calculator.tag,
+            'mode': np.repeat(category_modes, len(discount_rates)),
+            'discount_rate': np.tile(discount_rates, len(category_modes)),
+            **{column: costs[column].ravel() for column in cost_columns},
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    sweep = discount_rate_sweep(np.linspace(0, 0.01, 11))
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(sweep[sweep['mode'] == 'shared_pedelec'])
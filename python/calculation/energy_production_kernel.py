@@ -0,0 +1,168 @@
+import numpy as np
+
+
+# ======================================================================================
+#                   ENERGY PRODUCTION COSTS
+# ======================================================================================
+
+
+def sequential_sum(values, axis=-1):
+    """
+    Sum along an axis from left to right, matching Python's built-in sum() bit for bit.
+
+    np.sum() uses pairwise summation, which rounds differently than the former per-energy-type loops.
+
+    Args:
+        values (np.ndarray): Values to sum.
+        axis (int): Axis of the sum.
+
+    Returns:
+        np.ndarray: Sums with the axis removed.
+    """
+    return np.take(np.cumsum(values, axis=axis), -1, axis=axis)
+
+
+def broadcast_modes(values, ndim, trailing_axes=0):
+    """
+    Shape values per mode to broadcast against an array with the modes on the first axis.
+
+    Values of shape (modes, samples), e.g. drawn by the Monte Carlo engine, are aligned with the
+    sample axis, which is the last axis before 'trailing_axes' (e.g. the energy types).
+
+    Args:
+        values (np.ndarray): Values of shape (modes,) or (modes, samples).
+        ndim (int): Number of dimensions of the array to broadcast against.
+        trailing_axes (int): Number of axes after the sample axis.
+
+    Returns:
+        np.ndarray: float64 values with the same number of dimensions as the array.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    shape = (values.shape[0],) + (1,) * (ndim - trailing_axes - values.ndim) + values.shape[1:] + (1,) * trailing_axes
+    return values.reshape(shape)
+
+
+def energy_type_axis(values):
+    """
+    Append an axis for the energy types to sampled values, so that they broadcast against costs by energy type.
+
+    Args:
+        values: Scalar, or array with the samples on the last axis.
+
+    Returns:
+        Scalars unchanged, arrays with an additional last axis.
+    """
+    return np.expand_dims(values, -1) if np.ndim(values) else values
+
+
+def costs_per_year_and_pkm(costs_vkm, annual_mileage, occupancy_rate, trailing_axes=0):
+    """
+    Convert costs per vkm into costs per year and per pkm for every mode.
+
+    Args:
+        costs_vkm (np.ndarray): Costs in €-ct/vkm with the modes on the first axis.
+        annual_mileage (np.ndarray): Annual mileage per mode in vkm, shape (modes,) or (modes, samples).
+        occupancy_rate (np.ndarray): Occupancy rate per mode, shape (modes,) or (modes, samples).
+        trailing_axes (int): Number of axes of 'costs_vkm' after the sample axis, e.g. 1 for the costs by energy type.
+
+    Returns:
+        tuple: Costs in €/year and in €-ct/pkm, both shaped like 'costs_vkm'.
+    """
+    annual_mileage = broadcast_modes(annual_mileage, np.ndim(costs_vkm), trailing_axes)
+    occupancy_rate = broadcast_modes(occupancy_rate, np.ndim(costs_vkm), trailing_axes)
+
+    costs_year = costs_vkm * annual_mileage * 1 / 100
+    costs_pkm = costs_year * 100 / (annual_mileage * occupancy_rate)
+    return costs_year, costs_pkm
+
+
+def energy_production_costs(power_mix_share, cost_rates, consumption_driving_vkm, consumption_idling_vkm, annual_mileage, occupancy_rate,
+                            net_loss_factor, charging_loss_factor, direct_costs_vkm=(), power_mix_share_idling=None):
+    """
+    Calculate the costs of the energy production for several modes and cost rate sets in one call.
+
+    The costs per vkm of an energy type are the power consumption times its share in the power mix times
+    its cost rate, increased by the net and charging losses. Direct costs per vkm (e.g. exhaust and abrasion)
+    are added to the total costs. The order of operations follows the former per-energy-type loops of
+    the climate change and air pollution calculators, so the results are identical.
+
+    The power mix is either the same for all modes or given per mode, e.g. weighted with the charging
+    profile of each mode (see HourlyPowerMix). The idling consumption can have its own power mix.
+
+    Cost rates, values per mode and loss factors may have an additional sample axis, e.g. drawn by the
+    Monte Carlo engine. The results then have the samples on the axis after the rate sets.
+
+    Args:
+        power_mix_share (np.ndarray): Share of each energy type in the power mix, shape (energy types,) or (modes, energy types).
+        cost_rates (np.ndarray): Cost rates in €-ct/kWh, shape (energy types, rate sets) or (energy types, rate sets, samples),
+            e.g. one rate set per time preference.
+        consumption_driving_vkm (np.ndarray): Power consumption driving in kWh/vkm, shape (modes,) or (modes, samples).
+        consumption_idling_vkm (np.ndarray): Power consumption idling in kWh/vkm, shape (modes,) or (modes, samples).
+        annual_mileage (np.ndarray): Annual mileage in vkm, shape (modes,) or (modes, samples).
+        occupancy_rate (np.ndarray): Occupancy rate, shape (modes,) or (modes, samples).
+        net_loss_factor (float): Loss factor of the power grid, or an array of samples.
+        charging_loss_factor (float): Loss factor of charging, or an array of samples.
+        direct_costs_vkm (list): Direct costs in €-ct/vkm added to the total costs, each of shape (modes,) or (modes, samples).
+        power_mix_share_idling (np.ndarray): Power mix of the idling consumption, shaped like 'power_mix_share' (default: 'power_mix_share').
+
+    Returns:
+        dict: Costs per vkm, pkm and year (total, driving and idling) of shape (modes, rate sets[, samples]), and the costs
+            by energy type of shape (modes, rate sets[, samples], energy types), keyed like the calculator results.
+    """
+    cost_rates = np.asarray(cost_rates, dtype=np.float64)
+    energy_types = cost_rates.shape[0]
+
+    # Sample axis after the rate sets if any input is sampled
+    per_mode_values = [consumption_driving_vkm, consumption_idling_vkm, annual_mileage, occupancy_rate, *direct_costs_vkm]
+    if cost_rates.ndim == 2 and (any(np.ndim(values) > 1 for values in per_mode_values) or np.ndim(net_loss_factor) or np.ndim(charging_loss_factor)):
+        cost_rates = cost_rates[:, :, np.newaxis]
+    ndim = cost_rates.ndim
+
+    # Cost rates with the energy types last, shape (rate sets[, samples], energy types)
+    cost_rates = np.moveaxis(cost_rates, 0, -1)
+    consumption_driving_vkm = broadcast_modes(consumption_driving_vkm, ndim)
+    consumption_idling_vkm = broadcast_modes(consumption_idling_vkm, ndim)
+
+    # Costs of the power mix per kWh for every energy type and rate set, shape (modes or 1, rate sets[, samples], energy types)
+    power_mix_costs_driving = np.asarray(power_mix_share, dtype=np.float64).reshape((-1,) + (1,) * (ndim - 1) + (energy_types,)) * cost_rates
+    power_mix_cost_total_driving = sequential_sum(power_mix_costs_driving)
+    if power_mix_share_idling is None:
+        power_mix_costs_idling = power_mix_costs_driving
+        power_mix_cost_total_idling = power_mix_cost_total_driving
+    else:
+        power_mix_costs_idling = np.asarray(power_mix_share_idling, dtype=np.float64).reshape((-1,) + (1,) * (ndim - 1) + (energy_types,)) * cost_rates
+        power_mix_cost_total_idling = sequential_sum(power_mix_costs_idling)
+
+    # Costs by energy type in €-ct/vkm, shape (modes, rate sets[, samples], energy types)
+    net_loss_factor_by_energy_type = energy_type_axis(net_loss_factor)
+    charging_loss_factor_by_energy_type = energy_type_axis(charging_loss_factor)
+    energy_production_costs_driving = consumption_driving_vkm[..., np.newaxis] * power_mix_costs_driving * net_loss_factor_by_energy_type * charging_loss_factor_by_energy_type
+    energy_production_costs_idling = consumption_idling_vkm[..., np.newaxis] * power_mix_costs_idling * net_loss_factor_by_energy_type * charging_loss_factor_by_energy_type
+    costs_vkm_by_energy_type = energy_production_costs_driving + energy_production_costs_idling
+
+    # Costs of the entire power mix in €-ct/vkm, shape (modes, rate sets[, samples])
+    costs_vkm = {
+        ' driving': power_mix_cost_total_driving * consumption_driving_vkm * net_loss_factor * charging_loss_factor,
+        ' idling': power_mix_cost_total_idling * consumption_idling_vkm * net_loss_factor * charging_loss_factor,
+    }
+    if power_mix_share_idling is None:
+        costs_vkm[''] = power_mix_cost_total_driving * (consumption_driving_vkm + consumption_idling_vkm) * net_loss_factor * charging_loss_factor
+    else:
+        costs_vkm[''] = costs_vkm[' driving'] + costs_vkm[' idling']
+    costs_vkm = {suffix: costs_vkm[suffix] for suffix in ['', ' driving', ' idling']}
+    for direct_costs in direct_costs_vkm:
+        costs_vkm[''] = costs_vkm[''] + broadcast_modes(direct_costs, ndim)
+
+    costs_year_and_pkm = {suffix: costs_per_year_and_pkm(costs_component_vkm, annual_mileage, occupancy_rate) for suffix, costs_component_vkm in costs_vkm.items()}
+
+    # Keys in the order of the calculator results: all costs per vkm, then per pkm, then per year
+    costs = {f'cost per vkm{suffix}': costs_component_vkm for suffix, costs_component_vkm in costs_vkm.items()}
+    costs.update({f'cost per pkm{suffix}': costs_pkm for suffix, (_, costs_pkm) in costs_year_and_pkm.items()})
+    costs.update({f'cost per year{suffix}': costs_year for suffix, (costs_year, _) in costs_year_and_pkm.items()})
+
+    costs_year_by_energy_type, costs_pkm_by_energy_type = costs_per_year_and_pkm(costs_vkm_by_energy_type, annual_mileage, occupancy_rate, trailing_axes=1)
+    costs['Energy production cost per vkm by energy type'] = costs_vkm_by_energy_type
+    costs['Energy production cost per pkm by energy type'] = costs_pkm_by_energy_type
+    costs['Energy production cost per year by energy type'] = costs_year_by_energy_type
+    return costs
+
@@ -5,65 +5,43 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_air_pollution import InputAirPollution
+from calculation.energy_production_kernel import energy_production_costs, costs_per_year_and_pkm, broadcast_modes
+from calculation.mode_table import registry_mode_table, costs_table, select_row, check_calculator
+from calculation.cost_result import CostResult
 
 class AirPollutionCalculator:
     ENERGY_TYPES = ['Water power', 'Wind energy', 'Solar power', 'Bio mass', 'Brown coal', 'Black coal', 'Gas', 'Oil', 'Nuclear energy']
 
-    def __init__(self, mode='private_bicycle', method='advanced'):
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'power_consumption_driving_vkm': 'power_consumption_driving_vkm',
+        'power_consumption_idling_vkm': 'power_consumption_idling_vkm',
+        'exhaust_cost': 'exhaust_cost',
+        'abrasion_cost': 'abrasion_cost',
+        'annual_mileage': 'annual_mileage',
+        'occupancy_rate': 'occupancy_rate',
+    }
+
+    def __init__(self, mode='private_bicycle', method='advanced', hourly_power_mix=None, registry=None):
         """
         Initialize AirPollutionCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'private_bicycle').
             method (str): Calculation method (default: 'advanced').
+            hourly_power_mix (HourlyPowerMix): Hourly power mix weighted with the load profiles of the modes
+                (default: the annual power mix share).
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_air_pollution = InputAirPollution()
+        self.hourly_power_mix = hourly_power_mix
+        self.input_air_pollution = InputAirPollution(registry)
         self.tag = 'Air Pollution'
-        self.result = {}
+        self.result = CostResult()
 
-        self.init_vehicle_modes()
-
-    def init_vehicle_modes(self):
-        """
-        Initialize vehicle modes and associated data.
-        """
-        # Initialize a dictionary of vehicle modes with associated data
-        self.modes = {
-            'private_bicycle': {
-                'power_consumption_driving_vkm': self.input_air_pollution.power_consumption_driving_vkm_private_bicycle,
-                'power_consumption_idling_vkm': self.input_air_pollution.power_consumption_idling_vkm_private_bicycle,
-                'exhaust_cost': self.input_air_pollution.exhaust_cost_private_bicycle,
-                'abrasion_cost': self.input_air_pollution.abrasion_cost_private_bicycle,
-                'annual_mileage': self.input_air_pollution.annual_mileage_private_bicycle,
-                'occupancy_rate': self.input_air_pollution.occupancy_rate_private_bicycle,
-            },
-            'shared_bicycle': {
-                'power_consumption_driving_vkm': self.input_air_pollution.power_consumption_driving_vkm_shared_bicycle,
-                'power_consumption_idling_vkm': self.input_air_pollution.power_consumption_idling_vkm_shared_bicycle,
-                'exhaust_cost': self.input_air_pollution.exhaust_cost_shared_bicycle,
-                'abrasion_cost': self.input_air_pollution.abrasion_cost_shared_bicycle,
-                'annual_mileage': self.input_air_pollution.annual_mileage_shared_bicycle,
-                'occupancy_rate': self.input_air_pollution.occupancy_rate_shared_bicycle,
-            },
-            'private_pedelec': {
-                'power_consumption_driving_vkm': self.input_air_pollution.power_consumption_driving_vkm_private_pedelec,
-                'power_consumption_idling_vkm': self.input_air_pollution.power_consumption_idling_vkm_private_pedelec,
-                'exhaust_cost': self.input_air_pollution.exhaust_cost_private_pedelec,
-                'abrasion_cost': self.input_air_pollution.abrasion_cost_private_pedelec,
-                'annual_mileage': self.input_air_pollution.annual_mileage_private_pedelec,
-                'occupancy_rate': self.input_air_pollution.occupancy_rate_private_pedelec,
-            },
-            'shared_pedelec': {
-                'power_consumption_driving_vkm': self.input_air_pollution.power_consumption_driving_vkm_shared_pedelec,
-                'power_consumption_idling_vkm': self.input_air_pollution.power_consumption_idling_vkm_shared_pedelec,
-                'exhaust_cost': self.input_air_pollution.exhaust_cost_shared_pedelec,
-                'abrasion_cost': self.input_air_pollution.abrasion_cost_shared_pedelec,
-                'annual_mileage': self.input_air_pollution.annual_mileage_shared_pedelec,
-                'occupancy_rate': self.input_air_pollution.occupancy_rate_shared_pedelec,
-            },
-        }
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_air_pollution.registry.modes
 
     def calc_costs(self):
         """
@@ -71,97 +49,79 @@ class AirPollutionCalculator:
 
         Returns:
             dict: Calculated air pollution costs.
-        """
-        if self.mode not in self.modes:
-            return {'mode': 0}
-
-        mode_data = self.modes[self.mode]
-        power_consumption_driving_vkm = mode_data['power_consumption_driving_vkm']
-        power_consumption_idling_vkm = mode_data['power_consumption_idling_vkm']
-        exhaust_cost = mode_data['exhaust_cost']
-        abrasion_cost = mode_data['abrasion_cost']
-        annual_mileage = mode_data['annual_mileage']
-        occupancy_rate = mode_data['occupancy_rate']
-
-        if self.method == 'advanced':
-
-                total_energy_production_costs_vkm_per_energy_type = []
-                total_energy_production_costs_pkm_per_energy_type = []
-                total_energy_production_costs_year_per_energy_type = []
-
-                # Calculate for the entire Power Mix
-                power_mix_cost_total = sum(self.input_air_pollution.power_mix_share[energy_type] * self.input_air_pollution.pollution_costs[energy_type] for energy_type in self.ENERGY_TYPES)
-
-                for energy_type in self.ENERGY_TYPES:
-                    pollution_cost = self.input_air_pollution.pollution_costs[energy_type]
-                    power_mix_share = self.input_air_pollution.power_mix_share[energy_type]
-
-                    energy_production_costs_driving = power_consumption_driving_vkm * (power_mix_share * pollution_cost) * self.input_air_pollution.net_loss_factor * self.input_air_pollution.charging_loss_factor
-                    energy_production_costs_idling = power_consumption_idling_vkm * (power_mix_share * pollution_cost) * self.input_air_pollution.net_loss_factor * self.input_air_pollution.charging_loss_factor
-
-                    total_energy_production_costs_vkm = energy_production_costs_driving + energy_production_costs_idling
-                    total_energy_production_costs_year = total_energy_production_costs_vkm * annual_mileage * 1 / 100 
-                    total_energy_production_costs_pkm = total_energy_production_costs_year * 100 * 1 / (annual_mileage * occupancy_rate) 
-
-                    total_energy_production_costs_vkm_per_energy_type.append(total_energy_production_costs_vkm)
-                    total_energy_production_costs_year_per_energy_type.append(total_energy_production_costs_year)
-                    total_energy_production_costs_pkm_per_energy_type.append(total_energy_production_costs_pkm)
-
-                # Calculate total air pollution costs in €-ct/vkm
-                total_air_pollution_costs_vkm_total = power_mix_cost_total * (power_consumption_driving_vkm + power_consumption_idling_vkm) * self.input_air_pollution.net_loss_factor * self.input_air_pollution.charging_loss_factor + exhaust_cost + abrasion_cost
-
-                # Calculate air pollution costs by energy production driving in €-ct/vkm
-                total_air_pollution_costs_vkm_driving = power_mix_cost_total * power_consumption_driving_vkm * self.input_air_pollution.net_loss_factor * self.input_air_pollution.charging_loss_factor 
-
-                # Calculate air pollution costs by energy production idling in €-ct/vkm
-                total_air_pollution_costs_vkm_idling = power_mix_cost_total * power_consumption_idling_vkm * self.input_air_pollution.net_loss_factor * self.input_air_pollution.charging_loss_factor 
-
-                # Calculate air pollution costs by abrasion in €-ct/vkm
-                total_air_pollution_costs_vkm_abrasion = abrasion_cost
 
-                # Calculate total air pollution costs in €/year
-                total_air_pollution_costs_year_total = total_air_pollution_costs_vkm_total * annual_mileage * 1 / 100
-
-                # Calculate total air pollution costs driving in €/year
-                total_air_pollution_costs_year_driving = total_air_pollution_costs_vkm_driving * annual_mileage * 1 / 100
-
-                # Calculate total air pollution costs idling in €/year
-                total_air_pollution_costs_year_idling = total_air_pollution_costs_vkm_idling * annual_mileage * 1 / 100
-
-                # Calculate air pollution costs by abrasion in €/year
-                total_air_pollution_costs_year_abrasion = total_air_pollution_costs_vkm_abrasion * annual_mileage * 1 / 100
-
-
-                # Calculate total air pollution costs in €-ct/pkm
-                total_air_pollution_costs_pkm_total = total_air_pollution_costs_year_total * 100 / (annual_mileage * occupancy_rate)
-
-                # Calculate total air pollution costs driving in €-ct/pkm
-                total_air_pollution_costs_pkm_driving = total_air_pollution_costs_year_driving * 100 / (annual_mileage * occupancy_rate)
+        Raises:
+            ValueError: If the mode or the method is not supported, see check_calculator().
+        """
+        check_calculator(self, ['advanced'])
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+        return self.result
 
-                # Calculate total air pollution costs idling in €-ct/pkm
-                total_air_pollution_costs_pkm_idling = total_air_pollution_costs_year_idling * 100 / (annual_mileage * occupancy_rate) 
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate air pollution costs for several modes at once on the mode table.
 
-                # Calculate air pollution costs by abrasion in €-ct/pkm
-                total_air_pollution_costs_pkm_abrasion = total_air_pollution_costs_year_abrasion * 100 / (annual_mileage * occupancy_rate) 
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        modes = list(self.modes) if modes is None else modes
+        costs = self.calc_costs_batch(modes)
+        return costs_table(modes, {name: values[:, 0] for name, values in costs.items()})
 
-                # Save results for the entire Power Mix
-                self.result['cost per vkm'] = total_air_pollution_costs_vkm_total
-                self.result['cost per vkm driving'] = total_air_pollution_costs_vkm_driving
-                self.result['cost per vkm idling'] = total_air_pollution_costs_vkm_idling
-                self.result['cost per vkm abrasion'] = total_air_pollution_costs_vkm_abrasion
-                self.result['cost per pkm'] = total_air_pollution_costs_pkm_total
-                self.result['cost per pkm driving'] = total_air_pollution_costs_pkm_driving
-                self.result['cost per pkm idling'] = total_air_pollution_costs_pkm_idling
-                self.result['cost per pkm abrasion'] = total_air_pollution_costs_pkm_abrasion
-                self.result['cost per year'] = total_air_pollution_costs_year_total
-                self.result['cost per year driving'] = total_air_pollution_costs_year_driving
-                self.result['cost per year idling'] = total_air_pollution_costs_year_idling
-                self.result['cost per year abrasion'] = total_air_pollution_costs_year_abrasion
+    def calc_costs_batch(self, modes=None):
+        """
+        Calculate air pollution costs of several modes in one call of the energy production kernel.
 
-                self.result['Energy production cost per vkm by energy type'] = total_energy_production_costs_vkm_per_energy_type
-                self.result['Energy production cost per pkm by energy type'] = total_energy_production_costs_pkm_per_energy_type
-                self.result['Energy production cost per year by energy type'] = total_energy_production_costs_year_per_energy_type
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
-                return self.result
-    
+        Returns:
+            dict: Costs keyed like the result of calc_costs(), arrays of shape (modes, 1)
+                and (modes, 1, energy types) for the costs by energy type.
+        """
+        table = registry_mode_table(self.input_air_pollution, self.MODE_FIELDS, modes)
+        modes = list(table['mode'])
+
+        pollution_costs = self.input_air_pollution.pollution_costs
+        annual_mileage = table['annual_mileage']
+        occupancy_rate = table['occupancy_rate']
+        abrasion_cost = table['abrasion_cost']
+
+        # Effective power mix of the charging and idling load profiles, or the annual power mix
+        if self.hourly_power_mix is None:
+            power_mix_share = self.input_air_pollution.power_mix_share
+            power_mix_share = [power_mix_share[energy_type] for energy_type in self.ENERGY_TYPES]
+            power_mix_share_idling = None
+        else:
+            power_mix_share = self.hourly_power_mix.share_matrix(modes, 'driving', self.ENERGY_TYPES)
+            power_mix_share_idling = self.hourly_power_mix.share_matrix(modes, 'idling', self.ENERGY_TYPES)
+
+        # Exhaust and abrasion costs are added to the total costs of the energy production
+        costs = energy_production_costs(
+            power_mix_share=power_mix_share,
+            cost_rates=[[pollution_costs[energy_type]] for energy_type in self.ENERGY_TYPES],
+            consumption_driving_vkm=table['power_consumption_driving_vkm'],
+            consumption_idling_vkm=table['power_consumption_idling_vkm'],
+            annual_mileage=annual_mileage,
+            occupancy_rate=occupancy_rate,
+            net_loss_factor=self.input_air_pollution.net_loss_factor,
+            charging_loss_factor=self.input_air_pollution.charging_loss_factor,
+            direct_costs_vkm=[table['exhaust_cost'], abrasion_cost],
+            power_mix_share_idling=power_mix_share_idling,
+        )
+
+        abrasion_costs_vkm = broadcast_modes(abrasion_cost, costs['cost per vkm'].ndim)
+        abrasion_costs_year, abrasion_costs_pkm = costs_per_year_and_pkm(abrasion_costs_vkm, annual_mileage, occupancy_rate)
+        abrasion_costs = {'vkm': abrasion_costs_vkm, 'pkm': abrasion_costs_pkm, 'year': abrasion_costs_year}
+
+        # Abrasion costs follow the idling costs of each unit, as in the calculator result
+        costs_with_abrasion = {}
+        for name, values in costs.items():
+            costs_with_abrasion[name] = values
+            if name.endswith(' idling'):
+                unit = name.split(' ')[2]
+                costs_with_abrasion[f'cost per {unit} abrasion'] = abrasion_costs[unit]
+        return costs_with_abrasion
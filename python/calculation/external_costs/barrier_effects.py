@@ -4,51 +4,35 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_barrier_effects import InputBarrierEffects
+from calculation.mode_table import registry_mode_table, costs_table, select_row, check_calculator
+from calculation.cost_result import CostResult
 
 class BarrierEffectsCalculator:
-    def __init__(self, mode='private_bicycle', method='advanced'):
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'barrier_effects_vkm_2022': 'barrier_effects_vkm_2022',
+        # Mileage in Munich of the shared modes
+        'annual_mileage': ('annual_mileage_Munich', 'annual_mileage'),
+        'occupancy_rate': 'occupancy_rate',
+    }
+
+    def __init__(self, mode='private_bicycle', method='advanced', registry=None):
         """
         Initialize BarrierEffectsCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'private_bicycle').
             method (str): Calculation method (default: 'advanced').
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_barrier_effects = InputBarrierEffects()
+        self.input_barrier_effects = InputBarrierEffects(registry)
         self.tag = 'Barrier Effects'
-        self.result = {}
+        self.result = CostResult()
 
-        self.init_vehicle_modes()
-
-    def init_vehicle_modes(self):
-        """
-        Initialize vehicle modes and associated data.
-        """
-        # Initialize a dictionary of vehicle modes with associated data
-        self.modes = {
-            'private_bicycle': {
-                'barrier_effects_vkm_2022': self.input_barrier_effects.barrier_effects_vkm_2022_private_bicycle,
-                'annual_mileage': self.input_barrier_effects.annual_mileage_private_bicycle,
-                'occupancy_rate': self.input_barrier_effects.occupancy_rate_private_bicycle,
-            },
-            'shared_bicycle': {
-                'barrier_effects_vkm_2022': self.input_barrier_effects.barrier_effects_vkm_2022_shared_bicycle,
-                'annual_mileage': self.input_barrier_effects.annual_mileage_Munich_shared_bicycle,
-                'occupancy_rate': self.input_barrier_effects.occupancy_rate_shared_bicycle,
-            },
-            'private_pedelec': {
-                'barrier_effects_vkm_2022': self.input_barrier_effects.barrier_effects_vkm_2022_private_pedelec,
-                'annual_mileage': self.input_barrier_effects.annual_mileage_private_pedelec,
-                'occupancy_rate': self.input_barrier_effects.occupancy_rate_private_pedelec,
-            },
-            'shared_pedelec': {
-                'barrier_effects_vkm_2022': self.input_barrier_effects.barrier_effects_vkm_2022_shared_pedelec,
-                'annual_mileage': self.input_barrier_effects.annual_mileage_Munich_shared_pedelec,
-                'occupancy_rate': self.input_barrier_effects.occupancy_rate_shared_pedelec,
-            },
-        }
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_barrier_effects.registry.modes
 
     def calc_costs(self):
         """
@@ -56,17 +40,33 @@ class BarrierEffectsCalculator:
 
         Returns:
             dict: Calculated barrier effects costs.
+
+        Raises:
+            ValueError: If the mode is not supported, see check_calculator().
+        """
+        check_calculator(self)
+
+        # Store the results in the 'result' dictionary
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+
+        # Return the calculated results
+        return self.result
+
+    def calc_costs_table(self, modes=None):
         """
-        # Calculate barrier effects costs based on the selected 'mode'
-        if self.mode not in self.modes:
-            # Return a default value if the mode is not recognized
-            return {'mode': 0}
+        Calculate barrier effects costs for several modes at once on the mode table.
+
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
-        mode_data = self.modes[self.mode]
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        table = registry_mode_table(self.input_barrier_effects, self.MODE_FIELDS, modes)
 
-        barrier_effects_vkm_2022 = mode_data['barrier_effects_vkm_2022']
-        annual_mileage = mode_data['annual_mileage']
-        occupancy_rate = mode_data['occupancy_rate']
+        barrier_effects_vkm_2022 = table['barrier_effects_vkm_2022']
+        annual_mileage = table['annual_mileage']
+        occupancy_rate = table['occupancy_rate']
 
         # Calculate total barrier effects costs per vehicle-kilometer (vkm) in €-ct2022/vkm
         total_barrier_effects_costs_vkm = barrier_effects_vkm_2022
@@ -84,13 +84,9 @@ class BarrierEffectsCalculator:
             * 100
             / (annual_mileage * occupancy_rate)
         )
-    
-        # Store the results in the 'result' dictionary
-        self.result['cost per vkm'] = total_barrier_effects_costs_vkm
-        self.result['cost per pkm'] = total_barrier_effects_costs_pkm
-        self.result['cost per year'] = total_barrier_effects_costs_year
-
-        # Return the calculated results
-        return self.result
-
 
+        return costs_table(table['mode'], {
+            'cost per vkm': total_barrier_effects_costs_vkm,
+            'cost per pkm': total_barrier_effects_costs_pkm,
+            'cost per year': total_barrier_effects_costs_year,
+        })
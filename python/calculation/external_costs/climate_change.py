@@ -4,57 +4,48 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_climate_change import InputClimateChange
+from calculation.energy_production_kernel import energy_production_costs
+from calculation.mode_table import registry_mode_table, costs_table, select_row, check_calculator
+from calculation.cost_result import CostResult
+from calculation.discount_rates import time_preference_cost_rates
 
 class ClimateChangeCalculator:
     ENERGY_TYPES = ['Water power', 'Wind energy', 'Solar power', 'Bio mass', 'Brown coal', 'Black coal', 'Gas', 'Oil', 'Nuclear energy']
 
-    def __init__(self, mode='private_bicycle', method='1_time_pref'):
+    # Climate cost rates of the time preference methods, one rate set of the energy production kernel each
+    COST_RATES = {
+        '0_time_pref': 'climate_costs_0_percent',
+        '1_time_pref': 'climate_costs_1_percent',
+    }
+
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'power_consumption_driving_vkm': 'power_consumption_driving_vkm',
+        'power_consumption_idling_vkm': 'power_consumption_idling_vkm',
+        'annual_mileage': 'annual_mileage',
+        'occupancy_rate': 'occupancy_rate',
+    }
+
+    def __init__(self, mode='private_bicycle', method='1_time_pref', hourly_power_mix=None, registry=None):
         """
         Initialize ClimateChangeCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'private_bicycle').
             method (str): Calculation method (default: '1_time_pref').
+            hourly_power_mix (HourlyPowerMix): Hourly power mix weighted with the load profiles of the modes
+                (default: the annual power mix share).
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_climate_change = InputClimateChange()
+        self.hourly_power_mix = hourly_power_mix
+        self.input_climate_change = InputClimateChange(registry)
         self.tag = 'Climate Change'
-        self.result = {}
+        self.result = CostResult()
 
-        self.init_vehicle_modes()
-
-    def init_vehicle_modes(self):
-        """
-        Initialize vehicle modes and associated data.
-        """
-        # Initialize a dictionary of vehicle modes with associated data
-        self.modes = {
-            'private_bicycle': {
-                'power_consumption_driving_vkm': self.input_climate_change.power_consumption_driving_vkm_private_bicycle,
-                'power_consumption_idling_vkm': self.input_climate_change.power_consumption_idling_vkm_private_bicycle,
-                'annual_mileage': self.input_climate_change.annual_mileage_private_bicycle,
-                'occupancy_rate': self.input_climate_change.occupancy_rate_private_bicycle,
-            },
-            'shared_bicycle': {
-                'power_consumption_driving_vkm': self.input_climate_change.power_consumption_driving_vkm_shared_bicycle,
-                'power_consumption_idling_vkm': self.input_climate_change.power_consumption_idling_vkm_shared_bicycle,
-                'annual_mileage': self.input_climate_change.annual_mileage_shared_bicycle,
-                'occupancy_rate': self.input_climate_change.occupancy_rate_shared_bicycle,
-            },
-            'private_pedelec': {
-                'power_consumption_driving_vkm': self.input_climate_change.power_consumption_driving_vkm_private_pedelec,
-                'power_consumption_idling_vkm': self.input_climate_change.power_consumption_idling_vkm_private_pedelec,
-                'annual_mileage': self.input_climate_change.annual_mileage_private_pedelec,
-                'occupancy_rate': self.input_climate_change.occupancy_rate_private_pedelec,
-            },
-            'shared_pedelec': {
-                'power_consumption_driving_vkm': self.input_climate_change.power_consumption_driving_vkm_shared_pedelec,
-                'power_consumption_idling_vkm': self.input_climate_change.power_consumption_idling_vkm_shared_pedelec,
-                'annual_mileage': self.input_climate_change.annual_mileage_shared_pedelec,
-                'occupancy_rate': self.input_climate_change.occupancy_rate_shared_pedelec,
-            },
-        }
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_climate_change.registry.modes
 
     def calc_costs(self):
         """
@@ -62,159 +53,94 @@ class ClimateChangeCalculator:
 
         Returns:
             dict: Calculated climate change costs.
-        """
-        # Calculate climate change costs based on the selected 'mode'
-        if self.mode not in self.modes:
-            # Return a default value if the mode is not recognized
-            return {'mode': 0}
-
-        mode_data = self.modes[self.mode]
-
-        power_consumption_driving_vkm = mode_data['power_consumption_driving_vkm']
-        power_consumption_idling_vkm = mode_data['power_consumption_idling_vkm']
-        annual_mileage = mode_data['annual_mileage']
-        occupancy_rate = mode_data['occupancy_rate']
-
-        if self.method == '0_time_pref':
-        
-                total_energy_production_costs_vkm_per_energy_type_0_percent = []
-                total_energy_production_costs_pkm_per_energy_type_0_percent = []
-                total_energy_production_costs_year_per_energy_type_0_percent = []
-
-                # Calculate for the entire Power Mix
-                power_mix_cost_total_0_percent = sum(self.input_climate_change.power_mix_share[energy_type] * self.input_climate_change.climate_costs_0_percent[energy_type] for energy_type in self.ENERGY_TYPES)
-
-                for energy_type in self.ENERGY_TYPES:
-                    climate_costs_0_percent = self.input_climate_change.climate_costs_0_percent[energy_type]
-                    power_mix_share = self.input_climate_change.power_mix_share[energy_type]
-
-                    energy_production_costs_driving_0_percent = power_consumption_driving_vkm * (power_mix_share * climate_costs_0_percent) * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
-                    energy_production_costs_idling_0_percent = power_consumption_idling_vkm * (power_mix_share * climate_costs_0_percent) * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
-
-                    total_energy_production_costs_vkm_0_percent = energy_production_costs_driving_0_percent + energy_production_costs_idling_0_percent
-                    total_energy_production_costs_year_0_percent = total_energy_production_costs_vkm_0_percent * annual_mileage * 1 / 100 
-                    total_energy_production_costs_pkm_0_percent = total_energy_production_costs_year_0_percent * 100 * 1 / (annual_mileage * occupancy_rate) 
-
-                    total_energy_production_costs_vkm_per_energy_type_0_percent.append(total_energy_production_costs_vkm_0_percent)
-                    total_energy_production_costs_year_per_energy_type_0_percent.append(total_energy_production_costs_year_0_percent)
-                    total_energy_production_costs_pkm_per_energy_type_0_percent.append(total_energy_production_costs_pkm_0_percent)
-
-                # Calculate total climate change costs in €-ct/vkm at 0% time preference rate
-                total_climate_change_costs_vkm_total_0_percent = power_mix_cost_total_0_percent * (power_consumption_driving_vkm + power_consumption_idling_vkm) * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
-
-                # Calculate climate change costs by energy production driving in €-ct/vkm  at 0% time preference rate
-                total_climate_change_costs_vkm_driving_0_percent = power_mix_cost_total_0_percent * power_consumption_driving_vkm * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor 
-
-                # Calculate climate change costs by energy production idling in €-ct/vkm at 0% time preference rate
-                total_climate_change_costs_vkm_idling_0_percent = power_mix_cost_total_0_percent * power_consumption_idling_vkm * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor 
-
-
-                # Calculate total climate change costs in €/year at 0% time preference rate
-                total_climate_change_costs_year_total_0_percent = total_climate_change_costs_vkm_total_0_percent * annual_mileage * 1 / 100
-
-                # Calculate total climate change costs driving in €/year at 0% time preference rate
-                total_climate_change_costs_year_driving_0_percent = total_climate_change_costs_vkm_driving_0_percent * annual_mileage * 1 / 100
-
-                # Calculate total climate change costs idling in €/year at 0% time preference rate
-                total_climate_change_costs_year_idling_0_percent = total_climate_change_costs_vkm_idling_0_percent * annual_mileage * 1 / 100
-
-
-                # Calculate total climate change costs in €-ct/pkm at 0% time preference rate
-                total_climate_change_costs_pkm_total_0_percent = total_climate_change_costs_year_total_0_percent * 100 / (annual_mileage * occupancy_rate)
-
-                # Calculate total climate change costs driving in €-ct/pkm at 0% time preference rate
-                total_climate_change_costs_pkm_driving_0_percent = total_climate_change_costs_year_driving_0_percent * 100 / (annual_mileage * occupancy_rate)
-
-                # Calculate total climate change costs idling in €-ct/pkm
-                total_climate_change_costs_pkm_idling_0_percent = total_climate_change_costs_year_idling_0_percent * 100 / (annual_mileage * occupancy_rate) 
-
-
-                # Save results for the entire Power Mix at 0% time preference rate
-                self.result['cost per vkm'] = total_climate_change_costs_vkm_total_0_percent
-                self.result['cost per vkm driving'] = total_climate_change_costs_vkm_driving_0_percent
-                self.result['cost per vkm idling'] = total_climate_change_costs_vkm_idling_0_percent
-                self.result['cost per pkm'] = total_climate_change_costs_pkm_total_0_percent
-                self.result['cost per pkm driving'] = total_climate_change_costs_pkm_driving_0_percent
-                self.result['cost per pkm idling'] = total_climate_change_costs_pkm_idling_0_percent
-                self.result['cost per year'] = total_climate_change_costs_year_total_0_percent
-                self.result['cost per year driving'] = total_climate_change_costs_year_driving_0_percent
-                self.result['cost per year idling'] = total_climate_change_costs_year_idling_0_percent
-
-                self.result['Energy production cost per vkm by energy type'] = total_energy_production_costs_vkm_per_energy_type_0_percent
-                self.result['Energy production cost per pkm by energy type'] = total_energy_production_costs_pkm_per_energy_type_0_percent
-                self.result['Energy production cost per year by energy type'] = total_energy_production_costs_year_per_energy_type_0_percent
 
-                return self.result
-            
-
-        if self.method == '1_time_pref':
-
-            total_energy_production_costs_vkm_per_energy_type_1_percent = []
-            total_energy_production_costs_pkm_per_energy_type_1_percent = []
-            total_energy_production_costs_year_per_energy_type_1_percent = []
-
-            # Calculate for the entire Power Mix
-            power_mix_cost_total_1_percent = sum(self.input_climate_change.power_mix_share[energy_type] * self.input_climate_change.climate_costs_1_percent[energy_type] for energy_type in self.ENERGY_TYPES)
-
-            for energy_type in self.ENERGY_TYPES:
-                climate_costs_1_percent = self.input_climate_change.climate_costs_1_percent[energy_type]
-                power_mix_share = self.input_climate_change.power_mix_share[energy_type]
-
-                energy_production_costs_driving_1_percent = power_consumption_driving_vkm * (power_mix_share * climate_costs_1_percent) * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
-                energy_production_costs_idling_1_percent = power_consumption_idling_vkm * (power_mix_share * climate_costs_1_percent) * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
-
-                total_energy_production_costs_vkm_1_percent = energy_production_costs_driving_1_percent + energy_production_costs_idling_1_percent
-                total_energy_production_costs_year_1_percent = total_energy_production_costs_vkm_1_percent * annual_mileage * 1 / 100
-                total_energy_production_costs_pkm_1_percent = total_energy_production_costs_year_1_percent * 100 * 1 / (annual_mileage * occupancy_rate)
-
-                total_energy_production_costs_vkm_per_energy_type_1_percent.append(total_energy_production_costs_vkm_1_percent)
-                total_energy_production_costs_year_per_energy_type_1_percent.append(total_energy_production_costs_year_1_percent)
-                total_energy_production_costs_pkm_per_energy_type_1_percent.append(total_energy_production_costs_pkm_1_percent)
-
-            # Calculate total climate change costs in €-ct/vkm at 1% time preference rate
-            total_climate_change_costs_vkm_total_1_percent = power_mix_cost_total_1_percent * (power_consumption_driving_vkm + power_consumption_idling_vkm) * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
+        Raises:
+            ValueError: If the mode or the method is not supported, see check_calculator().
+        """
+        check_calculator(self, list(self.COST_RATES))
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+        return self.result
 
-            # Calculate climate change costs by energy production driving in €-ct/vkm at 1% time preference rate
-            total_climate_change_costs_vkm_driving_1_percent = power_mix_cost_total_1_percent * power_consumption_driving_vkm * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate climate change costs of the selected 'method' for several modes at once on the mode table.
 
-            # Calculate climate change costs by energy production idling in €-ct/vkm at 1% time preference rate
-            total_climate_change_costs_vkm_idling_1_percent = power_mix_cost_total_1_percent * power_consumption_idling_vkm * self.input_climate_change.net_loss_factor * self.input_climate_change.charging_loss_factor
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        modes = list(self.modes) if modes is None else modes
+        costs = self.calc_costs_batch(modes, [self.method])
+        return costs_table(modes, {name: values[:, 0] for name, values in costs.items()})
 
-            # Calculate total climate change costs in €/year at 1% time preference rate
-            total_climate_change_costs_year_total_1_percent = total_climate_change_costs_vkm_total_1_percent * annual_mileage * 1 / 100
+    def calc_costs_batch(self, modes=None, methods=None):
+        """
+        Calculate climate change costs of several modes and time preferences in one call of the energy production kernel.
 
-            # Calculate total climate change costs driving in €/year at 1% time preference rate
-            total_climate_change_costs_year_driving_1_percent = total_climate_change_costs_vkm_driving_1_percent * annual_mileage * 1 / 100
+        Args:
+            modes (list): Vehicle modes (default: all modes).
+            methods (list): Time preference methods, '0_time_pref' and/or '1_time_pref' (default: both).
 
-            # Calculate total climate change costs idling in €/year at 1% time preference rate
-            total_climate_change_costs_year_idling_1_percent = total_climate_change_costs_vkm_idling_1_percent * annual_mileage * 1 / 100
+        Returns:
+            dict: Costs keyed like the result of calc_costs(), arrays of shape (modes, methods)
+                and (modes, methods, energy types) for the costs by energy type.
+        """
+        methods = list(self.COST_RATES) if methods is None else methods
+        climate_costs = [getattr(self.input_climate_change, self.COST_RATES[method]) for method in methods]
 
+        return self.calc_energy_production_costs(modes, [[rates[energy_type] for rates in climate_costs] for energy_type in self.ENERGY_TYPES])
 
-            # Calculate total climate change costs in €-ct/pkm at 1% time preference rate
-            total_climate_change_costs_pkm_total_1_percent = total_climate_change_costs_year_total_1_percent * 100 / (annual_mileage * occupancy_rate)
+    def calc_costs_sweep(self, discount_rates, modes=None, interpolation='log'):
+        """
+        Calculate climate change costs of several modes for a range of discount rates in one call of the energy production kernel.
 
-            # Calculate total climate change costs driving in €-ct/pkm at 1% time preference rate
-            total_climate_change_costs_pkm_driving_1_percent = total_climate_change_costs_year_driving_1_percent * 100 / (annual_mileage * occupancy_rate)
+        The climate cost rates are interpolated between the time preference methods, see interpolate_cost_rates().
 
-            # Calculate total climate change costs idling in €-ct/pkm at 1% time preference rate
-            total_climate_change_costs_pkm_idling_1_percent = total_climate_change_costs_year_idling_1_percent * 100 / (annual_mileage * occupancy_rate)
+        Args:
+            discount_rates (np.ndarray): Discount rates between 0 and 0.01, e.g. np.linspace(0, 0.01, 11).
+            modes (list): Vehicle modes (default: all modes).
+            interpolation (str): 'log' or 'linear' interpolation of the climate cost rates (default: 'log').
 
-            # Save results for the entire Power Mix at 1% time preference rate
-            self.result['cost per vkm'] = total_climate_change_costs_vkm_total_1_percent
-            self.result['cost per vkm driving'] = total_climate_change_costs_vkm_driving_1_percent
-            self.result['cost per vkm idling'] = total_climate_change_costs_vkm_idling_1_percent
-            self.result['cost per pkm'] = total_climate_change_costs_pkm_total_1_percent
-            self.result['cost per pkm driving'] = total_climate_change_costs_pkm_driving_1_percent
-            self.result['cost per pkm idling'] = total_climate_change_costs_pkm_idling_1_percent
-            self.result['cost per year'] = total_climate_change_costs_year_total_1_percent
-            self.result['cost per year driving'] = total_climate_change_costs_year_driving_1_percent
-            self.result['cost per year idling'] = total_climate_change_costs_year_idling_1_percent
+        Returns:
+            dict: Costs keyed like the result of calc_costs(), arrays of shape (modes, discount rates)
+                and (modes, discount rates, energy types) for the costs by energy type.
+        """
+        cost_rates = time_preference_cost_rates(self.input_climate_change, self.COST_RATES, discount_rates, self.ENERGY_TYPES, interpolation)
+        return self.calc_energy_production_costs(modes, cost_rates)
 
+    def calc_energy_production_costs(self, modes, cost_rates):
+        """
+        Calculate climate change costs of several modes and climate cost rate sets.
 
-            self.result['Energy production cost per vkm by energy type'] = total_energy_production_costs_vkm_per_energy_type_1_percent
-            self.result['Energy production cost per pkm by energy type'] = total_energy_production_costs_pkm_per_energy_type_1_percent
-            self.result['Energy production cost per year by energy type'] = total_energy_production_costs_year_per_energy_type_1_percent
+        Args:
+            modes (list): Vehicle modes (default: all modes).
+            cost_rates (np.ndarray): Climate cost rates in €-ct/kWh, shape (energy types, rate sets).
 
-            return self.result
-        
+        Returns:
+            dict: Costs of the energy production kernel.
+        """
+        table = registry_mode_table(self.input_climate_change, self.MODE_FIELDS, modes)
+        modes = list(table['mode'])
+
+        # Effective power mix of the charging and idling load profiles, or the annual power mix
+        if self.hourly_power_mix is None:
+            power_mix_share = self.input_climate_change.power_mix_share
+            power_mix_share = [power_mix_share[energy_type] for energy_type in self.ENERGY_TYPES]
+            power_mix_share_idling = None
+        else:
+            power_mix_share = self.hourly_power_mix.share_matrix(modes, 'driving', self.ENERGY_TYPES)
+            power_mix_share_idling = self.hourly_power_mix.share_matrix(modes, 'idling', self.ENERGY_TYPES)
+
+        return energy_production_costs(
+            power_mix_share=power_mix_share,
+            cost_rates=cost_rates,
+            consumption_driving_vkm=table['power_consumption_driving_vkm'],
+            consumption_idling_vkm=table['power_consumption_idling_vkm'],
+            annual_mileage=table['annual_mileage'],
+            occupancy_rate=table['occupancy_rate'],
+            net_loss_factor=self.input_climate_change.net_loss_factor,
+            charging_loss_factor=self.input_climate_change.charging_loss_factor,
+            power_mix_share_idling=power_mix_share_idling,
+        )
@@ -1,44 +1,71 @@
 import os
 import sys
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import scienceplots
-import pickle 
+import functools
 
 
 # Add the path to the external cost input directory for importing necessary modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 
-# Set up directories for saving plots and results
+# Directories for saving plots and results, created on the first write
 current_file = os.path.realpath('__file__')
 current_directory = os.path.dirname(current_file)
 figures_directory = os.path.join(current_directory, 'figures')
 results_directory = os.path.join(current_directory, 'results')  
-os.makedirs(figures_directory, exist_ok=True)
-os.makedirs(results_directory, exist_ok=True)
 
 
 from input.external_costs.input_collisions import InputCollisions
+from input.external_costs import input_collisions as input_collisions_module
+from utils.result_cache import ResultCache, cache_key, file_hash
+from utils.streaming_statistics import RunningStatistics, QuantileSketch
+from calculation.mode_table import mode_table, costs_table, select_row, sample_shape, check_calculator
+from calculation.cost_result import CostResult
+
+
+# Summary statistics of the infrastructure scenario results, quantiles as in pd.DataFrame.describe()
+scenario_statistics_quantiles = [0.05, 0.5, 0.95]
+
+# Cache of the infrastructure scenario results, shared by all calculators unless another cache is passed
+infrastructure_result_cache = ResultCache(os.path.join(results_directory, 'infrastructure_cache'))
+
+
+@functools.lru_cache(maxsize=None)
+def infrastructure_code_version():
+    """
+    Code version of the infrastructure scenario calculation, part of the result cache key.
+
+    Returns:
+        str: Hash of the source files of the collisions calculator and its input.
+    """
+    return cache_key(collisions=file_hash(__file__), input_collisions=file_hash(input_collisions_module.__file__))
 
 
 class CollisionsCalculator:
-    def __init__(self, mode='all_bicycle', method='damage_potential'):
+    def __init__(self, mode='all_bicycle', method='damage_potential', input_collisions=None, result_cache=infrastructure_result_cache, streaming=False):
         """
         Initialize the CollisionsCalculator with a specific mode and method.
         
         Args:
             mode (str): The transportation mode (e.g., 'private_bicycle', 'shared_pedelec').
             method (str): The calculation method ('damage_potential' or 'causer').
+            input_collisions (InputCollisions): Accident data to use, defaults to the process-wide shared instance.
+            result_cache (ResultCache): Cache of the infrastructure scenario results, None disables caching.
+            streaming (bool): Reduce the infrastructure scenarios batch by batch to running statistics
+                instead of keeping the scenario data and the result of every scenario in memory.
         """
+        # pandas is imported on first use, so importing the calculator stays fast
+        import pandas as pd
+
         self.mode = mode
         self.method = method
         self.tag = 'Collisions'
-        self.input_collisions = InputCollisions() 
-        self.result = {}
+        self.input_collisions = input_collisions if input_collisions is not None else InputCollisions.shared()
+        self.result_cache = result_cache
+        self.streaming = streaming
+        self.result = CostResult()
         self.scenario_results_df = pd.DataFrame()  
+        self.scenario_statistics = pd.DataFrame()
         self.init_vehicle_modes()
 
 
@@ -55,72 +82,72 @@ class CollisionsCalculator:
 
         self.modes = {
             'private_bicycle': {
-                'epsilon_participant_1': self.input_collisions.rows_participant_1_bicycle['Epsilon Participant 1'],
-                'epsilon_participant_2': self.input_collisions.rows_participant_2_bicycle['Epsilon Participant 2'],
-                'epsilon_participant_3': self.input_collisions.rows_participant_3_bicycle['Epsilon Participant 3'],
-                'collision_costs_participant_1': self.input_collisions.rows_participant_1_bicycle['Accident Costs'],
-                'collision_costs_participant_2': self.input_collisions.rows_participant_2_bicycle['Accident Costs'],
-                'collision_costs_participant_3': self.input_collisions.rows_participant_3_bicycle['Accident Costs'],
+                'epsilon_participant_1': self.input_collisions.participant_values('bicycle', 1, 'Epsilon Participant 1'),
+                'epsilon_participant_2': self.input_collisions.participant_values('bicycle', 2, 'Epsilon Participant 2'),
+                'epsilon_participant_3': self.input_collisions.participant_values('bicycle', 3, 'Epsilon Participant 3'),
+                'collision_costs_participant_1': self.input_collisions.participant_values('bicycle', 1, 'Accident Costs'),
+                'collision_costs_participant_2': self.input_collisions.participant_values('bicycle', 2, 'Accident Costs'),
+                'collision_costs_participant_3': self.input_collisions.participant_values('bicycle', 3, 'Accident Costs'),
                 'annual_mileage_private': self.input_collisions.annual_mileage_private_bicycle,
                 'annual_mileage_shared': self.input_collisions.annual_mileage_shared_bicycle,
                 'occupancy_rate': self.input_collisions.occupancy_rate_private_bicycle,
                 'factor': self.factor_private_bicycle,
             },
             'shared_bicycle': {
-                'epsilon_participant_1': self.input_collisions.rows_participant_1_bicycle['Epsilon Participant 1'],
-                'epsilon_participant_2': self.input_collisions.rows_participant_2_bicycle['Epsilon Participant 2'],
-                'epsilon_participant_3': self.input_collisions.rows_participant_3_bicycle['Epsilon Participant 3'],
-                'collision_costs_participant_1': self.input_collisions.rows_participant_1_bicycle['Accident Costs'],
-                'collision_costs_participant_2': self.input_collisions.rows_participant_2_bicycle['Accident Costs'],
-                'collision_costs_participant_3': self.input_collisions.rows_participant_3_bicycle['Accident Costs'],
+                'epsilon_participant_1': self.input_collisions.participant_values('bicycle', 1, 'Epsilon Participant 1'),
+                'epsilon_participant_2': self.input_collisions.participant_values('bicycle', 2, 'Epsilon Participant 2'),
+                'epsilon_participant_3': self.input_collisions.participant_values('bicycle', 3, 'Epsilon Participant 3'),
+                'collision_costs_participant_1': self.input_collisions.participant_values('bicycle', 1, 'Accident Costs'),
+                'collision_costs_participant_2': self.input_collisions.participant_values('bicycle', 2, 'Accident Costs'),
+                'collision_costs_participant_3': self.input_collisions.participant_values('bicycle', 3, 'Accident Costs'),
                 'annual_mileage_private': self.input_collisions.annual_mileage_shared_bicycle,
                 'annual_mileage_shared': self.input_collisions.annual_mileage_shared_bicycle,
                 'occupancy_rate': self.input_collisions.occupancy_rate_shared_bicycle,
                 'factor': self.factor_shared_bicycle,
             },
             'private_pedelec': {
-                'epsilon_participant_1': self.input_collisions.rows_participant_1_pedelec['Epsilon Participant 1'],
-                'epsilon_participant_2': self.input_collisions.rows_participant_2_pedelec['Epsilon Participant 2'],
-                'epsilon_participant_3': self.input_collisions.rows_participant_3_pedelec['Epsilon Participant 3'],
-                'collision_costs_participant_1': self.input_collisions.rows_participant_1_pedelec['Accident Costs'],
-                'collision_costs_participant_2': self.input_collisions.rows_participant_2_pedelec['Accident Costs'],
-                'collision_costs_participant_3': self.input_collisions.rows_participant_3_pedelec['Accident Costs'],
+                'epsilon_participant_1': self.input_collisions.participant_values('pedelec', 1, 'Epsilon Participant 1'),
+                'epsilon_participant_2': self.input_collisions.participant_values('pedelec', 2, 'Epsilon Participant 2'),
+                'epsilon_participant_3': self.input_collisions.participant_values('pedelec', 3, 'Epsilon Participant 3'),
+                'collision_costs_participant_1': self.input_collisions.participant_values('pedelec', 1, 'Accident Costs'),
+                'collision_costs_participant_2': self.input_collisions.participant_values('pedelec', 2, 'Accident Costs'),
+                'collision_costs_participant_3': self.input_collisions.participant_values('pedelec', 3, 'Accident Costs'),
                 'annual_mileage_private': self.input_collisions.annual_mileage_private_pedelec,
                 'annual_mileage_shared': self.input_collisions.annual_mileage_shared_pedelec,
                 'occupancy_rate': self.input_collisions.occupancy_rate_private_pedelec,
                 'factor': self.factor_private_pedelec,
             },
             'shared_pedelec': {
-                'epsilon_participant_1': self.input_collisions.rows_participant_1_pedelec['Epsilon Participant 1'],
-                'epsilon_participant_2': self.input_collisions.rows_participant_2_pedelec['Epsilon Participant 2'],
-                'epsilon_participant_3': self.input_collisions.rows_participant_3_pedelec['Epsilon Participant 3'],
-                'collision_costs_participant_1': self.input_collisions.rows_participant_1_pedelec['Accident Costs'],
-                'collision_costs_participant_2': self.input_collisions.rows_participant_2_pedelec['Accident Costs'],
-                'collision_costs_participant_3': self.input_collisions.rows_participant_3_pedelec['Accident Costs'],
+                'epsilon_participant_1': self.input_collisions.participant_values('pedelec', 1, 'Epsilon Participant 1'),
+                'epsilon_participant_2': self.input_collisions.participant_values('pedelec', 2, 'Epsilon Participant 2'),
+                'epsilon_participant_3': self.input_collisions.participant_values('pedelec', 3, 'Epsilon Participant 3'),
+                'collision_costs_participant_1': self.input_collisions.participant_values('pedelec', 1, 'Accident Costs'),
+                'collision_costs_participant_2': self.input_collisions.participant_values('pedelec', 2, 'Accident Costs'),
+                'collision_costs_participant_3': self.input_collisions.participant_values('pedelec', 3, 'Accident Costs'),
                 'annual_mileage_private': self.input_collisions.annual_mileage_Munich_shared_pedelec,
                 'annual_mileage_shared': self.input_collisions.annual_mileage_Munich_shared_pedelec,
                 'occupancy_rate': self.input_collisions.occupancy_rate_shared_pedelec,
                 'factor': self.factor_shared_pedelec,
             },
             'all_bicycle': {
-                'epsilon_participant_1': self.input_collisions.rows_participant_1_bicycle['Epsilon Participant 1'],
-                'epsilon_participant_2': self.input_collisions.rows_participant_2_bicycle['Epsilon Participant 2'],
-                'epsilon_participant_3': self.input_collisions.rows_participant_3_bicycle['Epsilon Participant 3'],
-                'collision_costs_participant_1': self.input_collisions.rows_participant_1_bicycle['Accident Costs'],
-                'collision_costs_participant_2': self.input_collisions.rows_participant_2_bicycle['Accident Costs'],
-                'collision_costs_participant_3': self.input_collisions.rows_participant_3_bicycle['Accident Costs'],
+                'epsilon_participant_1': self.input_collisions.participant_values('bicycle', 1, 'Epsilon Participant 1'),
+                'epsilon_participant_2': self.input_collisions.participant_values('bicycle', 2, 'Epsilon Participant 2'),
+                'epsilon_participant_3': self.input_collisions.participant_values('bicycle', 3, 'Epsilon Participant 3'),
+                'collision_costs_participant_1': self.input_collisions.participant_values('bicycle', 1, 'Accident Costs'),
+                'collision_costs_participant_2': self.input_collisions.participant_values('bicycle', 2, 'Accident Costs'),
+                'collision_costs_participant_3': self.input_collisions.participant_values('bicycle', 3, 'Accident Costs'),
                 'annual_mileage_private': self.input_collisions.annual_mileage_private_bicycle,
                 'annual_mileage_shared': self.input_collisions.annual_mileage_Munich_shared_bicycle,
                 'occupancy_rate': self.input_collisions.occupancy_rate_private_bicycle,
                 'factor': self.factor_all,
             },
             'all_pedelec': {
-                'epsilon_participant_1': self.input_collisions.rows_participant_1_pedelec['Epsilon Participant 1'],
-                'epsilon_participant_2': self.input_collisions.rows_participant_2_pedelec['Epsilon Participant 2'],
-                'epsilon_participant_3': self.input_collisions.rows_participant_3_pedelec['Epsilon Participant 3'],
-                'collision_costs_participant_1': self.input_collisions.rows_participant_1_pedelec['Accident Costs'],
-                'collision_costs_participant_2': self.input_collisions.rows_participant_2_pedelec['Accident Costs'],
-                'collision_costs_participant_3': self.input_collisions.rows_participant_3_pedelec['Accident Costs'],
+                'epsilon_participant_1': self.input_collisions.participant_values('pedelec', 1, 'Epsilon Participant 1'),
+                'epsilon_participant_2': self.input_collisions.participant_values('pedelec', 2, 'Epsilon Participant 2'),
+                'epsilon_participant_3': self.input_collisions.participant_values('pedelec', 3, 'Epsilon Participant 3'),
+                'collision_costs_participant_1': self.input_collisions.participant_values('pedelec', 1, 'Accident Costs'),
+                'collision_costs_participant_2': self.input_collisions.participant_values('pedelec', 2, 'Accident Costs'),
+                'collision_costs_participant_3': self.input_collisions.participant_values('pedelec', 3, 'Accident Costs'),
                 'annual_mileage_private': self.input_collisions.annual_mileage_private_pedelec,
                 'annual_mileage_shared': self.input_collisions.annual_mileage_Munich_shared_pedelec,
                 'occupancy_rate': self.input_collisions.occupancy_rate_private_pedelec,
@@ -132,150 +159,215 @@ class CollisionsCalculator:
     def calc_costs(self):
         """
         Calculate external costs based on the mode and method.
+
+        Raises:
+            ValueError: If the mode is not supported by an infrastructure method, or the mode or the method is not
+                supported, see check_calculator().
         """
         if 'infrastructure' in self.method:
             return self.process_infrastructure_scenario()
-        elif self.mode in self.modes:
-            mode_data = self.modes[self.mode]
-            epsilon_participant_1 = mode_data['epsilon_participant_1']
-            epsilon_participant_2 = mode_data['epsilon_participant_2']
-            epsilon_participant_3 = mode_data['epsilon_participant_3']
-            collision_costs_participant_1 = mode_data['collision_costs_participant_1']
-            collision_costs_participant_2 = mode_data['collision_costs_participant_2']
-            collision_costs_participant_3 = mode_data['collision_costs_participant_3']
-            annual_mileage_private = mode_data['annual_mileage_private']
-            annual_mileage_shared = mode_data['annual_mileage_shared']
-            occupancy_rate = mode_data['occupancy_rate']
-            factor = mode_data['factor']
-
-            if self.method == 'damage_potential':
-                sum_costs_participant_1 = sum(epsilon_participant_1 * collision_costs_participant_1)
-                sum_costs_participant_2 = sum(epsilon_participant_2 * collision_costs_participant_2)
-                sum_costs_participant_3 = sum(epsilon_participant_3 * collision_costs_participant_3)
-
-                total_accident_costs_damage_potential_year = (sum_costs_participant_1 +
-                                                              sum_costs_participant_2 +
-                                                              sum_costs_participant_3) * factor
-
-                total_accident_costs_damage_potential_pkm = total_accident_costs_damage_potential_year * 100 / (
-                        (annual_mileage_private + annual_mileage_shared) * occupancy_rate)
-                total_accident_costs_damage_potential_vkm = total_accident_costs_damage_potential_year * 100 / (
-                        annual_mileage_private + annual_mileage_shared)
-
-                self.result['cost per vkm'] = total_accident_costs_damage_potential_vkm
-                self.result['cost per pkm'] = total_accident_costs_damage_potential_pkm
-                self.result['cost per year'] = total_accident_costs_damage_potential_year
-
-                return self.result
 
-            elif self.method == 'causer':
-                total_accident_costs_causer_year = sum(collision_costs_participant_1) * factor
+        check_calculator(self, ['damage_potential', 'causer'])
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+        return self.result
 
-                total_accident_costs_causer_pkm = total_accident_costs_causer_year * 100 / (
-                        (annual_mileage_private + annual_mileage_shared) * occupancy_rate)
-                total_accident_costs_causer_vkm = total_accident_costs_causer_year * 100 / (
-                        annual_mileage_private + annual_mileage_shared)
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate the collision costs of the 'damage_potential' or 'causer' method for several modes at once on the mode table.
 
-                self.result['cost per vkm'] = total_accident_costs_causer_vkm
-                self.result['cost per pkm'] = total_accident_costs_causer_pkm
-                self.result['cost per year'] = total_accident_costs_causer_year
+        The accident costs of the participants are reduced per mode, as the accident data differs
+        between bicycles and pedelecs, the costs per year, pkm and vkm are calculated for all modes at once.
 
-                return self.result
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
-        return None
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        table = mode_table(self.modes, modes, ['annual_mileage_private', 'annual_mileage_shared', 'occupancy_rate', 'factor'])
+        mode_data = [self.modes[mode] for mode in table['mode']]
+
+        if self.method == 'damage_potential':
+            accident_costs_year = np.array([
+                np.dot(data['epsilon_participant_1'], data['collision_costs_participant_1']) +
+                np.dot(data['epsilon_participant_2'], data['collision_costs_participant_2']) +
+                np.dot(data['epsilon_participant_3'], data['collision_costs_participant_3'])
+                for data in mode_data], dtype=np.float64)
+        elif self.method == 'causer':
+            accident_costs_year = np.array([np.sum(data['collision_costs_participant_1']) for data in mode_data], dtype=np.float64)
+        else:
+            raise ValueError(f"Mode tables are not available for the method '{self.method}', expected 'damage_potential' or 'causer'.")
+
+        # Accident costs per mode, aligned with the samples of sampled mileages
+        accident_costs_year = accident_costs_year.reshape((-1,) + (1,) * len(sample_shape(table)))
+        total_accident_costs_year = accident_costs_year * table['factor']
+
+        total_accident_costs_pkm = total_accident_costs_year * 100 / (
+                (table['annual_mileage_private'] + table['annual_mileage_shared']) * table['occupancy_rate'])
+        total_accident_costs_vkm = total_accident_costs_year * 100 / (
+                table['annual_mileage_private'] + table['annual_mileage_shared'])
+
+        return costs_table(table['mode'], {
+            'cost per vkm': total_accident_costs_vkm,
+            'cost per pkm': total_accident_costs_pkm,
+            'cost per year': total_accident_costs_year,
+        })
     
 
+    def infrastructure_cache_key(self):
+        """
+        Cache key of the infrastructure scenario results of this calculator.
+
+        Returns:
+            str: Hash of the scenario data, the calculator parameters and the code version.
+        """
+        return cache_key(
+            scenario_data=self.input_collisions.scenario_data_hash(),
+            mode=self.mode,
+            method=self.method,
+            streaming=self.streaming,
+            parameters=self.input_collisions.parameter_values(),
+            code_version=infrastructure_code_version(),
+        )
+
     def process_infrastructure_scenario(self):
         """
         Process infrastructure scenarios and calculate external costs for the given mode.
-        Loads saved results if the script is imported, otherwise calculates and saves them.
-        """
-        import __main__
-        is_main = (__main__.__name__ == '__main__')
-
-        if not is_main:
-            # When imported as a module: load results
-            results_file = os.path.join(results_directory, f"infrastructure_results_{self.mode}_{self.method}.pkl")
-            if os.path.exists(results_file):
-                with open(results_file, 'rb') as f:
-                    loaded_data = pickle.load(f)
-                    self.result = loaded_data['result']
-                    self.scenario_results_df = loaded_data['scenario_results_df']
-                print(f"Results for mode '{self.mode}' and method '{self.method}' loaded from '{results_file}'.")
-                return self.result
-            else:
-                print(f"Saved results for mode '{self.mode}' and method '{self.method}' not found. Performing calculations.")
-                # Fallback: Perform calculations since no saved results are available
+        Results are read from the result cache if the scenario data, parameters and code are unchanged,
+        otherwise they are calculated and written to the cache.
 
-        # Perform calculations if running as main or no saved results are found
-        scenario_results = []
+        Raises:
+            ValueError: If the mode is not 'all_bicycle' or 'all_pedelec'.
+        """
+        import pandas as pd
 
         if self.mode not in ['all_bicycle', 'all_pedelec']:
-            print(f"Unsupported mode '{self.mode}' for infrastructure scenario.")
-            return None
-
-        for scenario_name, scenario_data in self.input_collisions.scenario_variables.items():
-            if self.mode == 'all_bicycle':
-                vehicle_data = scenario_data['bicycle']
-                annual_mileage_private = self.input_collisions.annual_mileage_private_bicycle
-                annual_mileage_shared = self.input_collisions.annual_mileage_shared_bicycle
-                occupancy_rate = self.input_collisions.occupancy_rate_private_bicycle
-            elif self.mode == 'all_pedelec':
-                vehicle_data = scenario_data['pedelec']
-                annual_mileage_private = self.input_collisions.annual_mileage_private_pedelec
-                annual_mileage_shared = self.input_collisions.annual_mileage_shared_pedelec
-                occupancy_rate = self.input_collisions.occupancy_rate_private_pedelec
-
-            epsilon_participant_1 = vehicle_data['participant_1']['Epsilon Participant 1']
-            epsilon_participant_2 = vehicle_data['participant_2']['Epsilon Participant 2']
-            epsilon_participant_3 = vehicle_data['participant_3']['Epsilon Participant 3']
-            collision_costs_participant_1 = vehicle_data['participant_1']['Accident Costs']
-            collision_costs_participant_2 = vehicle_data['participant_2']['Accident Costs']
-            collision_costs_participant_3 = vehicle_data['participant_3']['Accident Costs']
-
-            sum_costs_participant_1 = sum(epsilon_participant_1 * collision_costs_participant_1)
-            sum_costs_participant_2 = sum(epsilon_participant_2 * collision_costs_participant_2)
-            sum_costs_participant_3 = sum(epsilon_participant_3 * collision_costs_participant_3)
-
-            if 'damage_potential' in self.method:
-                total_accident_costs_year = sum_costs_participant_1 + sum_costs_participant_2 + sum_costs_participant_3
-            elif 'causer' in self.method:
-                total_accident_costs_year = sum(collision_costs_participant_1)
-
-            total_accident_costs_pkm = total_accident_costs_year * 100 / ((annual_mileage_private + annual_mileage_shared) * occupancy_rate)
-            total_accident_costs_vkm = total_accident_costs_year * 100 / (annual_mileage_private + annual_mileage_shared)
-
-            scenario_result = {
-                'scenario': f'{scenario_name}_{self.mode}',
-                'cost per vkm': total_accident_costs_vkm,
-                'cost per pkm': total_accident_costs_pkm,
+            raise ValueError(f"Unsupported mode '{self.mode}' for the infrastructure scenarios, expected 'all_bicycle' or 'all_pedelec'.")
+
+        if self.result_cache is not None:
+            key = self.infrastructure_cache_key()
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                self.result = CostResult(cached['result'])
+                self.scenario_results_df = cached['scenario_results_df']
+                self.scenario_statistics = cached['scenario_statistics']
+                return self.result
+
+        # Perform calculations if no cached results are found
+        if self.mode == 'all_bicycle':
+            vehicle_type = 'bicycle'
+            annual_mileage_private = self.input_collisions.annual_mileage_private_bicycle
+            annual_mileage_shared = self.input_collisions.annual_mileage_shared_bicycle
+            occupancy_rate = self.input_collisions.occupancy_rate_private_bicycle
+        elif self.mode == 'all_pedelec':
+            vehicle_type = 'pedelec'
+            annual_mileage_private = self.input_collisions.annual_mileage_private_pedelec
+            annual_mileage_shared = self.input_collisions.annual_mileage_shared_pedelec
+            occupancy_rate = self.input_collisions.occupancy_rate_private_pedelec
+
+        method = 'damage_potential' if 'damage_potential' in self.method else 'causer'
+
+        def scenario_costs(total_accident_costs_year):
+            return {
+                'cost per vkm': total_accident_costs_year * 100 / (annual_mileage_private + annual_mileage_shared),
+                'cost per pkm': total_accident_costs_year * 100 / ((annual_mileage_private + annual_mileage_shared) * occupancy_rate),
                 'cost per year': total_accident_costs_year,
             }
 
-            scenario_results.append(scenario_result)
+        if self.streaming:
+            # Running statistics and quantile sketches per cost column, memory is independent of the number of scenarios
+            running_statistics = {column: (RunningStatistics(), QuantileSketch(seed=0)) for column in ['cost per vkm', 'cost per pkm', 'cost per year']}
+            for scenario_names, scenario_store, participant_index in self.input_collisions.iter_scenario_batches():
+                scenario_totals = self.reduce_scenario_batch(scenario_store, participant_index, scenario_names)
+                for column, values in scenario_costs(scenario_totals[(vehicle_type, method)].to_numpy()).items():
+                    running_statistics[column][0].update(values)
+                    running_statistics[column][1].update(values)
+
+            self.scenario_results_df = pd.DataFrame()
+            self.scenario_statistics = pd.DataFrame({
+                column: {
+                    'count': statistics.count,
+                    'mean': statistics.mean if statistics.count else np.nan,
+                    'std': statistics.std(),
+                    'min': statistics.min if statistics.count else np.nan,
+                    **{f'{q:.0%}': sketch.quantile(q) for q in scenario_statistics_quantiles},
+                    'max': statistics.max if statistics.count else np.nan,
+                }
+                for column, (statistics, sketch) in running_statistics.items()
+            })
+        else:
+            scenario_totals = self.calc_scenario_totals(self.input_collisions)
+            self.scenario_results_df = pd.DataFrame({
+                'scenario': scenario_totals.index + f'_{self.mode}',
+                **scenario_costs(scenario_totals[(vehicle_type, method)].to_numpy()),
+            })
+            self.scenario_statistics = self.scenario_results_df[['cost per vkm', 'cost per pkm', 'cost per year']].describe(percentiles=scenario_statistics_quantiles)
+
+        self.result = CostResult({
+            'cost per vkm': self.scenario_statistics.loc['mean', 'cost per vkm'],
+            'cost per pkm': self.scenario_statistics.loc['mean', 'cost per pkm'],
+            'cost per year': self.scenario_statistics.loc['mean', 'cost per year'],
+        })
+
+        if self.result_cache is not None:
+            self.result_cache.put(key, {
+                'result': self.result.to_dict(),
+                'scenario_results_df': self.scenario_results_df,
+                'scenario_statistics': self.scenario_statistics,
+            })
 
-        self.scenario_results_df = pd.DataFrame(scenario_results)
-        avg_results = self.scenario_results_df[['cost per vkm', 'cost per pkm', 'cost per year']].mean()
+        return self.result
 
-        self.result = {
-            'cost per vkm': avg_results['cost per vkm'],
-            'cost per pkm': avg_results['cost per pkm'],
-            'cost per year': avg_results['cost per year'],
-        }
+    @staticmethod
+    def calc_scenario_totals(input_collisions):
+        """
+        Calculate the annual accident costs of all infrastructure scenarios in one pass.
 
-        if is_main:
-            # Save results
-            results_file = os.path.join(results_directory, f"infrastructure_results_{self.mode}_{self.method}.pkl")
-            with open(results_file, 'wb') as f:
-                pickle.dump({
-                    'result': self.result,
-                    'scenario_results_df': self.scenario_results_df
-                }, f)
-            print(f"Results for mode '{self.mode}' and method '{self.method}' saved to '{results_file}'.")
+        The rows of all scenarios share one store with the scenario code of every row, so the
+        sums per scenario are grouped reductions over the participant rows of each vehicle type.
 
-        return self.result
+        Args:
+            input_collisions (InputCollisions): Accident data including the infrastructure scenarios.
+
+        Returns:
+            pd.DataFrame: Annual accident costs per scenario (index) for each vehicle type and
+                method ('damage_potential' or 'causer') as column.
+        """
+        return CollisionsCalculator.reduce_scenario_batch(input_collisions.scenario_store, input_collisions.scenario_participant_index, list(input_collisions.scenario_variables))
 
     @staticmethod
+    def reduce_scenario_batch(scenario_store, participant_index, scenario_names):
+        """
+        Calculate the annual accident costs of a batch of scenarios with grouped reductions.
+
+        Args:
+            scenario_store (dict): Column-pruned accident data including the 'scenario_code' of every row.
+            participant_index (dict): Row index arrays per vehicle type and participant.
+            scenario_names (list): Names of the scenarios, in the order of the scenario codes.
+
+        Returns:
+            pd.DataFrame: Annual accident costs per scenario (index) for each vehicle type and
+                method ('damage_potential' or 'causer') as column.
+        """
+        import pandas as pd
+
+        scenario_code = scenario_store['scenario_code']
+        nr_scenarios = len(scenario_names)
+
+        scenario_totals = {}
+        for vehicle_type, participant_rows in participant_index.items():
+            damage_potential = np.zeros(nr_scenarios, dtype=np.float64)
+            for nr in range(1, 4):
+                rows = participant_rows[f'participant_{nr}']
+                damage_potential += np.bincount(scenario_code[rows], weights=scenario_store[f'Epsilon Participant {nr}'][rows] * scenario_store['Accident Costs'][rows], minlength=nr_scenarios)
+
+            rows = participant_rows['participant_1']
+            causer = np.bincount(scenario_code[rows], weights=scenario_store['Accident Costs'][rows], minlength=nr_scenarios)
+
+            scenario_totals[(vehicle_type, 'damage_potential')] = damage_potential
+            scenario_totals[(vehicle_type, 'causer')] = causer
+
+        return pd.DataFrame(scenario_totals, index=pd.Index(scenario_names, name='scenario'))
 
     @staticmethod
     def plot_combined_distributions(scenarios, save_path="combined_distributions_external_costs_cycle_lane_scenarios.pdf"): #TODO: adapt for cycle path scenario
@@ -286,6 +378,11 @@ class CollisionsCalculator:
             print("No infrastructure scenarios provided for plotting.")
             return
 
+        # The plotting stack is only needed here, so it is not loaded with the calculator
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        import scienceplots
+
         plt.rcParams.update(plt.rcParamsDefault)
         plt.style.use(['science', 'nature'])
 
@@ -348,6 +445,7 @@ class CollisionsCalculator:
         ax.grid(True, linestyle="--", alpha=0.7)
 
         # Save the plot
+        os.makedirs(figures_directory, exist_ok=True)
         plt.savefig(os.path.join(figures_directory, 'KDE_external_costs_cycle_lane_scenarios.pdf'), dpi=300, bbox_inches="tight") #TODO: adapt for cycle path scenario
         plt.savefig(os.path.join(figures_directory, 'KDE_external_costs_cycle_lane_scenarios.svg'), dpi=300, bbox_inches="tight") #TODO: adapt for cycle path scenario
         plt.show()
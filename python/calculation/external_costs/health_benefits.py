@@ -4,51 +4,34 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_health_benefits import InputHealthBenefits
+from calculation.mode_table import registry_mode_table, costs_table, select_row, check_calculator
+from calculation.cost_result import CostResult
 
 class HealthBenefitsCalculator:
-    def __init__(self, mode='private_bicycle', method='advanced'):
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'avoided_deaths': 'avoided_deaths',
+        'annual_mileage': 'annual_mileage',
+        'occupancy_rate': 'occupancy_rate',
+    }
+
+    def __init__(self, mode='private_bicycle', method='advanced', registry=None):
         """
         Initialize the HealthBenefitsCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'private_bicycle').
             method (str): Calculation method (default: 'advanced').
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_health_benefits = InputHealthBenefits()
+        self.input_health_benefits = InputHealthBenefits(registry)
         self.tag = 'Health Benefits'
-        self.result = {}
-
-        # Call the init_vehicle_modes method to initialize vehicle-specific data
-        self.init_vehicle_modes()
+        self.result = CostResult()
 
-    def init_vehicle_modes(self):
-        """
-        Initialize a dictionary of vehicle modes with associated data.
-        """
-        self.modes = {
-            'private_bicycle': {
-                'avoided_deaths': self.input_health_benefits.avoided_deaths_private_bicycle,
-                'annual_mileage': self.input_health_benefits.annual_mileage_private_bicycle,
-                'occupancy_rate': self.input_health_benefits.occupancy_rate_private_bicycle,
-            },
-            'shared_bicycle': {
-                'avoided_deaths': self.input_health_benefits.avoided_deaths_shared_bicycle,
-                'annual_mileage': self.input_health_benefits.annual_mileage_shared_bicycle,
-                'occupancy_rate': self.input_health_benefits.occupancy_rate_shared_bicycle,
-            },
-            'private_pedelec': {
-                'avoided_deaths': self.input_health_benefits.avoided_deaths_private_pedelec,
-                'annual_mileage': self.input_health_benefits.annual_mileage_private_pedelec,
-                'occupancy_rate': self.input_health_benefits.occupancy_rate_private_pedelec,
-            },
-            'shared_pedelec': {
-                'avoided_deaths': self.input_health_benefits.avoided_deaths_shared_pedelec,
-                'annual_mileage': self.input_health_benefits.annual_mileage_shared_pedelec,
-                'occupancy_rate': self.input_health_benefits.occupancy_rate_shared_pedelec,
-            },
-        }
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_health_benefits.registry.modes
 
     def calc_costs(self):
         """
@@ -56,15 +39,33 @@ class HealthBenefitsCalculator:
 
         Returns:
             dict: Calculated health benefits costs.
+
+        Raises:
+            ValueError: If the mode is not supported, see check_calculator().
         """
-        if self.mode not in self.modes:
-            return {'mode': 0}  # Return a default value if the mode is not recognized
+        check_calculator(self)
 
-        mode_data = self.modes[self.mode]
+        # Store the results in the 'result' dictionary
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+
+        # Return the calculated results
+        return self.result
+
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate health benefits costs for several modes at once on the mode table.
 
-        avoided_deaths = mode_data['avoided_deaths']
-        annual_mileage = mode_data['annual_mileage']
-        occupancy_rate = mode_data['occupancy_rate']
+        Args:
+            modes (list): Vehicle modes (default: all modes).
+
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        table = registry_mode_table(self.input_health_benefits, self.MODE_FIELDS, modes)
+
+        avoided_deaths = table['avoided_deaths']
+        annual_mileage = table['annual_mileage']
+        occupancy_rate = table['occupancy_rate']
         value_of_statistical_life = self.input_health_benefits.value_of_statistical_life
 
         # Calculate total health benefits costs per year in €
@@ -88,11 +89,8 @@ class HealthBenefitsCalculator:
             total_health_benefits_costs_year * 100 / annual_mileage
         )
 
-        # Store the results in the 'result' dictionary
-        self.result['cost per vkm'] = total_health_benefits_costs_vkm
-        self.result['cost per pkm'] = total_health_benefits_costs_pkm
-        self.result['cost per year'] = total_health_benefits_costs_year
-
-        # Return the calculated results
-        return self.result
-
+        return costs_table(table['mode'], {
+            'cost per vkm': total_health_benefits_costs_vkm,
+            'cost per pkm': total_health_benefits_costs_pkm,
+            'cost per year': total_health_benefits_costs_year,
+        })
@@ -4,70 +4,40 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_land_use import InputLandUse
+from calculation.mode_table import registry_mode_table, costs_table, select_row, check_calculator
+from calculation.cost_result import CostResult
 
 class LandUseCalculator:
-    def __init__(self, mode='private_bicycle', method='standard'):
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'annual_mileage': 'annual_mileage',
+        # Mileage in Munich of the shared modes
+        'annual_mileage_Munich': ('annual_mileage_Munich', 'annual_mileage'),
+        'hours_idling': 'hours_idling',
+        'occupancy_rate': 'occupancy_rate',
+        'space': 'space',
+        # Stations of the shared bicycles only
+        'nr_stations': ('nr_stations', 0),
+        'space_station': ('space_station', 0),
+    }
+
+    def __init__(self, mode='private_bicycle', method='standard', registry=None):
         """
         Initialize the LandUseCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'private_bicycle').
             method (str): Calculation method (default: 'standard').
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_land_use = InputLandUse()
+        self.input_land_use = InputLandUse(registry)
         self.tag = 'Land Use'
-        self.result = {}
+        self.result = CostResult()
 
-        # Call the init_vehicle_modes method to initialize vehicle-specific data
-        self.init_vehicle_modes()
-
-    def init_vehicle_modes(self):
-        """
-        Initialize the vehicle mode data.
-
-        Returns:
-            dict: Data for the selected vehicle mode.
-        """
-        self.modes = {
-            'private_bicycle': {
-                'annual_mileage': self.input_land_use.annual_mileage_private_bicycle,
-                'annual_mileage_Munich': self.input_land_use.annual_mileage_private_bicycle,
-                'hours_idling': self.input_land_use.hours_idling_private_bicycle,
-                'occupancy_rate': self.input_land_use.occupancy_rate_private_bicycle,
-                'space': self.input_land_use.space_private_bicycle,
-                'nr_stations': 0,
-                'space_station': 0,
-            },
-            'shared_bicycle': {
-                'annual_mileage': self.input_land_use.annual_mileage_shared_bicycle,
-                'annual_mileage_Munich': self.input_land_use.annual_mileage_Munich_shared_bicycle,
-                'hours_idling': self.input_land_use.hours_idling_shared_bicycle,
-                'occupancy_rate': self.input_land_use.occupancy_rate_shared_bicycle,
-                'space': self.input_land_use.space_shared_bicycle,
-                'nr_stations': self.input_land_use.nr_stations_shared_bicycle,
-                'space_station': self.input_land_use.space_station_shared_bicycle,
-            },
-            'private_pedelec': {
-                'annual_mileage': self.input_land_use.annual_mileage_private_pedelec,
-                'annual_mileage_Munich': self.input_land_use.annual_mileage_private_pedelec,
-                'hours_idling': self.input_land_use.hours_idling_private_pedelec,
-                'occupancy_rate': self.input_land_use.occupancy_rate_private_pedelec,
-                'space': self.input_land_use.space_private_pedelec,
-                'nr_stations': 0,
-                'space_station': 0,
-            },
-            'shared_pedelec': {
-                'annual_mileage': self.input_land_use.annual_mileage_shared_pedelec,
-                'annual_mileage_Munich': self.input_land_use.annual_mileage_Munich_shared_pedelec,
-                'hours_idling': self.input_land_use.hours_idling_shared_pedelec,
-                'occupancy_rate': self.input_land_use.occupancy_rate_shared_pedelec,
-                'space': self.input_land_use.space_shared_pedelec,
-                'nr_stations': 0,
-                'space_station': 0,
-            }
-        }
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_land_use.registry.modes
 
     def calc_costs(self):
         """
@@ -75,69 +45,71 @@ class LandUseCalculator:
 
         Returns:
             dict: Calculated land use costs.
-        """
-        # Calculate land use costs based on the selected 'mode'
-        if self.mode not in self.modes:
-            # Return a default value if the mode is not recognized
-            return {'mode': 0}
-
-        mode_data = self.modes[self.mode]
-
-        annual_mileage = mode_data['annual_mileage']
-        annual_mileage_Munich = mode_data['annual_mileage_Munich']
-        hours_idling = mode_data['hours_idling']
-        occupancy_rate = mode_data['occupancy_rate']
-        space = mode_data['space']
-        nr_stations = mode_data['nr_stations']
-        space_station = mode_data['space_station']
-
-        sum_street_costs = sum(self.input_land_use.land_use_per_person_30kmh[type_i] * self.input_land_use.annual_mileage[type_i] for type_i in self.input_land_use.land_use_per_person_30kmh)
-            
-        if self.method == 'standard': # Methodology Daniel Schröder
-
-            # Calculate the total cost of land use while moving
-            total_land_use_costs_moving_year = self.input_land_use.total_infrastructure_cost_active_mobility * (annual_mileage_Munich / self.input_land_use.annual_mileage_active_modes) 
-
-            # Calculate the land use cost of land use while parking of free-floating vehicle
-            total_land_use_costs_parking_ff_year = (hours_idling / self.input_land_use.hours_per_year) * (self.input_land_use.opportunity_cost_m2_bio_diversity_costs * space)
-
-            # Calculate the land use cost of land use while parking of station-based vehicle
-            total_land_use_costs_stations_year = nr_stations * space_station * self.input_land_use.opportunity_cost_m2_bio_diversity_costs 
-
-            total_land_use_costs_year = total_land_use_costs_moving_year + total_land_use_costs_parking_ff_year + total_land_use_costs_stations_year
-
-            total_land_use_costs_pkm = total_land_use_costs_year / (annual_mileage * occupancy_rate) * 100
-            total_land_use_costs_vkm = total_land_use_costs_year / annual_mileage * 100
-
-            # Calculate the parking land use costs for vehicle mode in €-ct/pkm and €-ct/vkm
-            total_land_use_costs_parking_pkm = total_land_use_costs_parking_ff_year / (annual_mileage * occupancy_rate) * 100
-            total_land_use_costs_parking_vkm = total_land_use_costs_parking_ff_year / annual_mileage * 100
-
-            # Calculate the stations land use costs for vehicle mode in €-ct/pkm and €-ct/vkm
-            total_land_use_costs_stations_pkm = total_land_use_costs_stations_year / (annual_mileage * occupancy_rate) * 100
-            total_land_use_costs_stations_vkm = total_land_use_costs_stations_year / annual_mileage * 100
-
-            # Calculate the moving land use costs for vehicle mode in €-ct/pkm and €-ct/vkm
-            total_land_use_costs_moving_pkm = total_land_use_costs_moving_year / (annual_mileage * occupancy_rate) * 100
-            total_land_use_costs_moving_vkm = total_land_use_costs_moving_year / annual_mileage * 100
-
-            self.result['cost per vkm'] = total_land_use_costs_vkm
-            self.result['cost per pkm'] = total_land_use_costs_pkm
-            self.result['cost per year'] = total_land_use_costs_year
-                
-            self.result['cost per vkm idling'] = total_land_use_costs_parking_vkm
-            self.result['cost per vkm moving'] = total_land_use_costs_moving_vkm
-            self.result['cost per vkm stations'] = total_land_use_costs_stations_vkm
-            self.result['cost per pkm idling'] = total_land_use_costs_parking_pkm
-            self.result['cost per pkm moving'] = total_land_use_costs_moving_pkm
-            self.result['cost per pkm stations'] = total_land_use_costs_stations_pkm
-            self.result['cost per year idling'] = total_land_use_costs_parking_ff_year
-            self.result['cost per year moving'] = total_land_use_costs_moving_year
-            self.result['cost per year stations'] = total_land_use_costs_stations_year
-
-            return self.result
-
 
+        Raises:
+            ValueError: If the mode or the method is not supported, see check_calculator().
+        """
+        check_calculator(self, ['standard']) # Methodology Daniel Schröder
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+        return self.result
 
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate land use costs for several modes at once on the mode table (methodology Daniel Schröder).
 
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        table = registry_mode_table(self.input_land_use, self.MODE_FIELDS, modes)
+
+        annual_mileage = table['annual_mileage']
+        annual_mileage_Munich = table['annual_mileage_Munich']
+        hours_idling = table['hours_idling']
+        occupancy_rate = table['occupancy_rate']
+        space = table['space']
+        nr_stations = table['nr_stations']
+        space_station = table['space_station']
+
+        # Calculate the total cost of land use while moving
+        total_land_use_costs_moving_year = self.input_land_use.total_infrastructure_cost_active_mobility * (annual_mileage_Munich / self.input_land_use.annual_mileage_active_modes)
+
+        # Calculate the land use cost of land use while parking of free-floating vehicle
+        total_land_use_costs_parking_ff_year = (hours_idling / self.input_land_use.hours_per_year) * (self.input_land_use.opportunity_cost_m2_bio_diversity_costs * space)
+
+        # Calculate the land use cost of land use while parking of station-based vehicle
+        total_land_use_costs_stations_year = nr_stations * space_station * self.input_land_use.opportunity_cost_m2_bio_diversity_costs
+
+        total_land_use_costs_year = total_land_use_costs_moving_year + total_land_use_costs_parking_ff_year + total_land_use_costs_stations_year
+
+        total_land_use_costs_pkm = total_land_use_costs_year / (annual_mileage * occupancy_rate) * 100
+        total_land_use_costs_vkm = total_land_use_costs_year / annual_mileage * 100
+
+        # Calculate the parking land use costs for vehicle mode in €-ct/pkm and €-ct/vkm
+        total_land_use_costs_parking_pkm = total_land_use_costs_parking_ff_year / (annual_mileage * occupancy_rate) * 100
+        total_land_use_costs_parking_vkm = total_land_use_costs_parking_ff_year / annual_mileage * 100
+
+        # Calculate the stations land use costs for vehicle mode in €-ct/pkm and €-ct/vkm
+        total_land_use_costs_stations_pkm = total_land_use_costs_stations_year / (annual_mileage * occupancy_rate) * 100
+        total_land_use_costs_stations_vkm = total_land_use_costs_stations_year / annual_mileage * 100
+
+        # Calculate the moving land use costs for vehicle mode in €-ct/pkm and €-ct/vkm
+        total_land_use_costs_moving_pkm = total_land_use_costs_moving_year / (annual_mileage * occupancy_rate) * 100
+        total_land_use_costs_moving_vkm = total_land_use_costs_moving_year / annual_mileage * 100
+
+        return costs_table(table['mode'], {
+            'cost per vkm': total_land_use_costs_vkm,
+            'cost per pkm': total_land_use_costs_pkm,
+            'cost per year': total_land_use_costs_year,
+            'cost per vkm idling': total_land_use_costs_parking_vkm,
+            'cost per vkm moving': total_land_use_costs_moving_vkm,
+            'cost per vkm stations': total_land_use_costs_stations_vkm,
+            'cost per pkm idling': total_land_use_costs_parking_pkm,
+            'cost per pkm moving': total_land_use_costs_moving_pkm,
+            'cost per pkm stations': total_land_use_costs_stations_pkm,
+            'cost per year idling': total_land_use_costs_parking_ff_year,
+            'cost per year moving': total_land_use_costs_moving_year,
+            'cost per year stations': total_land_use_costs_stations_year,
+        })
@@ -4,55 +4,35 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_service_failure import InputServiceFailure
+from calculation.mode_table import registry_mode_table, costs_table, select_row, check_calculator
+from calculation.cost_result import CostResult
 
 class ServiceFailureCalculator:
-    def __init__(self, mode='e_scooter', method='advanced'):
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'service_failure_factor': 'service_failure_factor',
+        'usage_time': 'usage_time',
+        'annual_mileage': 'annual_mileage',
+        'occupancy_rate': 'occupancy_rate',
+    }
+
+    def __init__(self, mode='e_scooter', method='advanced', registry=None):
         """
         Initialize the ServiceFailureCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'e_scooter').
             method (str): Calculation method (default: 'advanced').
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_service_failure = InputServiceFailure()
+        self.input_service_failure = InputServiceFailure(registry)
         self.tag = 'Service Failure'
-        self.result = {}
+        self.result = CostResult()
 
-        # Call the init_vehicle_modes method to initialize vehicle-specific data
-        self.init_vehicle_modes()
-
-    def init_vehicle_modes(self):
-        """
-        Initialize a dictionary of vehicle modes with associated data.
-        """
-        self.modes = {
-            'private_bicycle': {
-                'service_failure_factor': self.input_service_failure.service_failure_factor_private_bicycle,
-                'usage_time': self.input_service_failure.usage_time_private_bicycle,
-                'annual_mileage': self.input_service_failure.annual_mileage_private_bicycle,
-                'occupancy_rate': self.input_service_failure.occupancy_rate_private_bicycle,
-            },
-            'shared_bicycle': {
-                'service_failure_factor': self.input_service_failure.service_failure_factor_shared_bicycle,
-                'usage_time': self.input_service_failure.usage_time_shared_bicycle,
-                'annual_mileage': self.input_service_failure.annual_mileage_shared_bicycle,
-                'occupancy_rate': self.input_service_failure.occupancy_rate_shared_bicycle,
-            },
-            'private_pedelec': {
-                'service_failure_factor': self.input_service_failure.service_failure_factor_private_pedelec,
-                'usage_time': self.input_service_failure.usage_time_private_pedelec,
-                'annual_mileage': self.input_service_failure.annual_mileage_private_pedelec,
-                'occupancy_rate': self.input_service_failure.occupancy_rate_private_pedelec,
-            },
-            'shared_pedelec': {
-                'service_failure_factor': self.input_service_failure.service_failure_factor_shared_pedelec,
-                'usage_time': self.input_service_failure.usage_time_shared_pedelec,
-                'annual_mileage': self.input_service_failure.annual_mileage_shared_pedelec,
-                'occupancy_rate': self.input_service_failure.occupancy_rate_shared_pedelec,
-            },
-        }
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_service_failure.registry.modes
 
     def calc_costs(self):
         """
@@ -60,16 +40,34 @@ class ServiceFailureCalculator:
 
         Returns:
             dict: Calculated service failure costs.
+
+        Raises:
+            ValueError: If the mode is not supported, see check_calculator().
         """
-        if self.mode not in self.modes:
-            return {'mode': 0}  # Return a default value if the mode is not recognized
+        check_calculator(self)
+
+        # Store the results in the 'result' dictionary
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
 
-        mode_data = self.modes[self.mode]
+        # Return the calculated results
+        return self.result
+
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate service failure costs for several modes at once on the mode table.
 
-        service_failure_factor = mode_data['service_failure_factor']
-        usage_time = mode_data['usage_time']
-        annual_mileage = mode_data['annual_mileage']
-        occupancy_rate = mode_data['occupancy_rate']
+        Args:
+            modes (list): Vehicle modes (default: all modes).
+
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        table = registry_mode_table(self.input_service_failure, self.MODE_FIELDS, modes)
+
+        service_failure_factor = table['service_failure_factor']
+        usage_time = table['usage_time']
+        annual_mileage = table['annual_mileage']
+        occupancy_rate = table['occupancy_rate']
 
         # Calculate total service_failure costs per year in €
         total_service_failure_costs_year = (
@@ -86,16 +84,8 @@ class ServiceFailureCalculator:
             total_service_failure_costs_year * 100 / annual_mileage
         )
 
-        # Store the results in the 'result' dictionary
-        self.result['cost per vkm'] = total_service_failure_costs_vkm
-        self.result['cost per pkm'] = total_service_failure_costs_pkm
-        self.result['cost per year'] = total_service_failure_costs_year
-
-        # Return the calculated results
-        return self.result
-    
-
-
-
-
-    
+        return costs_table(table['mode'], {
+            'cost per vkm': total_service_failure_costs_vkm,
+            'cost per pkm': total_service_failure_costs_pkm,
+            'cost per year': total_service_failure_costs_year,
+        })
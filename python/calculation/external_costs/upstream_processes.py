@@ -1,144 +1,155 @@
 import os
 import sys
+import numpy as np
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from input.external_costs.input_upstream_processes import InputUpstreamProcesses
+from calculation.mode_table import registry_mode_table, costs_table, select_row, sample_shape, check_calculator
+from calculation.energy_production_kernel import broadcast_modes
+from calculation.cost_result import CostResult
+from calculation.discount_rates import time_preference_cost_rates
 
 class UpstreamProcessesCalculator:
-    def __init__(self, mode='private_bicycle', method='1_time_pref'):
+    # GHG cost rates of the time preference methods
+    COST_RATES = {
+        '0_time_pref': 'cost_rate_GHG_0_percent',
+        '1_time_pref': 'cost_rate_GHG_1_percent',
+    }
+
+    # Parameters of the mode table per field, see registry_mode_table()
+    MODE_FIELDS = {
+        'GHG_emissions_manufacturing_assembly_disposal_vkm': 'GHG_emissions_manufacturing_assembly_disposal_vkm',
+        'GHG_emissions_manufacturing_assembly_disposal_pkm': 'GHG_emissions_manufacturing_assembly_disposal_pkm',
+        'GHG_emissions_delivery_vkm': 'GHG_emissions_delivery_vkm',
+        'GHG_emissions_delivery_pkm': 'GHG_emissions_delivery_pkm',
+        # 'GHG_emissions_operational_services_vkm': 'GHG_emissions_operational_services_vkm',
+        # 'GHG_emissions_operational_services_pkm': 'GHG_emissions_operational_services_pkm',
+        # 'GHG_emissions_infrastructure_network_vkm': 'GHG_emissions_infrastructure_network_vkm',
+        # 'GHG_emissions_infrastructure_network_pkm': 'GHG_emissions_infrastructure_network_pkm',
+        'annual_mileage': 'annual_mileage',
+    }
+
+    def __init__(self, mode='private_bicycle', method='1_time_pref', registry=None):
         """
         Initialize the UpstreamProcessesCalculator instance.
 
         Args:
             mode (str): Vehicle mode (default: 'private_bicycle').
             method (str): Calculation method (default: '1_time_pref').
+            registry (ParameterRegistry): Registry of the input parameters (default: the shared registry).
         """
         self.mode = mode
         self.method = method
-        self.input_upstream_processes = InputUpstreamProcesses()
+        self.input_upstream_processes = InputUpstreamProcesses(registry)
         self.tag = 'Upstream Processes'
-        self.result = {}
+        self.result = CostResult()
 
-        # Call the init_vehicle_modes method to initialize vehicle-specific data
-        self.init_vehicle_modes()
+        # Modes of the registry, one row of the mode table each
+        self.modes = self.input_upstream_processes.registry.modes
 
-    def init_vehicle_modes(self):
-        """
-        Initialize a dictionary of vehicle modes with associated data.
+    def calc_costs(self):
         """
-        self.modes = {
-            'private_bicycle': {
-                'GHG_emissions_manufacturing_assembly_disposal_vkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_vkm_private_bicycle,
-                'GHG_emissions_manufacturing_assembly_disposal_pkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_pkm_private_bicycle,
-                'GHG_emissions_delivery_vkm': self.input_upstream_processes.GHG_emissions_delivery_vkm_private_bicycle,
-                'GHG_emissions_delivery_pkm': self.input_upstream_processes.GHG_emissions_delivery_pkm_private_bicycle,
-                # 'GHG_emissions_operational_services_vkm': self.input_upstream_processes.GHG_emissions_operational_services_vkm_private_bicycle,
-                # 'GHG_emissions_operational_services_pkm': self.input_upstream_processes.GHG_emissions_operational_services_pkm_private_bicycle,
-                # 'GHG_emissions_infrastructure_network_vkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_vkm_private_bicycle,
-                # 'GHG_emissions_infrastructure_network_pkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_pkm_private_bicycle,
-                'annual_mileage': self.input_upstream_processes.annual_mileage_private_bicycle,
-            },
-            'shared_bicycle': {
-                'GHG_emissions_manufacturing_assembly_disposal_vkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_vkm_shared_bicycle,
-                'GHG_emissions_manufacturing_assembly_disposal_pkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_pkm_shared_bicycle,
-                'GHG_emissions_delivery_vkm': self.input_upstream_processes.GHG_emissions_delivery_vkm_shared_bicycle,
-                'GHG_emissions_delivery_pkm': self.input_upstream_processes.GHG_emissions_delivery_pkm_shared_bicycle,
-                # 'GHG_emissions_operational_services_vkm': self.input_upstream_processes.GHG_emissions_operational_services_vkm_shared_bicycle,
-                # 'GHG_emissions_operational_services_pkm': self.input_upstream_processes.GHG_emissions_operational_services_pkm_shared_bicycle,
-                # 'GHG_emissions_infrastructure_network_vkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_vkm_shared_bicycle,
-                # 'GHG_emissions_infrastructure_network_pkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_pkm_shared_bicycle,
-                'annual_mileage': self.input_upstream_processes.annual_mileage_shared_bicycle,
-            },
-            'private_pedelec': {
-                'GHG_emissions_manufacturing_assembly_disposal_vkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_vkm_private_pedelec,
-                'GHG_emissions_manufacturing_assembly_disposal_pkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_pkm_private_pedelec,
-                'GHG_emissions_delivery_vkm': self.input_upstream_processes.GHG_emissions_delivery_vkm_private_pedelec,
-                'GHG_emissions_delivery_pkm': self.input_upstream_processes.GHG_emissions_delivery_pkm_private_pedelec,
-                # 'GHG_emissions_operational_services_vkm': self.input_upstream_processes.GHG_emissions_operational_services_vkm_private_pedelec,
-                # 'GHG_emissions_operational_services_pkm': self.input_upstream_processes.GHG_emissions_operational_services_pkm_private_pedelec,
-                # 'GHG_emissions_infrastructure_network_vkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_vkm_private_pedelec,
-                # 'GHG_emissions_infrastructure_network_pkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_pkm_private_pedelec,
-                'annual_mileage': self.input_upstream_processes.annual_mileage_private_pedelec,
-            },
-            'shared_pedelec': {
-                'GHG_emissions_manufacturing_assembly_disposal_vkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_vkm_shared_pedelec,
-                'GHG_emissions_manufacturing_assembly_disposal_pkm': self.input_upstream_processes.GHG_emissions_manufacturing_assembly_disposal_pkm_shared_pedelec,
-                'GHG_emissions_delivery_vkm': self.input_upstream_processes.GHG_emissions_delivery_vkm_shared_pedelec,
-                'GHG_emissions_delivery_pkm': self.input_upstream_processes.GHG_emissions_delivery_pkm_shared_pedelec,
-                # 'GHG_emissions_operational_services_vkm': self.input_upstream_processes.GHG_emissions_operational_services_vkm_shared_pedelec,
-                # 'GHG_emissions_operational_services_pkm': self.input_upstream_processes.GHG_emissions_operational_services_pkm_shared_pedelec,
-                # 'GHG_emissions_infrastructure_network_vkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_vkm_shared_pedelec,
-                # 'GHG_emissions_infrastructure_network_pkm': self.input_upstream_processes.GHG_emissions_infrastructure_network_pkm_shared_pedelec,
-                'annual_mileage': self.input_upstream_processes.annual_mileage_shared_pedelec,
-            }
+        Calculate upstream processes costs based on the selected 'mode' and 'method'.
 
-        }
+        Returns:
+            dict: Calculated upstream processes costs.
 
+        Raises:
+            ValueError: If the mode or the method is not supported, see check_calculator().
+        """
+        check_calculator(self, list(self.COST_RATES))
+        self.result = select_row(self.calc_costs_table([self.mode]), 0)
+        return self.result
 
-    def calc_costs(self):
-            """
-            Calculate upstream processes costs based on the selected 'mode' and 'method'.
+    def calc_costs_table(self, modes=None):
+        """
+        Calculate upstream processes costs of the selected 'method' for several modes at once on the mode table.
 
-            Returns:
-                dict: Calculated upstream processes costs.
-            """
-            if self.mode not in self.modes:
-                return {'mode': 0}  # Return a default value if the mode is not recognized
+        Args:
+            modes (list): Vehicle modes (default: all modes).
 
-            mode_data = self.modes[self.mode]
+        Returns:
+            np.ndarray: Costs table with one row per mode and one field per result of calc_costs(), see costs_table().
+        """
+        modes = list(self.modes) if modes is None else modes
+        costs = self.calc_costs_batch(modes, [self.method])
+        return costs_table(modes, {name: values[:, 0] for name, values in costs.items()})
 
-            GHG_emissions_manufacturing_assembly_disposal_vkm = mode_data['GHG_emissions_manufacturing_assembly_disposal_vkm']
-            GHG_emissions_manufacturing_assembly_disposal_pkm = mode_data['GHG_emissions_manufacturing_assembly_disposal_pkm']
-            GHG_emissions_delivery_vkm = mode_data['GHG_emissions_delivery_vkm']
-            GHG_emissions_delivery_pkm = mode_data['GHG_emissions_delivery_pkm']
-            # GHG_emissions_operational_services_vkm = mode_data['GHG_emissions_operational_services_vkm']
-            # GHG_emissions_operational_services_pkm = mode_data['GHG_emissions_operational_services_pkm']
-            # GHG_emissions_infrastructure_network_vkm = mode_data['GHG_emissions_infrastructure_network_vkm']
-            # GHG_emissions_infrastructure_network_pkm = mode_data['GHG_emissions_infrastructure_network_pkm']
-            annual_mileage = mode_data['annual_mileage']
+    def calc_costs_batch(self, modes=None, methods=None):
+        """
+        Calculate upstream processes costs of several modes and time preferences at once.
 
+        Args:
+            modes (list): Vehicle modes (default: all modes).
+            methods (list): Time preference methods, '0_time_pref' and/or '1_time_pref' (default: both).
 
-            if self.method == '0_time_pref':
-                
-                # calculate the total upstream processes costs in €-ct/pkm & vkm
-                total_upstream_processes_costs_vkm_0_percent = (GHG_emissions_manufacturing_assembly_disposal_vkm + GHG_emissions_delivery_vkm) * (100 / 1000000) * self.input_upstream_processes.cost_rate_GHG_0_percent # + GHG_emissions_operational_services_vkm + GHG_emissions_infrastructure_network_vkm
+        Returns:
+            dict: Costs keyed like the result of calc_costs(), arrays of shape (modes, methods).
+        """
+        methods = list(self.COST_RATES) if methods is None else methods
+        return self.calc_upstream_processes_costs(modes, [getattr(self.input_upstream_processes, self.COST_RATES[method]) for method in methods])
 
-                total_upstream_processes_costs_pkm_0_percent = (GHG_emissions_manufacturing_assembly_disposal_pkm + GHG_emissions_delivery_pkm) * (100 / 1000000) * self.input_upstream_processes.cost_rate_GHG_0_percent # + GHG_emissions_operational_services_pkm + GHG_emissions_infrastructure_network_pkm
+    def calc_costs_sweep(self, discount_rates, modes=None, interpolation='log'):
+        """
+        Calculate upstream processes costs of several modes for a range of discount rates at once.
 
-                # calculate the total upstream processes costs in €/year
-                total_upstream_processes_costs_year_0_percent = total_upstream_processes_costs_vkm_0_percent  * annual_mileage / 100
+        The GHG cost rates are interpolated between the time preference methods, see interpolate_cost_rates().
 
-                self.result['cost per vkm'] = total_upstream_processes_costs_vkm_0_percent
-                self.result['cost per pkm'] = total_upstream_processes_costs_pkm_0_percent
-                self.result['cost per year'] = total_upstream_processes_costs_year_0_percent
-                    
-                return self.result
-                
-            
-            elif self.method == '1_time_pref':
-                
-                # calculate the total upstream processes costs in €-ct/pkm & vkm
-                total_upstream_processes_costs_vkm_1_percent = (GHG_emissions_manufacturing_assembly_disposal_vkm + GHG_emissions_delivery_vkm) * (100 / 1000000) * self.input_upstream_processes.cost_rate_GHG_1_percent # + GHG_emissions_operational_services_vkm + GHG_emissions_infrastructure_network_vkm
+        Args:
+            discount_rates (np.ndarray): Discount rates between 0 and 0.01, e.g. np.linspace(0, 0.01, 11).
+            modes (list): Vehicle modes (default: all modes).
+            interpolation (str): 'log' or 'linear' interpolation of the GHG cost rates (default: 'log').
 
-                total_upstream_processes_costs_pkm_1_percent = (GHG_emissions_manufacturing_assembly_disposal_pkm + GHG_emissions_delivery_pkm) * (100 / 1000000) * self.input_upstream_processes.cost_rate_GHG_1_percent # + GHG_emissions_operational_services_pkm  + GHG_emissions_infrastructure_network_pkm
+        Returns:
+            dict: Costs keyed like the result of calc_costs(), arrays of shape (modes, discount rates).
+        """
+        cost_rates = time_preference_cost_rates(self.input_upstream_processes, self.COST_RATES, discount_rates, interpolation=interpolation)
+        return self.calc_upstream_processes_costs(modes, cost_rates)
 
-                # calculate the total upstream processes costs in €/year
-                total_upstream_processes_costs_year_1_percent = total_upstream_processes_costs_vkm_1_percent * annual_mileage / 100
+    def calc_upstream_processes_costs(self, modes, cost_rates):
+        """
+        Calculate upstream processes costs of several modes and GHG cost rates.
 
-                #return total_upstream_processes_costs_vkm_1_percent & total_upstream_processes_costs_pkm_1_percent & total_upstream_processes_costs_year_1_percent
-                self.result['cost per vkm'] = total_upstream_processes_costs_vkm_1_percent
-                self.result['cost per pkm'] = total_upstream_processes_costs_pkm_1_percent
-                self.result['cost per year'] = total_upstream_processes_costs_year_1_percent
-                    
-                return self.result
+        Args:
+            modes (list): Vehicle modes (default: all modes).
+            cost_rates (np.ndarray): GHG cost rates in €/t CO2-eq, shape (rate sets,) or (rate sets, samples).
 
+        Returns:
+            dict: Costs per vkm, pkm and year, arrays of shape (modes, rate sets[, samples]).
+        """
+        table = registry_mode_table(self.input_upstream_processes, self.MODE_FIELDS, modes)
+        cost_rates = np.asarray(cost_rates, dtype=np.float64)
+
+        # Sample axis after the rate sets if the mode parameters are sampled
+        if sample_shape(table) and cost_rates.ndim == 1:
+            cost_rates = cost_rates[:, np.newaxis]
+        ndim = 1 + cost_rates.ndim
+
+        GHG_emissions_manufacturing_assembly_disposal_vkm = broadcast_modes(table['GHG_emissions_manufacturing_assembly_disposal_vkm'], ndim)
+        GHG_emissions_manufacturing_assembly_disposal_pkm = broadcast_modes(table['GHG_emissions_manufacturing_assembly_disposal_pkm'], ndim)
+        GHG_emissions_delivery_vkm = broadcast_modes(table['GHG_emissions_delivery_vkm'], ndim)
+        GHG_emissions_delivery_pkm = broadcast_modes(table['GHG_emissions_delivery_pkm'], ndim)
+        annual_mileage = broadcast_modes(table['annual_mileage'], ndim)
+
+        # calculate the total upstream processes costs in €-ct/pkm & vkm
+        total_upstream_processes_costs_vkm = (GHG_emissions_manufacturing_assembly_disposal_vkm + GHG_emissions_delivery_vkm) * (100 / 1000000) * cost_rates # + GHG_emissions_operational_services_vkm + GHG_emissions_infrastructure_network_vkm
+        total_upstream_processes_costs_pkm = (GHG_emissions_manufacturing_assembly_disposal_pkm + GHG_emissions_delivery_pkm) * (100 / 1000000) * cost_rates # + GHG_emissions_operational_services_pkm + GHG_emissions_infrastructure_network_pkm
+
+        # calculate the total upstream processes costs in €/year
+        total_upstream_processes_costs_year = total_upstream_processes_costs_vkm * annual_mileage / 100
+
+        return {
+            'cost per vkm': total_upstream_processes_costs_vkm,
+            'cost per pkm': total_upstream_processes_costs_pkm,
+            'cost per year': total_upstream_processes_costs_year,
+        }
 
-calculator = UpstreamProcessesCalculator(mode='shared_bicycle', method='1_time_pref')
 
-result = calculator.calc_costs()
+if __name__ == "__main__":
+    calculator = UpstreamProcessesCalculator(mode='shared_bicycle', method='1_time_pref')
 
-if calculator.mode == 'shared_bicycle':
+    result = calculator.calc_costs()
 
     print('Results for mode shared_bicycle:')
     print('Cost per vkm:', result['cost per vkm'])
@@ -1,6 +1,263 @@
+import os
+import sys
+import glob
+import hashlib
+import functools
+import importlib
 import datetime as dt
-import pandas as pd
-import numpy as np
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+# Add the path to the 'python' directory for importing the category calculators
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+# ======================================================================================
+#                   CATEGORY CALCULATORS AND METHOD SETS
+# ======================================================================================
+
+
+# Category calculator classes per tag, imported on first use
+category_calculators = {
+    'Air Pollution': 'calculation.external_costs.air_pollution:AirPollutionCalculator',
+    'Climate Change': 'calculation.external_costs.climate_change:ClimateChangeCalculator',
+    'Land Use': 'calculation.external_costs.land_use:LandUseCalculator',
+    'Collisions': 'calculation.external_costs.collisions:CollisionsCalculator',
+    'Barrier Effects': 'calculation.external_costs.barrier_effects:BarrierEffectsCalculator',
+    'Upstream Processes': 'calculation.external_costs.upstream_processes:UpstreamProcessesCalculator',
+    'Service Failure': 'calculation.external_costs.service_failure:ServiceFailureCalculator',
+    'Health Benefits': 'calculation.external_costs.health_benefits:HealthBenefitsCalculator',
+}
+
+# Categories and their methods per method set as wired in main.ipynb, None uses the calculator's default method
+method_sets = {
+    '1_time_pref': {
+        'Air Pollution': None, 'Climate Change': '1_time_pref', 'Land Use': None, 'Collisions': 'damage_potential',
+        'Barrier Effects': None, 'Upstream Processes': '1_time_pref', 'Service Failure': None, 'Health Benefits': None,
+    },
+    '0_time_pref': {
+        'Air Pollution': None, 'Climate Change': '0_time_pref', 'Land Use': None, 'Collisions': 'damage_potential',
+        'Barrier Effects': None, 'Upstream Processes': '0_time_pref', 'Service Failure': None, 'Health Benefits': None,
+    },
+    'causer': {
+        'Air Pollution': None, 'Climate Change': '1_time_pref', 'Land Use': None, 'Collisions': 'causer',
+        'Barrier Effects': None, 'Upstream Processes': '1_time_pref', 'Service Failure': None,
+    },
+    'damage_potential_infrastructure': {
+        'Air Pollution': None, 'Climate Change': '1_time_pref', 'Land Use': None, 'Collisions': 'damage_potential_infrastructure',
+        'Barrier Effects': None, 'Upstream Processes': '1_time_pref', 'Service Failure': None, 'Health Benefits': None,
+    },
+    'causer_infrastructure': {
+        'Air Pollution': None, 'Climate Change': '1_time_pref', 'Land Use': None, 'Collisions': 'causer_infrastructure',
+        'Barrier Effects': None, 'Upstream Processes': '1_time_pref', 'Service Failure': None,
+    },
+}
+
+# Categories that only distinguish private and shared vehicles use the private vehicle for the aggregated modes
+aggregated_modes = {
+    'all_bicycle': 'private_bicycle',
+    'all_pedelec': 'private_pedelec',
+}
+
+# Collision methods of the infrastructure scenarios, only defined for the aggregated modes
+infrastructure_collision_methods = ['damage_potential_infrastructure', 'causer_infrastructure']
+
+# Cost columns of the category results
+cost_columns = ['cost per vkm', 'cost per pkm', 'cost per year']
+
+# Source files of the calculation, see code_version(). utils/ is hashed as a whole, its caches, statistics
+# and locks are used by the calculators and the run store keeps the results
+code_directories = [
+    os.path.dirname(__file__),
+    os.path.join(os.path.dirname(__file__), 'external_costs'),
+    os.path.join(os.path.dirname(__file__), '..', 'input', 'external_costs'),
+    os.path.join(os.path.dirname(__file__), '..', 'utils'),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    Code version of the calculation, e.g. part of the keys of memoized sweep points and of the metadata of stored runs.
+
+    Returns:
+        str: Hash of the source files of the calculators, their input, the evaluation and the utilities they use.
+    """
+    digest = hashlib.sha256()
+    for directory in code_directories:
+        for path in sorted(glob.glob(os.path.join(directory, '*.py'))):
+            digest.update(os.path.basename(path).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def category_calculator_class(tag):
+    """
+    Import the calculator class of a category.
+
+    Args:
+        tag (str): Tag of the category, e.g. 'Air Pollution'.
+
+    Returns:
+        type: Calculator class of the category.
+    """
+    module_name, class_name = category_calculators[tag].split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def check_category_mode(tag, mode, method=None):
+    """
+    Check that a category calculator supports a mode and method before it is built and calculated.
+
+    Args:
+        tag (str): Tag of the category, e.g. 'Collisions'.
+        mode (str): Mode of the calculator.
+        method (str): Method of the calculator, None for its default method.
+
+    Raises:
+        ValueError: If the method is not defined for the mode, e.g. the infrastructure scenarios of the collisions for a single mode.
+    """
+    if tag == 'Collisions' and method in infrastructure_collision_methods and mode not in aggregated_modes:
+        raise ValueError(f"The collisions method '{method}' is only defined for the modes {', '.join(aggregated_modes)}, not for '{mode}'.")
+
+
+def check_batch(modes, methods):
+    """
+    Check that every combination of modes and method sets of a batch can be evaluated.
+
+    Args:
+        modes (list): Modes, e.g. 'private_bicycle' or 'all_bicycle'.
+        methods (list): Method sets, see 'method_sets'.
+
+    Raises:
+        ValueError: If a method set is unknown or not defined for a mode, listing all unsupported combinations.
+    """
+    unknown_methods = [method for method in methods if method not in method_sets]
+    if unknown_methods:
+        raise ValueError(f"Unknown method sets: {', '.join(unknown_methods)}, expected one of {', '.join(method_sets)}.")
+
+    unsupported = []
+    for mode in modes:
+        for method in methods:
+            try:
+                check_category_mode('Collisions', mode, method_sets[method]['Collisions'])
+            except ValueError:
+                unsupported.append(f'{mode} x {method}')
+    if unsupported:
+        raise ValueError(f"Unsupported combinations of modes and method sets: {', '.join(unsupported)}, "
+                         f"the infrastructure method sets are only defined for the modes {', '.join(aggregated_modes)}.")
+
+
+class EvaluationError(Exception):
+    def __init__(self, errors):
+        """
+        Error raised when the calculation of one or more categories fails during a parallel evaluation.
+
+        Args:
+            errors (dict): Exception per category tag, in the order the categories were appended.
+        """
+        self.errors = errors
+        details = ', '.join(f'{key} ({type(error).__name__}: {error})' for key, error in errors.items())
+        super().__init__(f'Calculation failed for {len(errors)} categories: {details}')
+
+
+# ======================================================================================
+#                   EVALUATION
+# ======================================================================================
+
+
+def resolve_executor(executor, max_workers=None):
+    """
+    Executor of a parallel calculation.
+
+    Args:
+        executor: None for sequential calculation, 'thread' or 'process' for a new thread or process pool,
+            or an existing concurrent.futures.Executor.
+        max_workers (int): Number of workers of a new thread or process pool (default: number of CPUs).
+
+    Returns:
+        The existing executor, a new thread or process pool that the caller shuts down, or None for sequential calculation.
+
+    Raises:
+        ValueError: If the executor is unknown.
+    """
+    if executor is None or isinstance(executor, Executor):
+        return executor
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor '{executor}', expected 'thread', 'process' or a concurrent.futures.Executor.")
+
+
+def calc_costs(calculator):
+    """
+    Calculate the costs of a category calculator, defined on module level so that it can be sent to worker processes.
+
+    Args:
+        calculator: Category calculator.
+
+    Returns:
+        CostResult: Result of the calculator's calc_costs().
+    """
+    return calculator.calc_costs()
+
+
+def calc_costs_all(calculators, executor=None, max_workers=None):
+    """
+    Calculate the costs of several category calculators, one after another or on an executor.
+
+    Args:
+        calculators (dict): Category calculators by key.
+        executor: None for sequential calculation, 'thread' or 'process' for a new thread or process pool,
+            or an existing concurrent.futures.Executor.
+        max_workers (int): Number of workers of a new thread or process pool (default: one per calculator).
+
+    Returns:
+        dict: Result per key, in the order of 'calculators'.
+
+    Raises:
+        EvaluationError: If the calculation of one or more calculators fails on an executor.
+    """
+    pool = resolve_executor(executor, max_workers or max(len(calculators), 1))
+    if pool is None:
+        return {key: calculator.calc_costs() for key, calculator in calculators.items()}
+
+    try:
+        futures = {key: pool.submit(calc_costs, calculator) for key, calculator in calculators.items()}
+        results = {}
+        errors = {}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as error:
+                errors[key] = error
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+
+    if errors:
+        raise EvaluationError(errors) from next(iter(errors.values()))
+    return results
+
+
+def results_frame(rows, id_columns):
+    """
+    Build a tidy results table from result rows.
+
+    Args:
+        rows (list): Result rows, see ExternalCostsCalculator.results_rows().
+        id_columns (list): Columns identifying a row, e.g. 'mode', 'method' and 'category'.
+
+    Returns:
+        pd.DataFrame: Results table with the identifying columns, the cost columns and the cost components.
+    """
+    # pandas is imported on first use, so importing the calculator stays fast
+    import pandas as pd
+
+    components = [column for column in dict.fromkeys(column for row in rows for column in row) if column not in id_columns + cost_columns]
+    return pd.DataFrame(rows, columns=id_columns + cost_columns + components)
+
 
 class ExternalCostsCalculator:
     def __init__(self):
@@ -29,22 +286,149 @@ class ExternalCostsCalculator:
         key = calculation.tag
         self.calculators[key] = calculation
         
-    def evaluate(self):
+    def evaluate(self, executor=None, max_workers=None):
         """
         Evaluate the costs and update the results.
+
+        By default the categories are calculated one after another. With an executor independent categories
+        are calculated at the same time, the results are merged in the order the categories were appended.
+        With a process pool the calculators run on copies, so attributes set by calc_costs() (e.g. the
+        scenario results of the collisions) are only available in 'results', not on the calculator objects.
+
+        Args:
+            executor: None for sequential evaluation, 'thread' or 'process' for a new thread or process pool,
+                or an existing concurrent.futures.Executor.
+            max_workers (int): Number of workers of a new thread or process pool (default: one per category).
+
+        Raises:
+            EvaluationError: If the calculation of one or more categories fails during a parallel evaluation.
+        """
+        self.set_results(calc_costs_all(self.calculators, executor, max_workers))
+
+    def set_results(self, cost_by_category):
+        """
+        Set the results per category and sum up the total costs.
+
+        The results of the categories are immutable CostResults, so several ExternalCostsCalculators
+        can share the result of one category calculator without copies.
+
+        Args:
+            cost_by_category (dict): Result per category tag.
         """
         self.results['Total Cost']['total cost per vkm'] = 0
         self.results['Total Cost']['total cost per pkm'] = 0
         self.results['Total Cost']['total cost per year'] = 0
-        
-        for key, calculator in self.calculators.items():
-            self.results['Cost by Category'][key] = calculator.calc_costs()
-        
+
+        self.results['Cost by Category'].update(cost_by_category)
+
         for key, result in self.results['Cost by Category'].items():
             self.results['Total Cost']['total cost per vkm'] += result['cost per vkm']
             self.results['Total Cost']['total cost per pkm'] += result['cost per pkm']
             self.results['Total Cost']['total cost per year'] += result['cost per year']
 
-            
+    def results_rows(self):
+        """
+        Results per category and the total costs as rows of a tidy table.
+
+        Returns:
+            list: One dict per category plus one for the category 'Total', with the cost columns and
+                the scalar cost components of the category (e.g. 'cost per pkm idling').
+        """
+        import numpy as np
+
+        rows = [{'category': tag, **{column: value for column, value in result.items() if np.isscalar(value)}} for tag, result in self.results['Cost by Category'].items()]
+        rows.append({'category': 'Total', **{column: self.results['Total Cost'][f'total {column}'] for column in cost_columns}})
+        return rows
+
+    @classmethod
+    def evaluate_bundles(cls, bundles, executor=None, max_workers=None):
+        """
+        Evaluate several cost bundles, each distinct category calculator is built and calculated only once.
+
+        A bundle lists the categories of one ExternalCostsCalculator with their method and optionally a mode
+        that differs from the mode of the bundle, e.g. {'mode': 'all_bicycle', 'categories': {'Air Pollution':
+        {'mode': 'private_bicycle'}, 'Collisions': {'method': 'causer'}}}. Categories without a method use the
+        default method of their calculator.
+
+        Args:
+            bundles (dict): Bundles by name.
+            executor: None for sequential calculation, 'thread' or 'process' for a new thread or process pool,
+                or an existing concurrent.futures.Executor.
+            max_workers (int): Number of workers of a new thread or process pool.
+
+        Returns:
+            dict: Evaluated ExternalCostsCalculator per bundle name.
+
+        Raises:
+            ValueError: If a category of a bundle does not support its mode and method, see check_category_mode().
+        """
+        # Distinct category calculators of all bundles
+        calculators = {}
+        bundle_keys = {}
+        for name, bundle in bundles.items():
+            keys = []
+            for tag, options in bundle['categories'].items():
+                options = options or {}
+                key = (tag, options.get('mode', bundle['mode']), options.get('method'))
+                if key not in calculators:
+                    check_category_mode(*key)
+                    calculator_class = category_calculator_class(tag)
+                    calculators[key] = calculator_class(mode=key[1]) if key[2] is None else calculator_class(mode=key[1], method=key[2])
+                keys.append(key)
+            bundle_keys[name] = keys
+
+        results = calc_costs_all(calculators, executor, max_workers)
+
+        external_costs_calculators = {}
+        for name, keys in bundle_keys.items():
+            external_costs_calculator = cls()
+            external_costs_calculator.mode = bundles[name]['mode']
+            external_costs_calculator.method = bundles[name].get('method', external_costs_calculator.method)
+            for key in keys:
+                external_costs_calculator.append(calculators[key])
+            external_costs_calculator.set_results({key[0]: results[key] for key in keys})
+            external_costs_calculators[name] = external_costs_calculator
+
+        return external_costs_calculators
+
+    @classmethod
+    def evaluate_batch(cls, modes, methods, executor=None, max_workers=None):
+        """
+        Evaluate the external costs of every combination of modes and method sets in one call.
+
+        Each distinct category calculator (category, mode, method) is built and calculated only once,
+        even if it is part of several combinations, e.g. the air pollution of the private bicycle.
+
+        Args:
+            modes (list): Modes, e.g. 'private_bicycle' or 'all_bicycle'.
+            methods (list): Method sets, see 'method_sets', e.g. '1_time_pref' or 'causer'.
+            executor: None for sequential calculation, 'thread' or 'process' for a new thread or process pool,
+                or an existing concurrent.futures.Executor.
+            max_workers (int): Number of workers of a new thread or process pool.
+
+        Returns:
+            pd.DataFrame: One row per mode, method set and category, including the category 'Total',
+                with the columns 'mode', 'method', 'category' and the cost columns.
+
+        Raises:
+            ValueError: If a method set is unknown or not defined for a mode, see check_batch().
+        """
+        check_batch(modes, methods)
+
+        bundles = {}
+        for mode in modes:
+            for method in methods:
+                bundles[(mode, method)] = {
+                    'mode': mode,
+                    'method': method,
+                    'categories': {
+                        tag: {'mode': mode if tag == 'Collisions' else aggregated_modes.get(mode, mode), 'method': category_method}
+                        for tag, category_method in method_sets[method].items()
+                    },
+                }
 
+        rows = []
+        for (mode, method), external_costs_calculator in cls.evaluate_bundles(bundles, executor, max_workers).items():
+            rows.extend({'mode': mode, 'method': method, **row} for row in external_costs_calculator.results_rows())
 
+        return results_frame(rows, ['mode', 'method', 'category'])
@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import argparse
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from calculation.external_costs_calculator import ExternalCostsCalculator, category_calculators, check_category_mode, results_frame, code_version
+
+
+# Run configuration of the study in main.ipynb
+default_config_path = os.path.join(os.path.dirname(__file__), '..', 'configs', 'main_study.json')
+
+
+# ======================================================================================
+#                   RUN CONFIGURATION
+# ======================================================================================
+
+
+def load_run_config(config_path):
+    """
+    Load a run configuration from a JSON, YAML or TOML file.
+
+    The configuration lists the cost bundles by name, each with its mode and the included categories,
+    optionally with a method and a mode per category, see ExternalCostsCalculator.evaluate_bundles().
+    The optional keys 'executor' and 'workers' set the default executor of the run.
+
+    Args:
+        config_path (str): Path of the configuration file (.json, .yaml, .yml or .toml).
+
+    Returns:
+        dict: Validated run configuration.
+    """
+    extension = os.path.splitext(config_path)[1].lower()
+
+    if extension == '.json':
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    elif extension in ['.yaml', '.yml']:
+        try:
+            import yaml
+        except ImportError as error:
+            raise ImportError("Reading YAML run configurations requires the 'pyyaml' package.") from error
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+    elif extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError as error:
+                raise ImportError("Reading TOML run configurations requires Python 3.11 or the 'tomli' package.") from error
+        with open(config_path, 'rb') as f:
+            config = tomllib.load(f)
+    else:
+        raise ValueError(f"Unsupported run configuration format '{extension}', expected .json, .yaml, .yml or .toml.")
+
+    validate_run_config(config)
+    return config
+
+
+def validate_run_config(config):
+    """
+    Check that every bundle has a mode and only known categories that support their mode and method.
+
+    Args:
+        config (dict): Run configuration.
+
+    Raises:
+        ValueError: If the configuration is invalid.
+    """
+    if not config.get('bundles'):
+        raise ValueError("The run configuration does not define any bundles.")
+
+    for name, bundle in config['bundles'].items():
+        if 'mode' not in bundle:
+            raise ValueError(f"Bundle '{name}' does not define a mode.")
+        unknown_categories = set(bundle.get('categories') or {}) - set(category_calculators)
+        if unknown_categories:
+            raise ValueError(f"Bundle '{name}' contains unknown categories: {', '.join(sorted(unknown_categories))}.")
+        if not bundle.get('categories'):
+            raise ValueError(f"Bundle '{name}' does not include any categories.")
+        for tag, options in bundle['categories'].items():
+            options = options or {}
+            try:
+                check_category_mode(tag, options.get('mode', bundle['mode']), options.get('method'))
+            except ValueError as error:
+                raise ValueError(f"Bundle '{name}': {error}") from error
+
+
+def run(config, executor=None, max_workers=None):
+    """
+    Evaluate all bundles of a run configuration, each distinct category calculator is calculated once.
+
+    Args:
+        config (dict): Run configuration, see load_run_config().
+        executor: None for the executor of the configuration, 'thread' or 'process' for a new thread or
+            process pool, or an existing concurrent.futures.Executor.
+        max_workers (int): Number of workers of a new thread or process pool.
+
+    Returns:
+        pd.DataFrame: One row per bundle and category, including the category 'Total',
+            with the columns 'bundle', 'mode', 'category', the cost columns and the cost components.
+    """
+    executor = executor if executor is not None else config.get('executor')
+    max_workers = max_workers if max_workers is not None else config.get('workers')
+
+    rows = []
+    for name, external_costs_calculator in ExternalCostsCalculator.evaluate_bundles(config['bundles'], executor, max_workers).items():
+        rows.extend({'bundle': name, 'mode': external_costs_calculator.mode, **row} for row in external_costs_calculator.results_rows())
+
+    return results_frame(rows, ['bundle', 'mode', 'category'])
+
+
+def run_metadata(config=None, registry=None):
+    """
+    Metadata of a run for the run store, identifying the inputs and the code its results were calculated with.
+
+    Args:
+        config (dict): Run configuration, or the modes and method sets of a batch.
+        registry (ParameterRegistry): Registry of the parameter values (default: the shared registry).
+
+    Returns:
+        dict: Parameter hash and version, code version, accident and scenario data hashes and the configuration,
+            see utils.run_store.RunStore.add_run().
+    """
+    from input.external_costs.parameter_registry import ParameterRegistry
+    from input.external_costs.input_collisions import InputCollisions
+
+    registry = registry if registry is not None else ParameterRegistry.shared()
+    input_collisions = InputCollisions.shared()
+    return {
+        'parameter_hash': registry.data_hash,
+        'parameter_version': registry.version,
+        'code_version': code_version(),
+        'accident_data_hash': input_collisions.accident_data_hash(),
+        'scenario_data_hash': input_collisions.scenario_data_hash() if input_collisions.scenario_source_files() else None,
+        'config': config,
+    }
+
+
+if __name__ == "__main__":
+    from utils.run_store import RunStore, default_run_store_path
+
+    parser = argparse.ArgumentParser(description="Evaluate the cost bundles of a run configuration.")
+    parser.add_argument('config', nargs='?', default=default_config_path, help="Run configuration (.json, .yaml, .yml or .toml, default: the study of main.ipynb)")
+    parser.add_argument('--executor', choices=['thread', 'process'], default=None, help="Calculate the categories on a thread or process pool (default: sequential)")
+    parser.add_argument('--workers', type=int, default=None, help="Number of workers of the thread or process pool")
+    parser.add_argument('--output', default=None, help="Write the results to a .csv or .json file instead of printing them")
+    parser.add_argument('--store', default=default_run_store_path, help=f"Run store the results are added to (default: {default_run_store_path})")
+    parser.add_argument('--no-store', action='store_true', help="Do not add the results to the run store")
+    parser.add_argument('--label', default=None, help="Label of the run in the run store")
+    args = parser.parse_args()
+
+    config = load_run_config(args.config)
+    results = run(config, executor=args.executor, max_workers=args.workers)
+
+    if args.output is None:
+        import pandas as pd
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(results)
+    elif args.output.endswith('.json'):
+        results.to_json(args.output, orient='records', indent=2)
+    else:
+        results.to_csv(args.output, index=False)
+
+    if not args.no_store:
+        run_id = RunStore(args.store).add_run(results, run_metadata(config), label=args.label)
+        print(f"Run {run_id} stored in '{args.store}'.")
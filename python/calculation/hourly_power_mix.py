@@ -0,0 +1,378 @@
+import os
+import sys
+import csv
+import hashlib
+import threading
+import numpy as np
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.thread_locks import PicklableLocks
+
+# Hours of the power mix time series and load profiles
+hours_per_year = 8760
+
+# Factor modes: average shares of the generation per hour, or the marginal energy type per hour
+factor_modes = ['average', 'marginal']
+
+# Energy types from the lowest to the highest marginal generation costs, the most expensive type
+# generating in an hour is the marginal one. Types not listed are treated as must-run before the first.
+default_merit_order = ['Solar power', 'Wind energy', 'Water power', 'Bio mass', 'Nuclear energy', 'Brown coal', 'Black coal', 'Gas', 'Oil']
+
+# Annual power consumption of the TIER pedelec fleet, written by vehicles/pedelec.py
+pedelec_attributes_path = os.path.join(os.path.dirname(__file__), '..', '..', 'csv', 'pedelec_attributes.csv')
+
+
+# ======================================================================================
+#                   LOAD PROFILES
+# ======================================================================================
+
+
+def array_hash(*arrays):
+    """
+    Compute the SHA-256 hash of the content of arrays, including their shape and data type.
+
+    Args:
+        *arrays (np.ndarray): Arrays to hash.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode('utf-8'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def load_profile(pattern=None, annual_energy=None, hours=hours_per_year):
+    """
+    Build an hourly load profile by repeating a daily or weekly pattern over the year.
+
+    Args:
+        pattern (list): Relative load per hour, e.g. 24 values of a day or 168 values of a week (default: a constant load).
+        annual_energy (float): Energy of the profile in kWh per year (default: the sum of the profile is 1).
+        hours (int): Number of hours of the profile.
+
+    Returns:
+        np.ndarray: Load per hour, shape (hours,).
+    """
+    pattern = np.ones(24) if pattern is None else np.asarray(pattern, dtype=np.float64)
+    if pattern.ndim != 1 or np.any(pattern < 0) or pattern.sum() <= 0:
+        raise ValueError("The load pattern has to be a one-dimensional array of non-negative values with a positive sum.")
+
+    profile = np.resize(pattern, hours)
+    return profile * ((1.0 if annual_energy is None else annual_energy) / profile.sum())
+
+
+def check_profile(profile, hours):
+    """
+    Check a load profile of a power mix, like the patterns of load_profile().
+
+    Args:
+        profile (np.ndarray): Load per hour.
+        hours (int): Number of hours of the power mix.
+
+    Returns:
+        np.ndarray: Load per hour as float64 array, shape (hours,).
+
+    Raises:
+        ValueError: If the profile is not of shape (hours,), has negative values or no load at all.
+    """
+    profile = np.asarray(profile, dtype=np.float64)
+    if profile.shape != (hours,):
+        raise ValueError(f"The load profile has to be of shape ({hours},), got {profile.shape}.")
+    if np.any(profile < 0) or profile.sum() <= 0:
+        raise ValueError("The load profile has to be non-negative with a positive sum.")
+    return profile
+
+
+def pedelec_load_profiles(charging_pattern=None, idling_pattern=None, attributes_path=pedelec_attributes_path):
+    """
+    Build the charging and idling load profiles of the pedelecs from their annual power consumption.
+
+    The annual consumption driving and idling are TierEbike.power_consumption_driving() and
+    TierEbike.power_consumption_idling() as saved by vehicles/pedelec.py. The consumption driving
+    is drawn from the grid when charging, the idling consumption is a constant load by default.
+
+    Args:
+        charging_pattern (list): Relative charging load per hour of a day or week (default: a constant load).
+        idling_pattern (list): Relative idling load per hour of a day or week (default: a constant load).
+        attributes_path (str): Path of the pedelec attributes (.csv).
+
+    Returns:
+        dict: Load profiles in kWh per hour for the loads 'driving' and 'idling'.
+    """
+    with open(attributes_path, 'r', encoding='utf-8') as f:
+        attributes = next(csv.DictReader(f))
+
+    return {
+        'driving': load_profile(charging_pattern, float(attributes['power_consumption_driving_pedelec'])),
+        'idling': load_profile(idling_pattern, float(attributes['power_consumption_idling_pedelec'])),
+    }
+
+
+# ======================================================================================
+#                   HOURLY POWER MIX
+# ======================================================================================
+
+
+class HourlyPowerMix(PicklableLocks):
+    def __init__(self, generation, energy_types, factor_mode='average', merit_order=None, result_cache=None):
+        """
+        Initialize an hourly power mix for load-weighted emission and cost factors.
+
+        The power mix of every hour is weighted with the load drawn from the grid in that hour, e.g. the
+        charging profile of a mode. The annual factors are reduced to an effective power mix share per
+        energy type, which the climate change and air pollution calculators use instead of the annual
+        power mix share. Effective shares are cached per load profile, power mix and factor mode.
+
+        Args:
+            generation (np.ndarray): Generation (or share) per hour and energy type, shape (hours, energy types).
+            energy_types (list): Energy types of the columns, named like ClimateChangeCalculator.ENERGY_TYPES.
+            factor_mode (str): 'average' for the average power mix of each hour, 'marginal' for the marginal energy type.
+            merit_order (list): Energy types from the lowest to the highest marginal costs (default: default_merit_order).
+            result_cache (ResultCache): Optional on-disk cache of the effective shares.
+        """
+        generation = np.asarray(generation, dtype=np.float64)
+        if generation.ndim != 2 or generation.shape[1] != len(energy_types):
+            raise ValueError(f"The generation has to be of shape (hours, {len(energy_types)}), got {generation.shape}.")
+        if np.any(generation < 0):
+            raise ValueError("The generation must not be negative.")
+        total_generation = generation.sum(axis=1, keepdims=True)
+        if np.any(total_generation <= 0):
+            raise ValueError("Every hour of the power mix needs a positive generation.")
+        if factor_mode not in factor_modes:
+            raise ValueError(f"Unknown factor mode '{factor_mode}', expected one of {', '.join(factor_modes)}.")
+
+        self.energy_types = list(energy_types)
+        self.shares = generation / total_generation
+        self.shares.flags.writeable = False
+        self.factor_mode = factor_mode
+        self.merit_order = list(default_merit_order if merit_order is None else merit_order)
+        self.result_cache = result_cache
+        self.mix_hash = array_hash(self.shares)
+
+        # Load profiles per (mode, load), loads without a profile draw a constant load
+        self.profiles = {}
+
+        # Effective shares per cache key, see effective_shares()
+        self._effective_shares = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_csv(cls, path, energy_types=None, **kwargs):
+        """
+        Read an hourly power mix with one row per hour and one column per energy type.
+
+        Args:
+            path (str): Path of the power mix (.csv), other columns (e.g. a timestamp) are ignored.
+            energy_types (list): Columns of the energy types (default: the types of default_merit_order in the file).
+            **kwargs: Further arguments of HourlyPowerMix.
+
+        Returns:
+            HourlyPowerMix: Power mix of the file.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+        if energy_types is None:
+            energy_types = [energy_type for energy_type in default_merit_order if energy_type in rows[0]]
+        generation = [[float(row[energy_type] or 0) for energy_type in energy_types] for row in rows]
+        return cls(generation, energy_types, **kwargs)
+
+    @property
+    def hours(self):
+        return self.shares.shape[0]
+
+    def set_profile(self, mode, load, profile):
+        """
+        Set the load profile of a mode.
+
+        Args:
+            mode (str): Vehicle mode, e.g. 'shared_pedelec'.
+            load (str): 'driving' for the charging of the consumption driving, or 'idling'.
+            profile (np.ndarray): Load per hour, shape (hours,), see load_profile().
+
+        Raises:
+            ValueError: If the profile is not of shape (hours,), has negative values or no load at all.
+        """
+        self.profiles[(mode, load)] = check_profile(profile, self.hours)
+
+    def profile(self, mode, load):
+        """
+        Load profile of a mode, a constant load if none is set.
+
+        Args:
+            mode (str): Vehicle mode.
+            load (str): 'driving' or 'idling'.
+
+        Returns:
+            np.ndarray: Load per hour, shape (hours,).
+        """
+        if (mode, load) in self.profiles:
+            return self.profiles[(mode, load)]
+        return load_profile(hours=self.hours)
+
+    def marginal_energy_types(self):
+        """
+        Marginal energy type of every hour, the type with the highest marginal costs that generates in that hour.
+
+        Returns:
+            np.ndarray: Column of the marginal energy type per hour, shape (hours,).
+        """
+        order = [self.energy_types.index(energy_type) for energy_type in self.merit_order if energy_type in self.energy_types]
+        order = [column for column in range(len(self.energy_types)) if column not in order] + order
+
+        # The last generating type in the merit order is the first one in the reversed order
+        generating = self.shares[:, order[::-1]] > 0
+        return np.asarray(order[::-1])[np.argmax(generating, axis=1)]
+
+    def hourly_shares(self, factor_mode=None):
+        """
+        Power mix share per hour, the average mix or the marginal energy type of each hour.
+
+        Args:
+            factor_mode (str): 'average' or 'marginal' (default: the factor mode of the instance).
+
+        Returns:
+            np.ndarray: Shares per hour and energy type, shape (hours, energy types).
+        """
+        factor_mode = self.factor_mode if factor_mode is None else factor_mode
+        if factor_mode == 'average':
+            return self.shares
+        if factor_mode == 'marginal':
+            return np.eye(len(self.energy_types))[self.marginal_energy_types()]
+        raise ValueError(f"Unknown factor mode '{factor_mode}', expected one of {', '.join(factor_modes)}.")
+
+    def hourly_cost_factors(self, cost_rates, factor_mode=None):
+        """
+        Cost factors of the power mix per hour, e.g. the climate costs in €-ct per kWh drawn from the grid.
+
+        Args:
+            cost_rates (dict): Cost rate per energy type in €-ct/kWh, e.g. InputClimateChange.climate_costs_1_percent.
+            factor_mode (str): 'average' or 'marginal' (default: the factor mode of the instance).
+
+        Returns:
+            np.ndarray: Cost factor per hour in €-ct/kWh, shape (hours,).
+        """
+        rates = np.array([cost_rates[energy_type] for energy_type in self.energy_types], dtype=np.float64)
+        return self.hourly_shares(factor_mode) @ rates
+
+    def effective_shares(self, profile, factor_mode=None):
+        """
+        Power mix share per energy type weighted with a load profile.
+
+        The shares of every hour are weighted with the load in that hour, so the costs of the effective
+        power mix equal the load-weighted mean of the hourly cost factors.
+
+        Args:
+            profile (np.ndarray): Load per hour, shape (hours,).
+            factor_mode (str): 'average' or 'marginal' (default: the factor mode of the instance).
+
+        Returns:
+            np.ndarray: Effective share per energy type, shape (energy types,).
+
+        Raises:
+            ValueError: If the profile is not of shape (hours,), has negative values or no load at all.
+        """
+        factor_mode = self.factor_mode if factor_mode is None else factor_mode
+        profile = check_profile(profile, self.hours)
+
+        from utils.result_cache import cache_key
+
+        key = cache_key(profile=array_hash(profile), mix=self.mix_hash, energy_types=self.energy_types,
+                        factor_mode=factor_mode, merit_order=self.merit_order if factor_mode == 'marginal' else None)
+
+        with self._lock:
+            if key in self._effective_shares:
+                return self._effective_shares[key]
+
+        cached = self.result_cache.get(key) if self.result_cache is not None else None
+        if cached is not None:
+            shares = np.array(cached['shares'], dtype=np.float64)
+        else:
+            shares = (profile / profile.sum()) @ self.hourly_shares(factor_mode)
+            if self.result_cache is not None:
+                self.result_cache.put(key, {'shares': shares.tolist()})
+
+        shares.flags.writeable = False
+        with self._lock:
+            self._effective_shares[key] = shares
+        return shares
+
+    def power_mix_share(self, mode, load='driving', factor_mode=None):
+        """
+        Effective power mix share of a mode and load, like the annual power mix share of the Input classes.
+
+        Args:
+            mode (str): Vehicle mode.
+            load (str): 'driving' or 'idling'.
+            factor_mode (str): 'average' or 'marginal' (default: the factor mode of the instance).
+
+        Returns:
+            dict: Effective share per energy type.
+        """
+        return dict(zip(self.energy_types, self.effective_shares(self.profile(mode, load), factor_mode).tolist()))
+
+    def share_matrix(self, modes, load, energy_types):
+        """
+        Effective power mix shares of several modes, e.g. for the energy production kernel.
+
+        Args:
+            modes (list): Vehicle modes.
+            load (str): 'driving' or 'idling'.
+            energy_types (list): Energy types of the columns, types missing in the power mix have a share of 0.
+
+        Returns:
+            np.ndarray: Effective shares, shape (modes, energy types).
+
+        Raises:
+            ValueError: If the power mix has energy types that are not columns, their shares would be lost.
+        """
+        unknown_energy_types = [energy_type for energy_type in self.energy_types if energy_type not in energy_types]
+        if unknown_energy_types:
+            raise ValueError(f"The power mix has energy types without cost rates: {', '.join(unknown_energy_types)}, "
+                             f"expected a subset of {', '.join(energy_types)}.")
+
+        columns = [self.energy_types.index(energy_type) if energy_type in self.energy_types else None for energy_type in energy_types]
+        shares = np.zeros((len(modes), len(energy_types)))
+        for row, mode in enumerate(modes):
+            effective_shares = self.effective_shares(self.profile(mode, load))
+            for column, energy_type_column in enumerate(columns):
+                if energy_type_column is not None:
+                    shares[row, column] = effective_shares[energy_type_column]
+        return shares
+
+
+if __name__ == "__main__":
+    from calculation.external_costs.climate_change import ClimateChangeCalculator
+
+    # Synthetic power mix for demonstration, no hourly power mix ships with the repository
+    hour_of_day = np.arange(hours_per_year) % 24
+    rng = np.random.default_rng(2022)
+    solar = np.clip(np.sin((hour_of_day - 6) / 12 * np.pi), 0, None) * 12.0
+    wind = rng.gamma(2.0, 6.0, hours_per_year)
+    demand = 60.0 + 10.0 * np.sin((hour_of_day - 9) / 24 * 2 * np.pi)
+    residual = np.clip(demand - solar - wind - 2.0 - 5.0 - 4.0 - 8.0, 0, None)
+    generation = np.column_stack([
+        solar, wind, np.full(hours_per_year, 2.0), np.full(hours_per_year, 5.0), np.full(hours_per_year, 4.0),
+        np.full(hours_per_year, 8.0), 0.6 * residual, 0.4 * residual, np.where(residual > 40.0, 0.5, 0.0),
+    ])
+    energy_types = ['Solar power', 'Wind energy', 'Water power', 'Bio mass', 'Nuclear energy', 'Brown coal', 'Black coal', 'Gas', 'Oil']
+
+    # Charging at night in the depot or during the day
+    night_charging = [1.0 if hour >= 22 or hour < 6 else 0.0 for hour in range(24)]
+    day_charging = [1.0 if 10 <= hour < 16 else 0.0 for hour in range(24)]
+
+    for factor_mode in factor_modes:
+        power_mix = HourlyPowerMix(generation, energy_types, factor_mode=factor_mode)
+        for name, pattern in [('night', night_charging), ('day', day_charging)]:
+            for load, profile in pedelec_load_profiles(charging_pattern=pattern).items():
+                power_mix.set_profile('shared_pedelec', load, profile)
+
+            calculator = ClimateChangeCalculator('shared_pedelec', '1_time_pref', hourly_power_mix=power_mix)
+            costs = calculator.calc_costs()
+            print(f"{factor_mode:>8} factors, {name:>5} charging: {costs['cost per vkm']:.4f} €-ct/vkm climate change costs")
@@ -0,0 +1,209 @@
+import weakref
+import threading
+import numpy as np
+
+from calculation.cost_result import CostResult
+
+
+# Length of the 'mode' field of the tables, long enough for names like 'all_pedelec_infrastructure'
+mode_field_length = 64
+
+# Mode tables of the calculators per registry, see registry_mode_table()
+_registry_tables = weakref.WeakKeyDictionary()
+_registry_tables_lock = threading.Lock()
+
+
+# ======================================================================================
+#                   MODE TABLE
+# ======================================================================================
+
+
+def mode_table(modes, selected_modes=None, fields=None):
+    """
+    Build a structured array of the mode parameters of a calculator, one row per mode.
+
+    The parameter columns are float64 and can be used for vectorized evaluation of all modes at once,
+    e.g. table['annual_mileage'] * table['occupancy_rate'].
+
+    Parameters drawn by the Monte Carlo engine are 1-D arrays of samples. If any parameter is sampled,
+    every field holds the samples of its mode, scalars are repeated, so table[field] has the shape (modes, samples).
+
+    Args:
+        modes (dict): Parameters per mode, see mode_rows().
+        selected_modes (list): Modes of the rows in this order (default: all modes).
+        fields (list): Parameters of the columns (default: all scalar and sampled parameters of the first mode).
+
+    Returns:
+        np.ndarray: Structured array with the field 'mode' and one float64 field per parameter.
+
+    Raises:
+        ValueError: If sampled parameters differ in the number of samples.
+    """
+    selected_modes = list(modes) if selected_modes is None else list(selected_modes)
+    unknown_modes = [mode for mode in selected_modes if mode not in modes]
+    if unknown_modes:
+        raise KeyError(f"Unknown modes: {', '.join(unknown_modes)}.")
+    if fields is None:
+        first_mode = modes[selected_modes[0]] if selected_modes else next(iter(modes.values()), {})
+        fields = [field for field, value in first_mode.items() if np.isscalar(value) or (isinstance(value, np.ndarray) and value.ndim == 1)]
+
+    columns = {field: [modes[mode][field] for mode in selected_modes] for field in fields}
+    sample_shapes = {np.shape(value) for column in columns.values() for value in column} - {()}
+    if len(sample_shapes) > 1:
+        raise ValueError(f"Sampled parameters differ in the number of samples: {', '.join(str(shape[0]) for shape in sorted(sample_shapes))}.")
+    samples = sample_shapes.pop() if sample_shapes else ()
+
+    table = np.empty(len(selected_modes), dtype=[('mode', f'U{mode_field_length}')] + [(field, np.float64, samples) for field in fields])
+    table['mode'] = selected_modes
+    for field, column in columns.items():
+        table[field] = [np.broadcast_to(value, samples) for value in column] if samples else column
+    return table
+
+
+def mode_rows(view, fields, modes):
+    """
+    Parameters per mode of a calculator, read from the attributes of its Input class.
+
+    The value of a field for a mode is the attribute '<source>_<mode>' of the Input class, e.g. 'annual_mileage_shared_bicycle'
+    of the mode table 'annual_mileage' of the registry. A field can have several sources, the first with a value
+    of the mode is used, numbers are used as they are, e.g. ('nr_stations', 0) for the modes without stations.
+
+    Args:
+        view (ParameterView): Input class of the calculator, e.g. InputLandUse.
+        fields (dict): Source or tuple of sources per field.
+        modes (list): Modes of the rows.
+
+    Returns:
+        dict: Parameters per mode, for mode_table().
+
+    Raises:
+        KeyError: If no source of a field has a value for a mode.
+    """
+    rows = {}
+    for mode in modes:
+        row = {}
+        for field, sources in fields.items():
+            for source in (sources if isinstance(sources, tuple) else (sources,)):
+                value = getattr(view, f'{source}_{mode}', None) if isinstance(source, str) else source
+                if value is not None:
+                    break
+            else:
+                raise KeyError(f"No value of the field '{field}' for the mode '{mode}'.")
+            row[field] = value
+        rows[mode] = row
+    return rows
+
+
+def registry_mode_table(view, fields, selected_modes=None):
+    """
+    Build the mode table of a calculator for the modes of the registry of its Input class.
+
+    A new mode of the parameter file (e.g. 'e_scooter') is a new row without changes to the calculators.
+    Tables are built once per registry, Input class, fields and modes and are read-only. Views with
+    parameters set on the instance (see ParameterView) get a new table, so they do not change the tables of other views.
+
+    Args:
+        view (ParameterView): Input class of the calculator, e.g. InputLandUse.
+        fields (dict): Source or tuple of sources per field, see mode_rows().
+        selected_modes (list): Modes of the rows in this order (default: all modes of the registry).
+
+    Returns:
+        np.ndarray: Structured array with the field 'mode' and one float64 field per parameter, see mode_table().
+    """
+    registry = view.registry
+    selected_modes = tuple(registry.modes if selected_modes is None else selected_modes)
+    if set(vars(view)) & set(registry.attributes(view.parameters)):
+        return mode_table(mode_rows(view, fields, registry.modes), selected_modes, list(fields))
+
+    key = (type(view), tuple(fields.items()), selected_modes)
+    with _registry_tables_lock:
+        tables = _registry_tables.setdefault(registry, {})
+        if key not in tables:
+            table = mode_table(mode_rows(view, fields, registry.modes), selected_modes, list(fields))
+            table.flags.writeable = False
+            tables[key] = table
+        return tables[key]
+
+
+def sample_shape(table):
+    """
+    Shape of the samples per mode of a mode table.
+
+    Args:
+        table (np.ndarray): Mode table, see mode_table().
+
+    Returns:
+        tuple: (samples,) if the table holds sampled parameters, else ().
+    """
+    shapes = {table.dtype[name].shape for name in table.dtype.names if name != 'mode'}
+    return shapes.pop() if len(shapes) == 1 else ()
+
+
+def costs_table(modes, costs):
+    """
+    Build a structured array of the costs of several modes, one row per mode and one field per result.
+
+    Args:
+        modes (list): Modes of the rows.
+        costs (dict): Costs per result name, arrays of shape (modes,) or (modes, n) for results with several
+            values per mode, e.g. the costs by energy type.
+
+    Returns:
+        np.ndarray: Structured array with the field 'mode' and one float64 field per result, in the order of 'costs'.
+    """
+    costs = {name: np.asarray(values, dtype=np.float64) for name, values in costs.items()}
+    dtype = [('mode', f'U{mode_field_length}')] + [(name, np.float64, values.shape[1:]) for name, values in costs.items()]
+
+    table = np.empty(len(modes), dtype=dtype)
+    table['mode'] = modes
+    for name, values in costs.items():
+        table[name] = values
+    return table
+
+
+def select_row(table, index):
+    """
+    Results of one row of a costs table as the result of calc_costs(), floats and tuples for results with several values.
+
+    Args:
+        table (np.ndarray): Costs table, see costs_table().
+        index (int): Position of the row.
+
+    Returns:
+        CostResult: Results per name.
+    """
+    return CostResult({name: table[name][index].tolist() for name in table.dtype.names if name != 'mode'})
+
+
+def check_calculator(calculator, methods=None):
+    """
+    Check that a calculator supports its mode and method before calc_costs() selects its row.
+
+    Args:
+        calculator: Category calculator with the attributes 'mode', 'method' and the parameters per mode 'modes'.
+        methods (list): Methods of the calculator (default: the method is not checked).
+
+    Raises:
+        ValueError: If the mode or the method is not supported by the calculator.
+    """
+    name = type(calculator).__name__
+    if calculator.mode not in calculator.modes:
+        raise ValueError(f"Unsupported mode '{calculator.mode}' for the {name}, expected one of {', '.join(calculator.modes)}.")
+    if methods is not None and calculator.method not in methods:
+        raise ValueError(f"Unsupported method '{calculator.method}' for the {name}, expected one of {', '.join(methods)}.")
+
+
+def metrics_array(table, metrics=None):
+    """
+    Costs of a costs table as a plain (modes x metrics) array.
+
+    Args:
+        table (np.ndarray): Costs table, see costs_table().
+        metrics (list): Results of the columns (default: all results with one value per mode).
+
+    Returns:
+        np.ndarray: float64 array of shape (modes, metrics).
+    """
+    if metrics is None:
+        metrics = [name for name in table.dtype.names if name != 'mode' and table.dtype[name].shape == ()]
+    return np.column_stack([table[name] for name in metrics]) if metrics else np.empty((len(table), 0))
@@ -0,0 +1,427 @@
+import os
+import sys
+import json
+import threading
+import numpy as np
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from input.external_costs.parameter_registry import ParameterRegistry, expand_attributes
+from utils.thread_locks import PicklableLocks
+
+
+# Distributions of the input parameters, relative factors on the values of the parameter file
+default_distributions_path = os.path.join(os.path.dirname(__file__), '..', 'input', 'external_costs', 'parameter_distributions_2022.json')
+
+# Arguments of the distributions besides 'distribution', 'per_key' and 'note'
+distribution_arguments = {
+    'uniform': ('low', 'high'),
+    'triangular': ('low', 'mode', 'high'),
+    'lognormal': ('sigma',),
+}
+
+# Parameters that are not sampled, the hourly power mix covers the uncertainty of the power mix
+unsampled_parameters = ('power_mix_share',)
+
+# Quantiles of the summary of the sampled costs
+summary_quantiles = [0.05, 0.5, 0.95]
+
+
+# ======================================================================================
+#                   PARAMETER DISTRIBUTIONS
+# ======================================================================================
+
+
+class ParameterDistributions:
+    def __init__(self, path=default_distributions_path, registry=None):
+        """
+        Initialize the distributions of the input parameters from a distribution file.
+
+        Every distribution draws relative factors on the values of a parameter, e.g. a triangular distribution
+        between 0.5 and 1.5 for the value of statistical life. Tables (e.g. per mode) get one factor for all keys,
+        or an independent factor per key with 'per_key'. Parameters of the same group share their factors,
+        e.g. the CO2 price of the climate costs and the upstream processes.
+
+        Args:
+            path (str): Path of the distribution file (.json).
+            registry (ParameterRegistry): Registry of the sampled parameters (default: the shared registry).
+
+        Raises:
+            ValueError: If a distribution refers to an unknown parameter or group, or is not valid.
+        """
+        with open(path, 'rb') as f:
+            data = json.loads(f.read().decode('utf-8'))
+
+        self.path = path
+        self.registry = registry if registry is not None else ParameterRegistry.shared()
+        self.version = data['version']
+        self.groups = {name: self.validate_distribution(f"group '{name}'", entry) for name, entry in data.get('groups', {}).items()}
+
+        self.distributions = {}
+        for name, entry in data['distributions'].items():
+            if name in unsampled_parameters:
+                raise ValueError(f"The parameter '{name}' cannot be sampled, use an HourlyPowerMix instead.")
+            if name not in self.registry.scalars and name not in self.registry.tables:
+                raise ValueError(f"Unknown parameter '{name}' in {os.path.basename(path)}.")
+            if 'group' in entry:
+                if entry['group'] not in self.groups:
+                    raise ValueError(f"Unknown group '{entry['group']}' of the parameter '{name}'.")
+                self.distributions[name] = dict(self.groups[entry['group']], group=entry['group'])
+            else:
+                self.distributions[name] = dict(self.validate_distribution(f"parameter '{name}'", entry), group=name)
+            if self.distributions[name].get('per_key') and name not in self.registry.tables:
+                raise ValueError(f"The scalar parameter '{name}' cannot be sampled per key.")
+
+        # Parameters sampled per key of a group need the same keys, e.g. the modes
+        for group in set(distribution['group'] for distribution in self.distributions.values() if distribution.get('per_key')):
+            keys = {self.registry.tables[name].keys for name, distribution in self.distributions.items() if distribution['group'] == group}
+            if len(keys) > 1:
+                raise ValueError(f"The parameters of the group '{group}' are sampled per key but have different keys.")
+
+        # Independent inputs of the sampling: the groups and the parameters without group, in the order of the file
+        self.inputs = list(dict.fromkeys(distribution['group'] for distribution in self.distributions.values()))
+
+    @staticmethod
+    def validate_distribution(label, entry):
+        """
+        Check a distribution of the distribution file.
+
+        Args:
+            label (str): Parameter or group of the distribution, for error messages.
+            entry (dict): Distribution as given in the file.
+
+        Returns:
+            dict: The distribution.
+
+        Raises:
+            ValueError: If the distribution is unknown or its arguments are missing or not valid.
+        """
+        distribution = entry.get('distribution')
+        if distribution not in distribution_arguments:
+            raise ValueError(f"Unknown distribution '{distribution}' of the {label}, expected one of {', '.join(distribution_arguments)}.")
+        missing = [argument for argument in distribution_arguments[distribution] if argument not in entry]
+        if missing:
+            raise ValueError(f"Missing arguments of the {label}: {', '.join(missing)}.")
+        if distribution in ('uniform', 'triangular') and not entry['low'] <= entry.get('mode', entry['low']) <= entry['high']:
+            raise ValueError(f"The {label} requires low <= mode <= high.")
+        if distribution == 'lognormal' and entry['sigma'] < 0:
+            raise ValueError(f"The {label} requires a sigma >= 0.")
+        return dict(entry)
+
+    def sample(self, n_samples, seed=None):
+        """
+        Draw the factors of all sampled parameters.
+
+        Args:
+            n_samples (int): Number of samples.
+            seed (int or np.random.Generator): Seed or generator of the random numbers (default: random).
+
+        Returns:
+            dict: Factors per parameter, arrays of shape (samples,), or (samples, keys) for parameters
+                sampled per key in the order of the keys of their table.
+        """
+        return self.parameter_factors(self.sample_inputs(n_samples, seed))
+
+    def sample_inputs(self, n_samples, seed=None):
+        """
+        Draw the factors of the independent inputs, see 'inputs'.
+
+        The inputs are drawn in the order of the distribution file, so a seed reproduces the samples.
+
+        Args:
+            n_samples (int): Number of samples.
+            seed (int or np.random.Generator): Seed or generator of the random numbers (default: random).
+
+        Returns:
+            dict: Factors per input, arrays of shape (samples,) or (samples, keys).
+        """
+        rng = np.random.default_rng(seed)
+
+        input_factors = {}
+        for name, distribution in self.distributions.items():
+            if distribution['group'] not in input_factors:
+                size = (n_samples, len(self.registry.tables[name])) if distribution.get('per_key') else (n_samples,)
+                input_factors[distribution['group']] = self.draw(rng, distribution, size)
+        return input_factors
+
+    def parameter_factors(self, input_factors):
+        """
+        Factors per parameter from the factors of the inputs, parameters of a group share the factors of the group.
+
+        Args:
+            input_factors (dict): Factors per input, see sample_inputs().
+
+        Returns:
+            dict: Factors per parameter.
+        """
+        return {name: input_factors[distribution['group']] for name, distribution in self.distributions.items()}
+
+    def input_parameters(self, name):
+        """
+        Parameters of an input.
+
+        Args:
+            name (str): Input, a group or a parameter without group.
+
+        Returns:
+            list: Names of the parameters drawn with the factors of the input.
+        """
+        return [parameter for parameter, distribution in self.distributions.items() if distribution['group'] == name]
+
+    @staticmethod
+    def draw(rng, distribution, size):
+        """
+        Draw factors of one distribution.
+
+        Args:
+            rng (np.random.Generator): Random number generator.
+            distribution (dict): Distribution, see validate_distribution().
+            size (tuple): Shape of the factors.
+
+        Returns:
+            np.ndarray: Read-only float64 factors.
+        """
+        if distribution['distribution'] == 'uniform':
+            factors = rng.uniform(distribution['low'], distribution['high'], size)
+        elif distribution['distribution'] == 'triangular':
+            if distribution['low'] == distribution['high']:
+                factors = np.full(size, float(distribution['low']))
+            else:
+                factors = rng.triangular(distribution['low'], distribution['mode'], distribution['high'], size)
+        else:
+            # Median of 1, so the value of the study is the median of the samples
+            factors = rng.lognormal(0.0, distribution['sigma'], size)
+        factors.flags.writeable = False
+        return factors
+
+
+# ======================================================================================
+#                   SAMPLED REGISTRY
+# ======================================================================================
+
+
+class SampledRegistry(PicklableLocks):
+    _lock_attributes = ('_attributes_lock',)
+
+    def __init__(self, registry, factors, n_samples, values=None):
+        """
+        Initialize a registry whose parameters are arrays of samples, read by the Input classes like the ParameterRegistry.
+
+        Sampled parameters are the values of the registry times their factors. Values can also be set per sample,
+        e.g. the points of a parameter sweep, factors are applied on top of them. All other mode parameters
+        are repeated for every sample, so the mode tables of the calculators have a sample axis for
+        every field. Other unsampled parameters keep their values.
+
+        Args:
+            registry (ParameterRegistry): Registry of the parameter values.
+            factors (dict): Factors per parameter, see ParameterDistributions.sample().
+            n_samples (int): Number of samples.
+            values (dict): Values per sample instead of the registry values, arrays of shape (samples,) for scalar
+                parameters and dictionaries of such arrays per key for tables, e.g. {'occupancy_rate': {'shared_bicycle': ...}}.
+        """
+        self.registry = registry
+        self.factors = factors
+        self.n_samples = n_samples
+        self.values = values or {}
+        self.version = registry.version
+        self.modes = registry.modes
+
+        # Attribute values of the Input classes per list of parameter names, see attributes()
+        self._attributes = {}
+        self._attributes_lock = threading.Lock()
+
+    def sampled_value(self, name, value, position=None):
+        """
+        Samples of one value of a parameter.
+
+        Args:
+            name (str): Name of the parameter.
+            value (float): Value of the parameter or of one key of its table.
+            position (int): Position of the key in the table, for factors per key.
+
+        Returns:
+            np.ndarray: Read-only samples of shape (samples,).
+        """
+        factors = self.factors[name]
+        samples = value * (factors[:, position] if factors.ndim == 2 else factors)
+        samples.flags.writeable = False
+        return samples
+
+    def sampled_values(self, name, value):
+        """
+        Samples of a parameter, the value hook of expand_attributes().
+
+        Args:
+            name (str): Name of the parameter.
+            value: Registry value of a scalar parameter or dictionary of the values of a table.
+
+        Returns:
+            Samples of a scalar or dictionary of samples per key, the unchanged value for unsampled parameters.
+        """
+        if name in self.registry.scalars:
+            value = self.values.get(name, value)
+            return self.sampled_value(name, value) if name in self.factors else value
+
+        table = self.registry.tables[name]
+        values = dict(value, **self.values.get(name, {}))
+        if name in self.factors:
+            values = {key: self.sampled_value(name, value, table.keys.index(key)) for key, value in values.items()}
+        elif table.index == 'mode' or name in self.values:
+            values = {key: np.broadcast_to(np.asarray(value, dtype=np.float64), (self.n_samples,)) for key, value in values.items()}
+        return values
+
+    def attributes(self, names):
+        """
+        Attribute values of an Input class with the samples of the parameters, built once per list of parameter names.
+
+        Args:
+            names (tuple): Names of the parameters exposed by the Input class.
+
+        Returns:
+            dict: Values per attribute name, to be treated as read-only.
+        """
+        names = tuple(names)
+        with self._attributes_lock:
+            if names not in self._attributes:
+                self._attributes[names] = expand_attributes(self.registry, names, self.sampled_values)
+            return self._attributes[names]
+
+
+# ======================================================================================
+#                   MONTE CARLO ENGINE
+# ======================================================================================
+
+
+def monte_carlo(n_samples, method='1_time_pref', modes=None, seed=None, distributions=None, registry=None):
+    """
+    Draw samples of the input parameters and calculate the external costs of every sample.
+
+    Every category is calculated once for all samples and modes on its mode table, see calc_costs_table()
+    of the calculators. The categories and modes per method set are the same as in ExternalCostsCalculator.evaluate_batch().
+
+    Args:
+        n_samples (int): Number of samples, e.g. 100000.
+        method (str): Method set, see 'method_sets' (default: '1_time_pref').
+        modes (list): Modes, e.g. 'private_bicycle' or 'all_bicycle' (default: all modes of the registry).
+        seed (int): Seed of the random number generator (default: random).
+        distributions (ParameterDistributions): Distributions of the parameters (default: parameter_distributions_2022.json).
+        registry (ParameterRegistry): Registry of the parameter values (default: the shared registry).
+
+    Returns:
+        dict: Results per mode like ExternalCostsCalculator.results, {'Cost by Category': {tag: {cost column: samples}},
+            'Total Cost': {'total cost per vkm': samples, ...}}, all samples of shape (samples,).
+
+    Raises:
+        ValueError: If the method set is unknown or uses the infrastructure scenarios.
+    """
+    registry = registry if registry is not None else ParameterRegistry.shared()
+    distributions = distributions if distributions is not None else ParameterDistributions(registry=registry)
+    return evaluate_samples(distributions.sample(n_samples, seed), n_samples, method, modes, registry)
+
+
+def evaluate_samples(factors, n_samples, method='1_time_pref', modes=None, registry=None, values=None):
+    """
+    Calculate the external costs for given factors of the parameters, e.g. the sample matrices of a sensitivity analysis.
+
+    Args:
+        factors (dict): Factors per parameter, see ParameterDistributions.sample().
+        n_samples (int): Number of samples of the factors.
+        method (str): Method set, see 'method_sets' (default: '1_time_pref').
+        modes (list): Modes (default: all modes of the registry).
+        registry (ParameterRegistry): Registry of the parameter values (default: the shared registry).
+        values (dict): Values per sample instead of the registry values, see SampledRegistry.
+
+    Returns:
+        dict: Results per mode, see monte_carlo().
+
+    Raises:
+        ValueError: If the method set is unknown or uses the infrastructure scenarios.
+    """
+    from calculation.external_costs_calculator import method_sets, aggregated_modes, cost_columns, category_calculator_class
+    from input.external_costs.input_collisions import InputCollisions
+
+    if method not in method_sets:
+        raise ValueError(f"Unknown method set '{method}', expected one of {', '.join(method_sets)}.")
+    if 'infrastructure' in method:
+        raise ValueError(f"The method set '{method}' evaluates the infrastructure scenarios, which are not sampled.")
+
+    registry = registry if registry is not None else ParameterRegistry.shared()
+    modes = list(registry.modes) if modes is None else list(modes)
+    sampled_registry = SampledRegistry(registry, factors, n_samples, values)
+
+    results = {mode: {'Cost by Category': {}, 'Total Cost': {}} for mode in modes}
+    for tag, category_method in method_sets[method].items():
+        category_modes = {mode: mode if tag == 'Collisions' else aggregated_modes.get(mode, mode) for mode in modes}
+        unique_modes = list(dict.fromkeys(category_modes.values()))
+
+        calculator_class = category_calculator_class(tag)
+        options = {} if category_method is None else {'method': category_method}
+        if tag == 'Collisions':
+            calculator = calculator_class(mode=unique_modes[0], input_collisions=InputCollisions.shared().with_registry(sampled_registry), **options)
+        else:
+            calculator = calculator_class(mode=unique_modes[0], registry=sampled_registry, **options)
+
+        table = calculator.calc_costs_table(unique_modes)
+        for mode, category_mode in category_modes.items():
+            row = unique_modes.index(category_mode)
+            results[mode]['Cost by Category'][tag] = {column: np.broadcast_to(table[column][row], (n_samples,)) for column in cost_columns}
+
+    # Total costs summed up in the order of the categories, as in ExternalCostsCalculator.set_results()
+    for result in results.values():
+        for column in cost_columns:
+            total = np.zeros(n_samples)
+            for costs in result['Cost by Category'].values():
+                total = total + costs[column]
+            result['Total Cost'][f'total {column}'] = total
+    return results
+
+
+def summary_frame(results, quantiles=summary_quantiles):
+    """
+    Mean, standard deviation and quantiles of the sampled costs.
+
+    Args:
+        results (dict): Results per mode, see monte_carlo().
+        quantiles (list): Quantiles between 0 and 1.
+
+    Returns:
+        pd.DataFrame: One row per mode, category (including 'Total') and cost column, with the columns 'mode',
+            'category', 'cost', 'mean', 'std' and one column per quantile, e.g. '5%'.
+    """
+    import pandas as pd
+    from calculation.external_costs_calculator import cost_columns
+
+    rows = []
+    for mode, result in results.items():
+        categories = dict(result['Cost by Category'])
+        categories['Total'] = {column: result['Total Cost'][f'total {column}'] for column in cost_columns}
+        for category, costs in categories.items():
+            for column in cost_columns:
+                samples = costs[column]
+                rows.append({
+                    'mode': mode,
+                    'category': category,
+                    'cost': column,
+                    'mean': np.mean(samples),
+                    'std': np.std(samples, ddof=1),
+                    **{f'{quantile:.0%}': value for quantile, value in zip(quantiles, np.quantile(samples, quantiles))},
+                })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from input.external_costs.input_collisions import InputCollisions
+
+    # Load the accident data before the timing, it is read once per process
+    InputCollisions.shared()
+
+    start = time.perf_counter()
+    results = monte_carlo(100000, seed=42)
+    print(f'100000 samples in {time.perf_counter() - start:.2f} s')
+
+    summary = summary_frame(results)
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(summary[summary['cost'] != 'cost per year'])
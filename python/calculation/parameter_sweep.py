@@ -0,0 +1,249 @@
+import os
+import sys
+import itertools
+import numpy as np
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from input.external_costs.parameter_registry import ParameterRegistry
+from calculation.monte_carlo import evaluate_samples
+from calculation.external_costs_calculator import code_version, resolve_executor
+from utils.result_cache import ResultCache, cache_key
+
+
+# Results of the sweep points in the results directory of the working directory, like the infrastructure cache
+sweep_store_directory = os.path.join(os.getcwd(), 'results', 'sweep_store')
+
+# Store of the sweep points, one JSON file per point and method set, large enough for extended sweeps
+sweep_result_store = ResultCache(sweep_store_directory, max_entries=200000, max_bytes=1 << 30)
+
+# ======================================================================================
+#                   SWEEP PARAMETERS AND DESIGNS
+# ======================================================================================
+
+
+def resolve_parameter(registry, name):
+    """
+    Find the registry parameter of a sweep parameter.
+
+    Sweep parameters are scalar parameters (e.g. 'cost_per_hour_delay'), attributes of mode tables
+    as in the Input classes (e.g. 'nr_stations_shared_bicycle') or keys of other tables (e.g. 'pollution_costs[Gas]').
+
+    Args:
+        registry (ParameterRegistry): Registry of the parameters.
+        name (str): Sweep parameter.
+
+    Returns:
+        tuple: Name of the registry parameter and the key of its table, None for scalar parameters.
+
+    Raises:
+        KeyError: If the sweep parameter is not a parameter of the registry.
+    """
+    if name in registry.scalars:
+        return name, None
+
+    if name.endswith(']') and '[' in name:
+        parameter, key = name[:-1].split('[', 1)
+        if parameter in registry.tables and key in registry.tables[parameter].keys:
+            return parameter, key
+
+    for parameter, table in registry.tables.items():
+        if table.index == 'mode':
+            for mode in table.keys:
+                if table.attribute.format(mode=mode) == name:
+                    return parameter, mode
+
+    raise KeyError(f"Unknown sweep parameter '{name}', expected a scalar parameter, a mode attribute (e.g. 'occupancy_rate_shared_bicycle') or 'parameter[key]'.")
+
+
+def cartesian_design(levels):
+    """
+    Full factorial design of the levels of several parameters.
+
+    Args:
+        levels (dict): Levels per sweep parameter, e.g. {'occupancy_rate_shared_bicycle': [1.0, 1.1, 1.2]}.
+
+    Returns:
+        dict: Values per sweep parameter, arrays of shape (points,), the first parameter changes slowest.
+    """
+    points = list(itertools.product(*levels.values()))
+    return {name: np.array([point[position] for point in points], dtype=np.float64) for position, name in enumerate(levels)}
+
+
+def latin_hypercube_design(ranges, n_points, seed=None):
+    """
+    Latin hypercube design of several parameters, every parameter covers each of 'n_points' strata of its range once.
+
+    Args:
+        ranges (dict): Lower and upper bound per sweep parameter, e.g. {'service_failure_factor_shared_bicycle': (0.1, 0.3)}.
+        n_points (int): Number of points.
+        seed (int): Seed of the random number generator (default: random).
+
+    Returns:
+        dict: Values per sweep parameter, arrays of shape (points,).
+    """
+    rng = np.random.default_rng(seed)
+    design = {}
+    for name, (low, high) in ranges.items():
+        positions = (rng.permutation(n_points) + rng.random(n_points)) / n_points
+        design[name] = low + positions * (high - low)
+    return design
+
+
+# ======================================================================================
+#                   SWEEP EVALUATION
+# ======================================================================================
+
+
+def evaluate_points(design, parameters, method, modes, registry):
+    """
+    Calculate the costs of several sweep points in one vectorized batch, defined on module level so that it can be sent to worker processes.
+
+    Args:
+        design (dict): Values per sweep parameter of the points.
+        parameters (dict): Registry parameter and key per sweep parameter, see resolve_parameter().
+        method (str): Method set, see 'method_sets'.
+        modes (list): Modes.
+        registry (ParameterRegistry): Registry of the other parameter values (default: the shared registry).
+
+    Returns:
+        list: Result rows per point with the columns 'mode', 'method', 'category' and the cost columns.
+    """
+    from calculation.external_costs_calculator import cost_columns
+
+    n_points = len(next(iter(design.values())))
+    values = {}
+    for name, (parameter, key) in parameters.items():
+        point_values = np.asarray(design[name], dtype=np.float64)
+        if key is None:
+            values[parameter] = point_values
+        else:
+            values.setdefault(parameter, {})[key] = point_values
+
+    results = evaluate_samples({}, n_points, method, modes, registry, values)
+
+    rows = [[] for _ in range(n_points)]
+    for mode, result in results.items():
+        categories = dict(result['Cost by Category'])
+        categories['Total'] = {column: result['Total Cost'][f'total {column}'] for column in cost_columns}
+        for category, costs in categories.items():
+            for point in range(n_points):
+                rows[point].append({'mode': mode, 'method': method, 'category': category, **{column: float(costs[column][point]) for column in cost_columns}})
+    return rows
+
+
+def parameter_sweep(design, methods=('1_time_pref',), modes=None, store=sweep_result_store, executor=None, max_workers=None,
+                    shard_size=None, registry=None):
+    """
+    Calculate the external costs at every point of a parameter sweep, memoized per point in a result store.
+
+    The points are keyed by their parameter values, the method set, the modes, the parameter file, the accident data
+    and the code version, so extending a sweep (e.g. more levels or points) only calculates the new points.
+    The new points are split into shards, each shard is calculated in one vectorized batch, the shards
+    are calculated one after another or on an executor.
+
+    Args:
+        design (dict): Values per sweep parameter, arrays of the same length, see cartesian_design() and latin_hypercube_design().
+        methods (list): Method sets, see 'method_sets' (default: '1_time_pref').
+        modes (list): Modes (default: all modes of the registry).
+        store (ResultCache): Store of the point results, None disables memoization.
+        executor: None for sequential calculation, 'thread' or 'process' for a new thread or process pool,
+            or an existing concurrent.futures.Executor.
+        max_workers (int): Number of workers of a new thread or process pool (default: number of CPUs).
+        shard_size (int): Points per shard (default: all new points sequentially, else split evenly over the workers).
+        registry (ParameterRegistry): Registry of the other parameter values (default: the shared registry).
+
+    Returns:
+        pd.DataFrame: One row per point, mode, method set and category (including 'Total'), with the columns 'point',
+            the sweep parameters, 'mode', 'method', 'category' and the cost columns.
+
+    Raises:
+        ValueError: If the parameter values of the design differ in length.
+    """
+    import pandas as pd
+    from input.external_costs.input_collisions import InputCollisions
+
+    design = {name: np.asarray(values, dtype=np.float64) for name, values in design.items()}
+    lengths = {len(values) for values in design.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"The parameter values of the design differ in length: {', '.join(map(str, sorted(lengths)))}.")
+    n_points = lengths.pop() if lengths else 0
+
+    worker_registry = registry
+    registry = registry if registry is not None else ParameterRegistry.shared()
+    modes = list(registry.modes) if modes is None else list(modes)
+    parameters = {name: resolve_parameter(registry, name) for name in design}
+    data_version = cache_key(parameters=registry.data_hash, accident_data=InputCollisions.shared().accident_data_hash(), code=code_version())
+
+    # Point results from the store, the same key for repeated points of a design
+    keys = {}
+    point_rows = {}
+    for method in methods:
+        for point in range(n_points):
+            key = cache_key(point={name: float(values[point]) for name, values in design.items()}, method=method, modes=modes, version=data_version)
+            keys[(point, method)] = key
+            if key not in point_rows and store is not None:
+                cached = store.get(key)
+                if cached is not None:
+                    point_rows[key] = cached['rows']
+
+    # Shards of the new points per method set, every distinct point once
+    shards = []
+    for method in methods:
+        new_points = list({keys[(point, method)]: point for point in range(n_points) if keys[(point, method)] not in point_rows}.values())
+        if not new_points:
+            continue
+        size = shard_size or (len(new_points) if executor is None else -(-len(new_points) // (max_workers or os.cpu_count() or 1)))
+        shards.extend((method, new_points[start:start + size]) for start in range(0, len(new_points), size))
+
+    pool = resolve_executor(executor, max_workers) if shards else None
+
+    def shard_arguments(method, points):
+        return {name: values[points] for name, values in design.items()}, parameters, method, modes, worker_registry
+
+    try:
+        if pool is None:
+            shard_results = (evaluate_points(*shard_arguments(method, points)) for method, points in shards)
+        else:
+            futures = [pool.submit(evaluate_points, *shard_arguments(method, points)) for method, points in shards]
+            shard_results = (future.result() for future in futures)
+
+        # Every shard is stored when it is done, so an interrupted sweep keeps its finished points
+        for (method, points), rows in zip(shards, shard_results):
+            new_rows = {keys[(point, method)]: point_result for point, point_result in zip(points, rows)}
+            point_rows.update(new_rows)
+            if store is not None:
+                store.put_many({key: {'rows': point_result} for key, point_result in new_rows.items()})
+    finally:
+        if pool is not None and pool is not executor:
+            pool.shutdown()
+
+    rows = []
+    for point in range(n_points):
+        point_values = {name: values[point] for name, values in design.items()}
+        for method in methods:
+            rows.extend({'point': point, **point_values, **row} for row in point_rows[keys[(point, method)]])
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+
+    design = cartesian_design({
+        'occupancy_rate_shared_bicycle': [1.0, 1.1, 1.2],
+        'nr_stations_shared_bicycle': [50, 100, 150, 200],
+        'service_failure_factor_shared_bicycle': [0.1, 0.2, 0.3],
+    })
+
+    start = time.perf_counter()
+    sweep = parameter_sweep(design, modes=['shared_bicycle'], executor='process', max_workers=4)
+    print(f'{len(design["occupancy_rate_shared_bicycle"])} points in {time.perf_counter() - start:.2f} s')
+
+    start = time.perf_counter()
+    parameter_sweep(design, modes=['shared_bicycle'])
+    print(f'Repeated sweep from the store in {time.perf_counter() - start:.2f} s')
+
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(sweep[sweep['category'] == 'Total'])
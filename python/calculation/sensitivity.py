@@ -0,0 +1,305 @@
+import os
+import sys
+import numpy as np
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from input.external_costs.parameter_registry import ParameterRegistry
+from calculation.monte_carlo import ParameterDistributions, evaluate_samples
+from calculation.external_costs_calculator import resolve_executor
+
+
+# Base samples of the first round and the maximum, the base samples are doubled until the indices are stable
+default_base_samples = 1024
+default_max_base_samples = 65536
+
+# Largest change of the first and total order indices between two rounds for convergence
+default_tolerance = 0.02
+
+# Bootstrap resamples of the confidence intervals and their confidence level
+default_bootstrap_samples = 200
+default_confidence_level = 0.95
+
+
+# ======================================================================================
+#                   SALTELLI SAMPLING
+# ======================================================================================
+
+
+def saltelli_factors(matrix_a, matrix_b, inputs):
+    """
+    Stack the sample matrices of the Saltelli scheme into one batch of input factors.
+
+    The batch holds the samples of A, of B and of every AB_i, which is A with the factors of the input i taken from B.
+
+    Args:
+        matrix_a (dict): Factors per input of the matrix A, see ParameterDistributions.sample_inputs().
+        matrix_b (dict): Factors per input of the matrix B, with the same number of samples.
+        inputs (list): Inputs in the order of the AB_i blocks.
+
+    Returns:
+        dict: Factors per input of (inputs + 2) * samples evaluations, block by block.
+    """
+    return {
+        name: np.concatenate([matrix_a[name], matrix_b[name]] + [matrix_b[name] if other == name else matrix_a[name] for other in inputs])
+        for name in inputs
+    }
+
+
+def total_costs(factors, n_samples, method, modes, registry):
+    """
+    Total costs of a batch of samples, defined on module level so that it can be sent to worker processes.
+
+    Args:
+        factors (dict): Factors per parameter.
+        n_samples (int): Number of samples of the factors.
+        method (str): Method set, see 'method_sets'.
+        modes (list): Modes.
+        registry (ParameterRegistry): Registry of the parameter values.
+
+    Returns:
+        dict: Total costs per mode and total cost column, e.g. ('private_bicycle', 'total cost per vkm'), of shape (samples,).
+    """
+    results = evaluate_samples(factors, n_samples, method, modes, registry)
+    return {(mode, name): values for mode, result in results.items() for name, values in result['Total Cost'].items()}
+
+
+def evaluate_total_costs(factors, n_samples, method, modes, registry, executor=None, max_workers=None):
+    """
+    Total costs of a batch of samples, at once or split into chunks on an executor.
+
+    Args:
+        factors (dict): Factors per parameter.
+        n_samples (int): Number of samples of the factors.
+        method (str): Method set, see 'method_sets'.
+        modes (list): Modes.
+        registry (ParameterRegistry): Registry of the parameter values.
+        executor: None for one vectorized batch, 'thread' or 'process' for a new thread or process pool,
+            or an existing concurrent.futures.Executor.
+        max_workers (int): Number of workers of a new thread or process pool (default: number of CPUs).
+
+    Returns:
+        dict: Total costs, see total_costs().
+    """
+    pool = resolve_executor(executor, max_workers)
+    if pool is None:
+        return total_costs(factors, n_samples, method, modes, registry)
+
+    try:
+        n_chunks = max(1, min(n_samples, max_workers or os.cpu_count() or 1))
+        bounds = np.linspace(0, n_samples, n_chunks + 1).astype(int)
+        futures = [
+            pool.submit(total_costs, {name: values[start:stop] for name, values in factors.items()}, stop - start, method, modes, registry)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        chunks = [future.result() for future in futures]
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+
+# ======================================================================================
+#                   SOBOL INDICES
+# ======================================================================================
+
+
+def sobol_indices(y_a, y_b, y_ab):
+    """
+    First and total order Sobol indices of the Saltelli scheme.
+
+    The first order indices use the estimator of Saltelli et al. (2010), the total order indices the estimator
+    of Jansen (1999). The outputs are centered first, which does not change the indices but reduces the
+    variance of the first order estimator for outputs far from zero, e.g. the total costs with health benefits.
+
+    Args:
+        y_a (np.ndarray): Outputs of the matrix A, samples on the last axis.
+        y_b (np.ndarray): Outputs of the matrix B, shaped like 'y_a'.
+        y_ab (np.ndarray): Outputs of the matrices AB_i, inputs on the first axis, then shaped like 'y_a'.
+
+    Returns:
+        tuple: First and total order indices, shape (inputs,) + y_a.shape[:-1], NaN for outputs without variance.
+    """
+    mean = np.mean(np.concatenate([y_a, y_b], axis=-1), axis=-1, keepdims=True)
+    y_a, y_b, y_ab = y_a - mean, y_b - mean, y_ab - mean
+
+    variance = np.mean(np.concatenate([y_a, y_b], axis=-1) ** 2, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first_order = np.mean(y_b * (y_ab - y_a), axis=-1) / variance
+        total_order = 0.5 * np.mean((y_a - y_ab) ** 2, axis=-1) / variance
+    return first_order, total_order
+
+
+def bootstrap_weights(n_samples, n_bootstrap=default_bootstrap_samples, seed=None):
+    """
+    Bootstrap resamples of the base samples as counts, so that a resampled mean is one matrix product.
+
+    Args:
+        n_samples (int): Number of base samples.
+        n_bootstrap (int): Number of bootstrap resamples.
+        seed (int or np.random.Generator): Seed or generator of the resamples.
+
+    Returns:
+        np.ndarray: float64 counts of every base sample per resample, shape (resamples, samples), rows sum up to 'n_samples'.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.empty((n_bootstrap, n_samples))
+    for resample in range(n_bootstrap):
+        weights[resample] = np.bincount(rng.integers(0, n_samples, n_samples), minlength=n_samples)
+    return weights
+
+
+def bootstrap_intervals(y_a, y_b, y_ab, weights, confidence_level=default_confidence_level):
+    """
+    Bootstrap confidence intervals of the first and total order indices of one output.
+
+    Args:
+        y_a (np.ndarray): Outputs of the matrix A, shape (samples,).
+        y_b (np.ndarray): Outputs of the matrix B, shape (samples,).
+        y_ab (np.ndarray): Outputs of the matrices AB_i, shape (inputs, samples).
+        weights (np.ndarray): Counts of the bootstrap resamples, see bootstrap_weights().
+        confidence_level (float): Confidence level of the intervals, e.g. 0.95.
+
+    Returns:
+        tuple: Lower and upper bounds of the first order and of the total order indices, each of shape (inputs,).
+    """
+    n_samples = len(y_a)
+    mean = np.mean(np.concatenate([y_a, y_b]))
+    y_a, y_b, y_ab = y_a - mean, y_b - mean, y_ab - mean
+    differences = y_ab - y_a
+
+    # Means of every resample, shape (resamples,) and (resamples, inputs)
+    mean_a = weights @ y_a / n_samples
+    mean_b = weights @ y_b / n_samples
+    resample_mean = (mean_a + mean_b) / 2
+    variance = (weights @ (y_a ** 2) + weights @ (y_b ** 2)) / (2 * n_samples) - resample_mean ** 2
+    products = (weights @ (y_b * differences).T - (weights @ differences.T) * resample_mean[:, np.newaxis]) / n_samples
+    squares = weights @ (differences ** 2).T / n_samples
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first_order = products / variance[:, np.newaxis]
+        total_order = 0.5 * squares / variance[:, np.newaxis]
+
+    quantiles = [(1 - confidence_level) / 2, 1 - (1 - confidence_level) / 2]
+    first_order_low, first_order_high = np.nanquantile(first_order, quantiles, axis=0)
+    total_order_low, total_order_high = np.nanquantile(total_order, quantiles, axis=0)
+    return first_order_low, first_order_high, total_order_low, total_order_high
+
+
+# ======================================================================================
+#                   SENSITIVITY ANALYSIS
+# ======================================================================================
+
+
+def sobol_analysis(n_samples=default_base_samples, method='1_time_pref', modes=None, seed=None, distributions=None, registry=None,
+                   max_samples=default_max_base_samples, tolerance=default_tolerance, n_bootstrap=default_bootstrap_samples,
+                   confidence_level=default_confidence_level, executor=None, max_workers=None):
+    """
+    Variance-based global sensitivity analysis of the total external costs per mode.
+
+    The inputs are the independent factors of the Monte Carlo engine, i.e. the groups and the parameters
+    without group of the distribution file, so correlated parameters (e.g. the CO2 price) count as one input.
+    Each round draws 'n_samples' new base samples of A and B and evaluates all (inputs + 2) sample matrices
+    in one vectorized batch. The base samples are doubled until the largest change of the indices between
+    two rounds is below 'tolerance' or 'max_samples' is reached.
+
+    Args:
+        n_samples (int): Base samples of the first round, e.g. 1024.
+        method (str): Method set, see 'method_sets' (default: '1_time_pref').
+        modes (list): Modes (default: all modes of the registry).
+        seed (int): Seed of the random number generator (default: random).
+        distributions (ParameterDistributions): Distributions of the parameters (default: parameter_distributions_2022.json).
+        registry (ParameterRegistry): Registry of the parameter values (default: the shared registry).
+        max_samples (int): Maximum number of base samples.
+        tolerance (float): Largest change of the indices between two rounds for convergence.
+        n_bootstrap (int): Number of bootstrap resamples of the confidence intervals.
+        confidence_level (float): Confidence level of the intervals.
+        executor: None for one vectorized batch per round, 'thread' or 'process' for a new thread or process pool,
+            or an existing concurrent.futures.Executor, see evaluate_total_costs().
+        max_workers (int): Number of workers of a new thread or process pool.
+
+    Returns:
+        dict: 'indices' (pd.DataFrame): One row per mode, total cost column and input with the columns 'mode', 'cost', 'input',
+            'parameters', 'first order', 'first order low', 'first order high', 'total order', 'total order low' and 'total order high'.
+            'convergence' (pd.DataFrame): One row per round with the columns 'base samples', 'evaluations', 'max change' and 'converged'.
+    """
+    import pandas as pd
+
+    registry = registry if registry is not None else ParameterRegistry.shared()
+    distributions = distributions if distributions is not None else ParameterDistributions(registry=registry)
+    modes = list(registry.modes) if modes is None else list(modes)
+    inputs = distributions.inputs
+    rng = np.random.default_rng(seed)
+
+    # Executors are created once for all rounds
+    pool = resolve_executor(executor, max_workers)
+
+    outputs = {}
+    rounds = []
+    previous = None
+    try:
+        base_samples = 0
+        new_samples = n_samples
+        while True:
+            matrix_a = distributions.sample_inputs(new_samples, rng)
+            matrix_b = distributions.sample_inputs(new_samples, rng)
+            factors = distributions.parameter_factors(saltelli_factors(matrix_a, matrix_b, inputs))
+            costs = evaluate_total_costs(factors, new_samples * (len(inputs) + 2), method, modes, registry, pool, max_workers)
+
+            # Outputs per block (A, B, AB_1, ..., AB_k) and base sample, appended to the samples of the previous rounds
+            for key, values in costs.items():
+                values = values.reshape(len(inputs) + 2, new_samples)
+                outputs[key] = values if key not in outputs else np.concatenate([outputs[key], values], axis=1)
+            base_samples += new_samples
+
+            y = np.stack(list(outputs.values()), axis=1)
+            first_order, total_order = sobol_indices(y[0], y[1], y[2:])
+            change = np.nan if previous is None else np.nanmax(np.abs(np.concatenate([first_order - previous[0], total_order - previous[1]])))
+            converged = bool(change < tolerance)
+            rounds.append({'base samples': base_samples, 'evaluations': base_samples * (len(inputs) + 2), 'max change': change, 'converged': converged})
+
+            if converged or base_samples * 2 > max_samples:
+                break
+            previous = (first_order, total_order)
+            new_samples = base_samples
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+
+    # The same resamples for all outputs
+    weights = bootstrap_weights(base_samples, n_bootstrap, rng)
+
+    rows = []
+    for position, ((mode, cost), values) in enumerate(outputs.items()):
+        intervals = bootstrap_intervals(values[0], values[1], values[2:], weights, confidence_level)
+        for number, name in enumerate(inputs):
+            rows.append({
+                'mode': mode,
+                'cost': cost,
+                'input': name,
+                'parameters': ', '.join(distributions.input_parameters(name)),
+                'first order': first_order[number, position],
+                'first order low': intervals[0][number],
+                'first order high': intervals[1][number],
+                'total order': total_order[number, position],
+                'total order low': intervals[2][number],
+                'total order high': intervals[3][number],
+            })
+
+    return {'indices': pd.DataFrame(rows), 'convergence': pd.DataFrame(rounds)}
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+
+    start = time.perf_counter()
+    analysis = sobol_analysis(seed=42)
+    print(f'Sobol analysis in {time.perf_counter() - start:.2f} s')
+    print(analysis['convergence'])
+
+    indices = analysis['indices']
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(indices[indices['cost'] == 'total cost per pkm'].drop(columns='parameters').round(3))
@@ -1,236 +1,426 @@
 import sys
 import os
-import pandas as pd
+import re
+import glob
+import json
+import hashlib
+import argparse
 import numpy as np
+import pandas as pd
 import zipfile
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 # Construct the path to the 'input' directory and add it to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'accident_data')) # TODO: data not publicly available due to privacy reasons --> please insert your own data following the structure of 'accidents_dummy.csv'
 
+from collision_data_engine import calculate_ekin_and_epsilon, calculate_accident_costs, default_cost_rate_set, tables_hash
+
 # Define the path to the CSV file
 csv_path = os.path.join(os.path.dirname(__file__), 'police_accident_data_2022.csv')
+processed_csv_path = os.path.join(os.path.dirname(__file__), 'accident_data_2022_detailed_processed.csv')
 
-# Print the absolute path for debugging
-print("Absolute path of the input CSV file:", os.path.abspath(csv_path))
+# Define the paths of the bicycle infrastructure scenarios
+scenario_dir = os.path.join(os.path.dirname(__file__), 'accidents_infrastructure_scenario')
+zip_file = os.path.join(scenario_dir, 'cycle_lane.zip')  #TODO: adapt for cycle path scenario
 
-# Check if the file exists
-if not os.path.exists(csv_path):
-    raise FileNotFoundError(f"File not found: {csv_path}")
+# Manifest of the content hashes of all processed inputs
+manifest_path = os.path.join(os.path.dirname(__file__), 'preprocessing_manifest.json')
 
-# Read the CSV file into a DataFrame called 'data'
-# The CSV file is located at the specified path and is semicolon-separated
-# The first 9 rows (headers) are skipped during the reading process
-data = pd.read_csv(csv_path, sep=';', skiprows=9)
+required_columns = {'BArt01', 'BArt02', 'BArt03', 'Verl01', 'tot', 'svl', 'lvl'}
+
+# Columns of the scenario store, restricted to those needed by the collisions calculator
+scenario_store_columns = ['BArt01', 'BArt02', 'BArt03', 'Epsilon Participant 1', 'Epsilon Participant 2', 'Epsilon Participant 3', 'Accident Costs']
 
 
 # ======================================================================================
-#                   DEFINITION OF IMPORTANT COLUMNS
+#                   MANIFEST OF PROCESSED INPUTS
 # ======================================================================================
 
 
-# Extract the data from a specific column and store it in a variable 
-vehicle_causer = data['BArt01']
-vehicle_participant_2 = data['BArt02']
-vehicle_participant_3 = data['BArt03']
-injury_type_causer = data['Verl01']
-people_killed = data['tot']
-people_severly_injured = data['svl']
-people_lightly_injured = data['lvl']
+def new_manifest():
+    """
+    Create an empty manifest for the current energy value and cost rate tables.
 
+    Returns:
+        dict: Manifest without processed inputs.
+    """
+    return {'tables': tables_hash(), 'police_data': {}, 'scenarios': {}}
 
-# ======================================================================================
-#                   ADDITION OF REQUIRED COLUMNS 
-# ======================================================================================
 
+def load_manifest(manifest_path):
+    """
+    Load the manifest of processed inputs.
 
-# Dictionary of energy values for each vehicle type based on categorisation used in 2019 police data 
-energy_values = {
-    '1.0': 8695, # moped
-    '2.0': 8695, # moped
-    '3.0': 754, # pedelec
-    '4.0': 8695, # moped
-    '5.0': 818, # e-scooter
-    '6.0': 591680, # other --> assumption due to missing information
-    '8.0': 591680, # other --> assumption due to missing information
-    '11.0': 13393, # motorcycle
-    '12.0': 13393, # motorcycle
-    '13.0': 13393, # motorcycle
-    '15.0': 13393, # motorcycle
-    '21.0': 74690, # pkw
-    '22.0': 129430, # transporter
-    '31.0': 385719, # bus
-    '32.0': 385719, # bus
-    '33.0': 385719, # bus
-    '34.0': 385719, # bus
-    '40.0': 129430, # transporter
-    '42.0': 129430, # transporter
-    '44.0': 591680, # lkw
-    '44.0': 591680, # lkw
-    '46.0': 591680, # lkw
-    '48.0': 591680, # lkw
-    '51.0': 591680, # lkw
-    '53.0': 591680, # lkw
-    '54.0': 591680, # lkw
-    '58.0': 591680, # lkw
-    '59.0': 591680, # lkw
-    '61.0': 850091, # tram
-    '71.0': 704, # bike
-    '72.0': 754, # pedelec
-    '81.0': 84, # pedestrian
-    '83.0': 84, # pedestrian
-    '84.0': 84, # pedestrian
-    '92.0': 591680, # other
-    '93.0': 84, # pedestrian
-}
-
-# # Function to calculate Ekin accident for a row
-# def calculate_ekin_accident(row):
-#     ekin_bart01 = energy_values.get(str(row['BArt01']), 0)
-#     ekin_bart02 = energy_values.get(str(row['BArt02']), 0)
-#     ekin_bart03 = energy_values.get(str(row['BArt03']), 0)
-#     return ekin_bart01 + ekin_bart02 + ekin_bart03
-
-def calculate_ekin_accident(row):
-    ekin_bart01 = energy_values.get(str(float(row['BArt01'])), 0)
-    ekin_bart02 = energy_values.get(str(float(row['BArt02'])), 0)
-    ekin_bart03 = energy_values.get(str(float(row['BArt03'])), 0)
-    # print(row['BArt01'], row['BArt02'], row['BArt03'])
-    # print(ekin_bart01, ekin_bart02, ekin_bart03)
-    return ekin_bart01 + ekin_bart02 + ekin_bart03
-
-# Calculate Ekin accident column
-data['Ekin Accident'] = data.apply(calculate_ekin_accident, axis=1)
+    If the manifest is missing or was created with different energy value or cost rate tables,
+    an empty manifest is returned, so that all inputs are processed again.
 
+    Args:
+        manifest_path (str): Path of the manifest JSON file.
+
+    Returns:
+        dict: Manifest with the content hashes of the processed inputs and their outputs.
+    """
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('tables') == tables_hash():
+            return manifest
+        print("Energy values or cost rates changed. Processing all inputs again.")
+    return new_manifest()
+
+
+def save_manifest(manifest, manifest_path):
+    """
+    Save the manifest of processed inputs, replacing the previous file atomically.
+
+    Args:
+        manifest (dict): Manifest to save.
+        manifest_path (str): Path of the manifest JSON file.
+    """
+    temporary_path = manifest_path + '.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temporary_path, manifest_path)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    Calculate the SHA-256 content hash of a file.
+
+    Args:
+        path (str): Path of the file.
+        chunk_size (int): Number of bytes read at once.
+
+    Returns:
+        str: SHA-256 hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def zip_member_hashes(zip_file):
+    """
+    Get the content hashes of all .pkl members of a ZIP archive.
+
+    The CRC-32 checksum and size stored in the archive directory are used, so that
+    unchanged members are detected without decompressing them.
+
+    Args:
+        zip_file (str): Path of the ZIP archive.
+
+    Returns:
+        dict: Content hash per member name.
+    """
+    with zipfile.ZipFile(zip_file, 'r') as z:
+        return {info.filename: f'{info.CRC:08x}-{info.file_size}' for info in z.infolist() if info.filename.endswith('.pkl')}
 
-# ======================================================================================
-#                   CALCULATION OF EPSILON DEPENDING ON CAUSER
-# ======================================================================================
 
+def prune_scenario_outputs(processed_dir, stale_members, kept_members, output_format):
+    """
+    Remove the outputs of scenario files that were removed from or changed in the archive.
 
-# Calculate Epsilon Participant 1 column
-data['Epsilon Participant 1'] = data.apply(
-    lambda row: energy_values.get(str(row['BArt01']), 0) / row['Ekin Accident']
-    if row['Ekin Accident'] != 0 and not pd.isna(row['BArt01']) else 0, axis=1
-)
+    Store partitions that still hold unchanged scenarios are rewritten without the stale ones.
 
-# Calculate Epsilon Participant 2 column
-data['Epsilon Participant 2'] = data.apply(
-    lambda row: energy_values.get(str(row['BArt02']), 0) / row['Ekin Accident']
-    if row['Ekin Accident'] != 0 and not pd.isna(row['BArt02']) else 0, axis=1
-)
+    Args:
+        processed_dir (str): Directory of the scenario store or of the processed CSV files.
+        stale_members (dict): Manifest entries of the removed or changed members.
+        kept_members (dict): Manifest entries of the unchanged members.
+        output_format (str): 'parquet' or 'csv'.
+    """
+    if output_format == 'csv':
+        for entry in stale_members.values():
+            output_path = os.path.join(processed_dir, entry['output'])
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        return
 
-# Calculate Epsilon Participant 3 column
-data['Epsilon Participant 3'] = data.apply(
-    lambda row: energy_values.get(str(row['BArt03']), 0) / row['Ekin Accident']
-    if row['Ekin Accident'] != 0 and not pd.isna(row['BArt03']) else 0, axis=1
-)
+    for partition in {entry['output'] for entry in stale_members.values()}:
+        partition_path = os.path.join(processed_dir, partition)
+        kept_ids = [os.path.splitext(os.path.basename(name))[0] for name, entry in kept_members.items() if entry['output'] == partition]
+
+        if not os.path.exists(partition_path):
+            continue
+        if not kept_ids:
+            os.remove(partition_path)
+            continue
+
+        data = pd.read_parquet(partition_path)
+        data = data[data['scenario_id'].isin(kept_ids)]
+        data['scenario_id'] = data['scenario_id'].cat.remove_unused_categories()
+        data.to_parquet(partition_path, index=False)
 
 
 # ======================================================================================
-#                   CALCULATION OF TOTAL ACCIDENT COSTS 
+#                   ADDITION OF REQUIRED COLUMNS
 # ======================================================================================
 
 
-# Function to calculate Accident Costs for a row
-def calculate_accident_costs(row):
-    tot_cost = row['tot'] * 4904583.106 if not pd.isna(row['tot']) else 0
-    svl_cost = row['svl'] * 688699.75 if not pd.isna(row['svl']) else 0
-    lvl_cost = row['lvl'] * 44573.84 if not pd.isna(row['lvl']) else 0
-    
-    verl01 = row['Verl01']
-    if pd.isna(verl01):
-        verl01_cost = 0
-    elif verl01 == 4.0:
-        verl01_cost = 4147816.27
-    elif verl01 == 3.0:
-        verl01_cost = 551527.60
-    elif verl01 == 2.0:
-        verl01_cost = 41471.69
-    elif verl01 == 1.0:
-        verl01_cost = 0
-    else:
-        verl01_cost = 0
-    
-    return tot_cost + svl_cost + lvl_cost - verl01_cost
-
-# Calculate Accident Costs column
-data['Accident Costs'] = data.apply(calculate_accident_costs, axis=1)
-
-# Remove rows with NaN or empty values in the first column (assuming the first column is 'Datum')
-data.dropna(subset=['Datum'], inplace=True)
-
-# Save the DataFrame as a CSV file
-processed_csv_path = os.path.join(os.path.dirname(__file__), 'accident_data_2022_detailed_processed.csv')
-data.to_csv(processed_csv_path, index=False)
+def add_accident_columns(data):
+    """
+    Add the Ekin Accident, Epsilon Participant 1-3 and Accident Costs columns to accident data.
+
+    Args:
+        data (pd.DataFrame): Accident data following the structure of 'accidents_dummy.csv'.
+
+    Returns:
+        pd.DataFrame: The accident data with the added columns.
+    """
+    # Calculate Ekin accident and Epsilon Participant 1-3 columns in one vectorized pass
+    # (energy values per vehicle type are defined in collision_data_engine.py)
+    data = calculate_ekin_and_epsilon(data)
+
+    # Calculate Accident Costs column with the default cost rate set (cost rates are defined in collision_data_engine.py)
+    data['Accident Costs'] = calculate_accident_costs(data)[default_cost_rate_set]
+
+    return data
 
 
 # ======================================================================================
-#               CALCULATION OF BICYCLE INFRASTRUCTURE SCENARIO ACCIDENT COSTS 
+#                   CALCULATION OF TOTAL ACCIDENT COSTS
 # ======================================================================================
 
 
-scenario_dir = os.path.join(os.path.dirname(__file__), 'accidents_infrastructure_scenario')
-zip_file = os.path.join(scenario_dir, 'cycle_lane.zip')  #TODO: adapt for cycle path scenario
+def process_police_data(csv_path, processed_csv_path, manifest=None):
+    """
+    Process the police accident data and save it as CSV file.
 
-if not os.path.exists(scenario_dir):
-    os.makedirs(scenario_dir)
-    print(f"Created directory: {scenario_dir}")
+    The data is skipped if its content hash matches the manifest and the processed file exists.
 
-required_columns = {'BArt01', 'BArt02', 'BArt03', 'Verl01', 'tot', 'svl', 'lvl'}
+    Args:
+        csv_path (str): Path of the semicolon-separated police accident data.
+        processed_csv_path (str): Path of the processed CSV file.
+        manifest (dict): Manifest of processed inputs, updated in place (default: process unconditionally).
+    """
+    # Print the absolute path for debugging
+    print("Absolute path of the input CSV file:", os.path.abspath(csv_path))
+
+    # Check if the file exists
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"File not found: {csv_path}")
+
+    if manifest is None:
+        manifest = new_manifest()
+
+    input_hash = file_hash(csv_path)
+    if manifest['police_data'].get('input') == input_hash and os.path.exists(processed_csv_path):
+        print("Police accident data unchanged. Skipping.")
+        return
+
+    # Read the CSV file into a DataFrame called 'data'
+    # The CSV file is located at the specified path and is semicolon-separated
+    # The first 9 rows (headers) are skipped during the reading process
+    data = pd.read_csv(csv_path, sep=';', skiprows=9)
+
+    data = add_accident_columns(data)
+
+    # Remove rows with NaN or empty values in the first column (assuming the first column is 'Datum')
+    data.dropna(subset=['Datum'], inplace=True)
+
+    # Save the DataFrame as a CSV file
+    data.to_csv(processed_csv_path, index=False)
+
+    manifest['police_data'] = {'input': input_hash, 'output': os.path.basename(processed_csv_path)}
+
+
+# ======================================================================================
+#               CALCULATION OF BICYCLE INFRASTRUCTURE SCENARIO ACCIDENT COSTS
+# ======================================================================================
+
+
+def compact_scenario_data(data, scenario_id):
+    """
+    Reduce processed scenario data to the columns of the scenario store with compact dtypes.
+
+    Args:
+        data (pd.DataFrame): Processed scenario data.
+        scenario_id (str): Identifier of the scenario.
+
+    Returns:
+        pd.DataFrame: Scenario data keyed by a 'scenario_id' column.
+    """
+    compact = pd.DataFrame({
+        'scenario_id': scenario_id,
+        'BArt01': data['BArt01'].to_numpy(dtype=np.float32),
+        'BArt02': data['BArt02'].to_numpy(dtype=np.float32),
+        'BArt03': data['BArt03'].to_numpy(dtype=np.float32),
+    })
+    for column in scenario_store_columns[3:]:
+        compact[column] = data[column].to_numpy(dtype=np.float64)
+    return compact
+
+
+def process_pkl_files(zip_file, file_names, processed_dir, output_format='parquet', shard_id=0):
+    """
+    Process a shard of the .pkl scenario files of a ZIP archive and save the results.
+
+    The archive is opened here, so that every worker process reads its shard independently.
+    In 'parquet' format the shard is written as one partition of the scenario store, keyed by
+    'scenario_id'. In 'csv' format every scenario is saved as its own CSV file with all columns.
+
+    Args:
+        zip_file (str): Path of the ZIP archive.
+        file_names (list): Names of the .pkl members to process.
+        processed_dir (str): Directory of the scenario store or of the processed CSV files.
+        output_format (str): 'parquet' or 'csv'.
+        shard_id (int): Number of the shard, used to name the store partition.
+
+    Returns:
+        int: Number of processed files.
+    """
+    partition = []
 
-def process_pkl_in_zip(zip_file):
     with zipfile.ZipFile(zip_file, 'r') as z:
-        file_list = [file_name for file_name in z.namelist() if file_name.endswith('.pkl')]
-        
-        if not file_list:
-            print("No .pkl files found in the ZIP archive.")
-            return
-        
-        # Ableitung des Zielordners aus dem ZIP-Dateinamen
-        zip_base_name = os.path.splitext(os.path.basename(zip_file))[0]
-        processed_dir = os.path.join(scenario_dir, f'processed_{zip_base_name}')
-        
-        # Zielordner erstellen, falls er noch nicht existiert
-        if not os.path.exists(processed_dir):
-            os.makedirs(processed_dir)
-            print(f"Created processed directory: {processed_dir}")
-        
-        for file_name in tqdm(file_list, desc="Processing files", unit="file"):
-            print(f"Processing file: {file_name}")
+        for file_name in file_names:
             with z.open(file_name) as f:
                 data = pd.read_pickle(f)
-            
+
             missing_columns = required_columns - set(data.columns)
             if missing_columns:
                 raise ValueError(f"Missing columns in {file_name}: {missing_columns}")
-            
-            data['Ekin Accident'] = data.apply(calculate_ekin_accident, axis=1)
-            
-            data['Epsilon Participant 1'] = data.apply(
-                lambda row: energy_values.get(str(row['BArt01']), 0) / row['Ekin Accident']
-                if row['Ekin Accident'] != 0 and not pd.isna(row['BArt01']) else 0, axis=1
-            )
-
-            data['Epsilon Participant 2'] = data.apply(
-                lambda row: energy_values.get(str(row['BArt02']), 0) / row['Ekin Accident']
-                if row['Ekin Accident'] != 0 and not pd.isna(row['BArt02']) else 0, axis=1
-            )
-
-            data['Epsilon Participant 3'] = data.apply(
-                lambda row: energy_values.get(str(row['BArt03']), 0) / row['Ekin Accident']
-                if row['Ekin Accident'] != 0 and not pd.isna(row['BArt03']) else 0, axis=1
-            )
-            
-            data['Accident Costs'] = data.apply(calculate_accident_costs, axis=1)
-
-            processed_csv_path = os.path.join(processed_dir, file_name.replace('.pkl', '.csv'))
-            data.to_csv(processed_csv_path, index=False)
-            
-            print(f"\nSaved processed file to {processed_csv_path}")
-            print(data.head())
-
-process_pkl_in_zip(zip_file)
+
+            data = add_accident_columns(data)
+
+            if output_format == 'csv':
+                processed_csv_path = os.path.join(processed_dir, file_name.replace('.pkl', '.csv'))
+                data.to_csv(processed_csv_path, index=False)
+            else:
+                scenario_id = os.path.splitext(os.path.basename(file_name))[0]
+                partition.append(compact_scenario_data(data, scenario_id))
+
+    if partition:
+        partition = pd.concat(partition, ignore_index=True)
+        partition['scenario_id'] = partition['scenario_id'].astype('category')
+        partition.to_parquet(os.path.join(processed_dir, f'part-{shard_id:05d}.parquet'), index=False)
+
+    return len(file_names)
+
+
+def process_pkl_in_zip(zip_file, workers=1, shards_per_worker=4, files_per_shard=100, output_format='parquet', manifest=None):
+    """
+    Process the .pkl scenario files of a ZIP archive, optionally on a pool of worker processes.
+
+    Only members that are new or whose content hash changed since the run recorded in the
+    manifest are processed. Outputs of members that were removed or changed are pruned, as are
+    outputs not recorded in the manifest, e.g. partitions written by an interrupted run.
+
+    Args:
+        zip_file (str): Path of the ZIP archive.
+        workers (int): Number of worker processes (1 processes all files in this process).
+        shards_per_worker (int): Number of shards per worker to balance uneven file sizes.
+        files_per_shard (int): Maximum number of files per shard, which bounds the memory of a worker.
+        output_format (str): 'parquet' for the columnar scenario store 'processed_<archive>.parquet',
+            'csv' for one CSV file per scenario in 'processed_<archive>'.
+        manifest (dict): Manifest of processed inputs, updated in place (default: process all files).
+    """
+    member_hashes = zip_member_hashes(zip_file)
+    file_list = list(member_hashes)
+
+    if not file_list:
+        print("No .pkl files found in the ZIP archive.")
+        return
+
+    # Derive the target directory from the ZIP file name
+    zip_base_name = os.path.splitext(os.path.basename(zip_file))[0]
+    processed_dir = os.path.join(scenario_dir, f'processed_{zip_base_name}')
+    if output_format == 'parquet':
+        processed_dir += '.parquet'
+
+    # Create the target directory if it does not exist yet
+    if not os.path.exists(processed_dir):
+        os.makedirs(processed_dir)
+        print(f"Created processed directory: {processed_dir}")
+
+    if manifest is None:
+        manifest = new_manifest()
+
+    recorded_members = manifest['scenarios'].get(os.path.basename(processed_dir), {})
+    kept_members = {name: entry for name, entry in recorded_members.items()
+                    if member_hashes.get(name) == entry['hash'] and os.path.exists(os.path.join(processed_dir, entry['output']))}
+    stale_members = {name: entry for name, entry in recorded_members.items() if name not in kept_members}
+    pending_files = [file_name for file_name in file_list if file_name not in kept_members]
+
+    prune_scenario_outputs(processed_dir, stale_members, kept_members, output_format)
+
+    # Remove outputs that no kept member references, so their scenarios are not read twice after processing them again
+    referenced_outputs = {entry['output'] for entry in kept_members.values()}
+    for output_path in glob.glob(os.path.join(processed_dir, 'part-*.parquet' if output_format == 'parquet' else '*.csv')):
+        if os.path.basename(output_path) not in referenced_outputs:
+            os.remove(output_path)
+    removed_files = [name for name in stale_members if name not in member_hashes]
+    print(f"{len(kept_members)} scenario files unchanged, {len(pending_files)} to process, {len(removed_files)} removed.")
+
+    processed_members = dict(kept_members)
+
+    if pending_files:
+        start = time.perf_counter()
+
+        # Continue the numbering of the store partitions after the existing ones
+        partition_ids = [int(re.findall(r'\d+', os.path.basename(path))[0]) for path in glob.glob(os.path.join(processed_dir, 'part-*.parquet'))]
+        first_shard_id = max(partition_ids, default=-1) + 1
+
+        # Split the files into shards, each one is processed by one worker and becomes one store partition
+        nr_shards = max(workers * shards_per_worker, -(-len(pending_files) // files_per_shard))
+        nr_shards = min(len(pending_files), nr_shards)
+        shards = {first_shard_id + idx: pending_files[idx::nr_shards] for idx in range(nr_shards)}
+
+        with tqdm(total=len(pending_files), desc="Processing files", unit="file") as progress:
+            if workers <= 1:
+                for shard_id, shard in shards.items():
+                    progress.update(process_pkl_files(zip_file, shard, processed_dir, output_format, shard_id))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(process_pkl_files, zip_file, shard, processed_dir, output_format, shard_id)
+                               for shard_id, shard in shards.items()]
+                    for future in as_completed(futures):
+                        progress.update(future.result())
+
+        for shard_id, shard in shards.items():
+            for file_name in shard:
+                if output_format == 'csv':
+                    output = file_name.replace('.pkl', '.csv')
+                else:
+                    output = f'part-{shard_id:05d}.parquet'
+                processed_members[file_name] = {'hash': member_hashes[file_name], 'output': output}
+
+        duration = time.perf_counter() - start
+        print(f"Processed {len(pending_files)} files with {max(workers, 1)} worker(s) in {duration:.1f} s "
+              f"({duration / len(pending_files):.3f} s per file). Saved to {processed_dir}")
+
+    manifest['scenarios'][os.path.basename(processed_dir)] = processed_members
+
+
+def preprocess(workers=1, output_format='parquet', force=False):
+    """
+    Process the police accident data and the bicycle infrastructure scenarios, skipping unchanged inputs.
+
+    Args:
+        workers (int): Number of worker processes for the scenario archive.
+        output_format (str): 'parquet' for the columnar scenario store or 'csv' for one CSV file per scenario.
+        force (bool): Ignore the manifest and process all inputs again.
+    """
+    manifest = new_manifest() if force else load_manifest(manifest_path)
+
+    process_police_data(csv_path, processed_csv_path, manifest)
+    save_manifest(manifest, manifest_path)
+
+    if not os.path.exists(scenario_dir):
+        os.makedirs(scenario_dir)
+        print(f"Created directory: {scenario_dir}")
+
+    process_pkl_in_zip(zip_file, workers=workers, output_format=output_format, manifest=manifest)
+    save_manifest(manifest, manifest_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process police accident data and bicycle infrastructure scenarios.")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes for the scenario archive (default: 1)")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet', help="Output of the scenarios: columnar scenario store or one CSV file per scenario (default: parquet)")
+    parser.add_argument('--force', action='store_true', help="Ignore the manifest and process all inputs again")
+    args = parser.parse_args()
+
+    preprocess(workers=args.workers, output_format=args.format, force=args.force)
@@ -0,0 +1,290 @@
+import json
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+# ======================================================================================
+#                   ENERGY VALUES PER VEHICLE TYPE
+# ======================================================================================
+
+
+# Dictionary of energy values for each vehicle type based on categorisation used in 2019 police data
+energy_values = {
+    '1.0': 8695, # moped
+    '2.0': 8695, # moped
+    '3.0': 754, # pedelec
+    '4.0': 8695, # moped
+    '5.0': 818, # e-scooter
+    '6.0': 591680, # other --> assumption due to missing information
+    '8.0': 591680, # other --> assumption due to missing information
+    '11.0': 13393, # motorcycle
+    '12.0': 13393, # motorcycle
+    '13.0': 13393, # motorcycle
+    '15.0': 13393, # motorcycle
+    '21.0': 74690, # pkw
+    '22.0': 129430, # transporter
+    '31.0': 385719, # bus
+    '32.0': 385719, # bus
+    '33.0': 385719, # bus
+    '34.0': 385719, # bus
+    '40.0': 129430, # transporter
+    '42.0': 129430, # transporter
+    '44.0': 591680, # lkw
+    '46.0': 591680, # lkw
+    '48.0': 591680, # lkw
+    '51.0': 591680, # lkw
+    '53.0': 591680, # lkw
+    '54.0': 591680, # lkw
+    '58.0': 591680, # lkw
+    '59.0': 591680, # lkw
+    '61.0': 850091, # tram
+    '71.0': 704, # bike
+    '72.0': 754, # pedelec
+    '81.0': 84, # pedestrian
+    '83.0': 84, # pedestrian
+    '84.0': 84, # pedestrian
+    '92.0': 591680, # other
+    '93.0': 84, # pedestrian
+}
+
+# Columns holding the vehicle type codes of causer and participants 2 and 3
+participant_columns = ['BArt01', 'BArt02', 'BArt03']
+
+
+def compile_energy_lookup(energy_values):
+    """
+    Compile the energy value dictionary into a numeric lookup array indexed by vehicle type code.
+
+    Args:
+        energy_values (dict): Energy values keyed by vehicle type code as float string (e.g. '71.0').
+
+    Returns:
+        np.ndarray: Lookup array with the energy value at the position of each code and 0 elsewhere.
+    """
+    codes = [int(float(code)) for code in energy_values]
+    lookup = np.zeros(max(codes) + 1, dtype=np.float64)
+    for code, value in zip(codes, energy_values.values()):
+        lookup[code] = value
+    return lookup
+
+
+def lookup_codes(codes, lookup):
+    """
+    Map an array of integral codes through a lookup array along its first axis.
+
+    Codes that are missing, not integral or not contained in the lookup array map to 0.
+
+    Args:
+        codes (np.ndarray): Codes of any shape.
+        lookup (np.ndarray): Lookup array indexed by code, optionally with further axes (e.g. rate sets).
+
+    Returns:
+        np.ndarray: Looked up values of shape 'codes.shape + lookup.shape[1:]'.
+    """
+    codes = np.asarray(codes, dtype=np.float64)
+    valid = np.isfinite(codes) & (codes >= 0) & (codes < len(lookup)) & (codes == np.floor(codes))
+    values = np.zeros(codes.shape + lookup.shape[1:], dtype=np.float64)
+    values[valid] = lookup[codes[valid].astype(np.intp)]
+    return values
+
+
+# Precompiled lookup array for the default energy values
+energy_lookup = compile_energy_lookup(energy_values)
+
+
+def lookup_energy_values(codes, lookup=energy_lookup):
+    """
+    Map an array of vehicle type codes to their energy values.
+
+    Unknown or missing codes map to 0, in line with 'energy_values.get(str(float(code)), 0)'.
+
+    Args:
+        codes (np.ndarray): Vehicle type codes of any shape.
+        lookup (np.ndarray): Precompiled energy lookup array.
+
+    Returns:
+        np.ndarray: Energy values with the same shape as 'codes'.
+    """
+    return lookup_codes(codes, lookup)
+
+
+def calculate_ekin_and_epsilon(data, lookup=energy_lookup):
+    """
+    Calculate 'Ekin Accident' and 'Epsilon Participant 1-3' for all rows in one pass.
+
+    The vehicle type columns BArt01, BArt02 and BArt03 are mapped through the precompiled
+    lookup array at once. The kinetic energy of an accident is the sum of the energy values
+    of all participants, the epsilon of a participant is its share in that sum.
+
+    Args:
+        data (pd.DataFrame): Accident data containing the columns BArt01, BArt02 and BArt03.
+        lookup (np.ndarray): Precompiled energy lookup array.
+
+    Returns:
+        pd.DataFrame: The input data with the four columns added.
+    """
+    codes = np.column_stack([pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=np.float64) for column in participant_columns])
+    energies = lookup_energy_values(codes, lookup)
+    ekin_accident = energies.sum(axis=1)
+
+    epsilon = np.zeros_like(energies)
+    np.divide(energies, ekin_accident[:, np.newaxis], out=epsilon, where=ekin_accident[:, np.newaxis] != 0)
+
+    data['Ekin Accident'] = ekin_accident
+    data['Epsilon Participant 1'] = epsilon[:, 0]
+    data['Epsilon Participant 2'] = epsilon[:, 1]
+    data['Epsilon Participant 3'] = epsilon[:, 2]
+    return data
+
+
+# ======================================================================================
+#                   COST RATES PER ACCIDENT SEVERITY
+# ======================================================================================
+
+
+# Cost rates in € per person killed (tot), severely injured (svl) and lightly injured (lvl), and deduction
+# of the causer's own injury depending on its injury category Verl01, one entry per cost rate set (e.g. price year)
+cost_rates = {
+    '2022': {
+        'tot': 4904583.106,
+        'svl': 688699.75,
+        'lvl': 44573.84,
+        'Verl01': {
+            1.0: 0,
+            2.0: 41471.69,
+            3.0: 551527.60,
+            4.0: 4147816.27,
+        },
+    },
+}
+
+# Cost rate set used for the 'Accident Costs' column of the processed data
+default_cost_rate_set = '2022'
+
+# Columns holding the number of people killed, severely injured and lightly injured
+severity_columns = ['tot', 'svl', 'lvl']
+
+
+def compile_cost_rates(cost_rates):
+    """
+    Compile the cost rate table into arrays with one column per cost rate set.
+
+    Args:
+        cost_rates (dict): Cost rates per cost rate set as defined in 'cost_rates'.
+
+    Returns:
+        tuple: Names of the rate sets, severity rates of shape (3, n_sets) and
+            Verl01 deduction lookup array of shape (max_code + 1, n_sets).
+    """
+    rate_set_names = list(cost_rates)
+    severity_rates = np.array([[cost_rates[name][column] for name in rate_set_names] for column in severity_columns], dtype=np.float64)
+
+    max_code = max(int(code) for name in rate_set_names for code in cost_rates[name]['Verl01'])
+    deduction_lookup = np.zeros((max_code + 1, len(rate_set_names)), dtype=np.float64)
+    for idx, name in enumerate(rate_set_names):
+        for code, deduction in cost_rates[name]['Verl01'].items():
+            deduction_lookup[int(code), idx] = deduction
+
+    return rate_set_names, severity_rates, deduction_lookup
+
+
+def calculate_accident_costs(data, cost_rates=cost_rates):
+    """
+    Calculate the accident costs of all rows for every cost rate set in one call.
+
+    Missing numbers of casualties count as 0. The deduction for the causer's own injury is taken
+    from the Verl01 lookup table, unknown or missing injury categories are not deducted.
+
+    Args:
+        data (pd.DataFrame): Accident data containing the columns tot, svl, lvl and Verl01.
+        cost_rates (dict): Cost rates per cost rate set.
+
+    Returns:
+        pd.DataFrame: Accident costs with one column per cost rate set, indexed like 'data'.
+    """
+    rate_set_names, severity_rates, deduction_lookup = compile_cost_rates(cost_rates)
+
+    casualties = np.column_stack([pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=np.float64) for column in severity_columns])
+    casualties = np.nan_to_num(casualties, nan=0.0)
+    injury_type_causer = pd.to_numeric(data['Verl01'], errors='coerce').to_numpy(dtype=np.float64)
+
+    accident_costs = (
+        casualties[:, [0]] * severity_rates[0]
+        + casualties[:, [1]] * severity_rates[1]
+        + casualties[:, [2]] * severity_rates[2]
+        - lookup_codes(injury_type_causer, deduction_lookup)
+    )
+
+    return pd.DataFrame(accident_costs, index=data.index, columns=rate_set_names)
+
+
+def tables_hash(energy_values=energy_values, cost_rates=cost_rates):
+    """
+    Content hash of the energy value and cost rate tables, used to detect outdated processed data.
+
+    Args:
+        energy_values (dict): Energy values per vehicle type code.
+        cost_rates (dict): Cost rates per cost rate set.
+
+    Returns:
+        str: SHA-256 hex digest of both tables.
+    """
+    tables = json.dumps({'energy_values': energy_values, 'cost_rates': cost_rates}, sort_keys=True, default=str)
+    return hashlib.sha256(tables.encode('utf-8')).hexdigest()
+
+
+# Row-wise references of the former apply based implementation, kept for parity checks
+def calculate_ekin_accident_rowwise(row):
+    ekin_bart01 = energy_values.get(str(float(row['BArt01'])), 0)
+    ekin_bart02 = energy_values.get(str(float(row['BArt02'])), 0)
+    ekin_bart03 = energy_values.get(str(float(row['BArt03'])), 0)
+    return ekin_bart01 + ekin_bart02 + ekin_bart03
+
+
+def calculate_epsilon_rowwise(row, column):
+    if row['Ekin Accident'] != 0 and not pd.isna(row[column]):
+        return energy_values.get(str(row[column]), 0) / row['Ekin Accident']
+    return 0
+
+
+def calculate_accident_costs_rowwise(row):
+    tot_cost = row['tot'] * 4904583.106 if not pd.isna(row['tot']) else 0
+    svl_cost = row['svl'] * 688699.75 if not pd.isna(row['svl']) else 0
+    lvl_cost = row['lvl'] * 44573.84 if not pd.isna(row['lvl']) else 0
+    verl01_cost = {4.0: 4147816.27, 3.0: 551527.60, 2.0: 41471.69}.get(row['Verl01'], 0)
+    return tot_cost + svl_cost + lvl_cost - verl01_cost
+
+
+if __name__ == "__main__":
+    # Synthetic accident data with known, unknown and missing vehicle type codes
+    rng = np.random.default_rng(2022)
+    known_codes = np.array([int(float(code)) for code in energy_values], dtype=np.float64)
+    candidate_codes = np.concatenate([known_codes, [7.0, 99.0, np.nan]])
+    nr_rows = 1000000
+    synthetic_data = pd.DataFrame({column: rng.choice(candidate_codes, nr_rows) for column in participant_columns})
+    for column in severity_columns:
+        synthetic_data[column] = rng.choice([np.nan, 1.0, 2.0, 3.0], nr_rows)
+    synthetic_data['Verl01'] = rng.choice([np.nan, 1.0, 2.0, 3.0, 4.0, 5.0], nr_rows)
+
+    start = time.perf_counter()
+    calculate_ekin_and_epsilon(synthetic_data)
+    synthetic_data['Accident Costs'] = calculate_accident_costs(synthetic_data)[default_cost_rate_set]
+    duration_vectorized = time.perf_counter() - start
+    print(f"Vectorized engine: {nr_rows} rows in {duration_vectorized:.3f} s")
+
+    # Parity check and timing of the row-wise reference on a sample of the synthetic data
+    sample = synthetic_data[participant_columns + severity_columns + ['Verl01']].iloc[:20000].copy()
+    start = time.perf_counter()
+    sample['Ekin Accident'] = sample.apply(calculate_ekin_accident_rowwise, axis=1)
+    for nr, column in enumerate(participant_columns, start=1):
+        sample[f'Epsilon Participant {nr}'] = sample.apply(calculate_epsilon_rowwise, axis=1, column=column)
+    sample['Accident Costs'] = sample.apply(calculate_accident_costs_rowwise, axis=1)
+    duration_rowwise = (time.perf_counter() - start) * nr_rows / len(sample)
+    print(f"Row-wise reference: {nr_rows} rows in {duration_rowwise:.3f} s (extrapolated)")
+    print(f"Speedup: {duration_rowwise / duration_vectorized:.0f}x")
+
+    result_columns = ['Ekin Accident', 'Epsilon Participant 1', 'Epsilon Participant 2', 'Epsilon Participant 3', 'Accident Costs']
+    pd.testing.assert_frame_equal(sample[result_columns], synthetic_data[result_columns].iloc[:len(sample)], check_dtype=False)
+    print("Parity with the row-wise reference confirmed.")
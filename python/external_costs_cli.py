@@ -0,0 +1,325 @@
+import os
+import sys
+import argparse
+import importlib
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.dirname(__file__))
+
+from utils.run_store import default_run_store_path
+
+
+# ======================================================================================
+#                   FIGURES
+# ======================================================================================
+
+
+# Figures of main.ipynb: plot module, plot function and the bundles passed to it in that order
+figures = [
+    ('plots.external_costs_plot_generator', 'generate_air_pollution_costs_plot', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_climate_change_costs_plot', [
+        '1_time_pref_private_bicycle', '0_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '0_time_pref_shared_bicycle',
+        '1_time_pref_private_pedelec', '0_time_pref_private_pedelec', '1_time_pref_shared_pedelec', '0_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_land_use_costs_plot_standard', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_collisions_costs_plot', [
+        '1_time_pref_private_bicycle', 'causer_private_bicycle', '1_time_pref_shared_bicycle', 'causer_shared_bicycle',
+        '1_time_pref_private_pedelec', 'causer_private_pedelec', '1_time_pref_shared_pedelec', 'causer_shared_pedelec']),
+    ('plots.scenario_analysis.bicycle_infrastructure_scenario', 'generate_bicycle_infrastructure_collisions_costs_plot', [
+        '1_time_pref_all_bicycle', 'damage_potential_all_bicycle_infrastructure', 'causer_all_bicycle', 'causer_all_bicycle_infrastructure',
+        '1_time_pref_all_pedelec', 'damage_potential_all_pedelec_infrastructure', 'causer_all_pedelec', 'causer_all_pedelec_infrastructure']),
+    ('plots.external_costs_plot_generator', 'generate_barrier_effects_costs_plot', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_upstream_processes_costs_plot', [
+        '1_time_pref_private_bicycle', '0_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '0_time_pref_shared_bicycle',
+        '1_time_pref_private_pedelec', '0_time_pref_private_pedelec', '1_time_pref_shared_pedelec', '0_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_service_failure_costs_plot', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_external_costs_plot', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_external_costs_without_collisions_plot', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_combined_external_costs_plot', [
+        '1_time_pref_private_bicycle', '0_time_pref_private_bicycle', 'causer_private_bicycle',
+        '1_time_pref_shared_bicycle', '0_time_pref_shared_bicycle', 'causer_shared_bicycle',
+        '1_time_pref_private_pedelec', '0_time_pref_private_pedelec', 'causer_private_pedelec',
+        '1_time_pref_shared_pedelec', '0_time_pref_shared_pedelec', 'causer_shared_pedelec']),
+    ('plots.external_costs_plot_generator', 'generate_external_costs_with_health_benefits_plot', [
+        '1_time_pref_private_bicycle', '1_time_pref_shared_bicycle', '1_time_pref_private_pedelec', '1_time_pref_shared_pedelec']),
+]
+
+# Output formats of the results table
+output_formats = ['csv', 'json', 'parquet']
+
+
+# ======================================================================================
+#                   RESULTS TABLE
+# ======================================================================================
+
+
+def read_results(path):
+    """
+    Read a results table written by the 'compute' command.
+
+    Args:
+        path (str): Path of the table (.csv, .json or .parquet).
+
+    Returns:
+        pd.DataFrame: Results table.
+    """
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.json'):
+        return pd.read_json(path, orient='records')
+    return pd.read_csv(path)
+
+
+def write_results(results, path, output_format):
+    """
+    Write a results table.
+
+    Args:
+        results (pd.DataFrame): Results table.
+        path (str): Path of the output file.
+        output_format (str): 'csv', 'json' or 'parquet'.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if output_format == 'parquet':
+        results.to_parquet(path, index=False)
+    elif output_format == 'json':
+        results.to_json(path, orient='records', indent=2)
+    else:
+        results.to_csv(path, index=False)
+    print(f"Results saved to '{path}'.")
+
+
+def results_by_bundle(results):
+    """
+    Convert a results table into the results dictionaries of ExternalCostsCalculator per bundle.
+
+    Args:
+        results (pd.DataFrame): Results table with the columns 'bundle', 'category', the cost columns and cost components.
+
+    Returns:
+        dict: Results with 'Cost by Category' and 'Total Cost' per bundle.
+    """
+    import pandas as pd
+    from calculation.external_costs_calculator import cost_columns
+
+    value_columns = [column for column in results.columns if column not in ['bundle', 'mode', 'method', 'category']]
+
+    bundles = {}
+    for bundle, rows in results.groupby('bundle', sort=False):
+        bundle_results = {'Cost by Category': {}, 'Total Cost': {}}
+        for row in rows.to_dict(orient='records'):
+            if row['category'] == 'Total':
+                bundle_results['Total Cost'] = {f'total {column}': row[column] for column in cost_columns}
+            else:
+                # Cost components are only set for the categories that have them
+                bundle_results['Cost by Category'][row['category']] = {column: row[column] for column in value_columns if not pd.isna(row[column])}
+        bundles[bundle] = bundle_results
+    return bundles
+
+
+# ======================================================================================
+#                   COMMANDS
+# ======================================================================================
+
+
+def preprocess_command(args):
+    from data_handling.accident_data.collision_data_adaptations import preprocess
+
+    preprocess(workers=args.workers, output_format=args.format, force=args.force)
+
+
+def compute_command(args):
+    from calculation.external_costs import collisions
+    from calculation.external_costs_calculator import ExternalCostsCalculator, check_batch
+    from calculation.external_costs_runner import run, load_run_config, default_config_path
+
+    # Cache of the infrastructure scenario results shared by all collisions calculators
+    if args.cache_dir is not None:
+        collisions.infrastructure_result_cache.directory = args.cache_dir
+    if args.no_cache:
+        collisions.infrastructure_result_cache.enabled = False
+
+    executor = args.executor or ('process' if args.workers > 1 else None)
+
+    if args.modes or args.methods:
+        if not (args.modes and args.methods):
+            raise SystemExit("Both --modes and --methods are required for a batch of modes and method sets.")
+        try:
+            check_batch(args.modes, args.methods)
+        except ValueError as error:
+            raise SystemExit(str(error))
+        results = ExternalCostsCalculator.evaluate_batch(args.modes, args.methods, executor=executor, max_workers=args.workers)
+        results.insert(0, 'bundle', results['method'] + '_' + results['mode'])
+        config = {'modes': args.modes, 'methods': args.methods}
+    else:
+        try:
+            config = load_run_config(args.config or default_config_path)
+        except ValueError as error:
+            raise SystemExit(str(error))
+        results = run(config, executor=executor, max_workers=args.workers)
+
+    write_results(results, args.output or os.path.join('results', f'external_costs_results.{args.format}'), args.format)
+
+    if not args.no_store:
+        from utils.run_store import RunStore
+        from calculation.external_costs_runner import run_metadata
+
+        run_id = RunStore(args.store).add_run(results, run_metadata(config), label=args.label)
+        print(f"Run {run_id} stored in '{args.store}'.")
+
+
+def render_command(args):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    bundles = results_by_bundle(read_results(args.results))
+
+    for module_name, function_name, bundle_names in figures:
+        missing_bundles = [name for name in bundle_names if name not in bundles]
+        if missing_bundles:
+            print(f"Skipping {function_name}: missing bundles {', '.join(missing_bundles)}.")
+            continue
+
+        module = importlib.import_module(module_name)
+        if args.figures_dir is not None:
+            os.makedirs(args.figures_dir, exist_ok=True)
+            module.figures_directory = args.figures_dir
+        getattr(module, function_name)(*[bundles[name] for name in bundle_names])
+        plt.close('all')
+        print(f"Rendered {function_name}.")
+
+
+def export_command(args):
+    results = read_results(args.results)
+
+    if args.wide:
+        results = results.pivot_table(index='bundle', columns='category', values=args.unit, sort=False).reset_index()
+        results.columns.name = None
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip('.') or 'csv'
+    if output_format not in output_formats:
+        raise SystemExit(f"Unsupported output format '{output_format}', expected one of {', '.join(output_formats)}.")
+    write_results(results, args.output, output_format)
+
+
+def runs_command(args):
+    import pandas as pd
+    from utils.run_store import RunStore
+
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(RunStore(args.store).runs().to_string(index=False))
+
+
+def query_command(args):
+    import pandas as pd
+    from utils.run_store import RunStore
+
+    results = RunStore(args.store).query(mode=args.mode, method=args.method, category=args.category, bundle=args.bundle, run_ids=args.runs)
+    results = results.drop(columns=[column for column in ['bundle', 'mode', 'method'] if results[column].isna().all()])
+
+    if args.output is not None:
+        write_results(results, args.output, os.path.splitext(args.output)[1].lstrip('.') or 'csv')
+        return
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(results.drop(columns=['code_version', 'parameter_hash']).to_string(index=False))
+
+
+def diff_command(args):
+    import pandas as pd
+    from utils.run_store import RunStore
+
+    try:
+        diff = RunStore(args.store).diff(args.run_a, args.run_b, unit=args.unit)
+    except KeyError as error:
+        raise SystemExit(error.args[0])
+    if not args.all:
+        diff = diff[~(diff['difference'] == 0)]
+
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(diff.to_string(index=False) if len(diff) else f"Runs {args.run_a} and {args.run_b} have the same {args.unit}.")
+
+
+def build_parser():
+    """
+    Build the argument parser of the command-line interface.
+
+    Returns:
+        argparse.ArgumentParser: Parser with the subcommands preprocess, compute, render, export, runs, query and diff.
+    """
+    parser = argparse.ArgumentParser(prog='python -m external_costs_cli', description="Headless runs of the external costs of bicycles and pedelecs.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    preprocess_parser = subparsers.add_parser('preprocess', help="Process the police accident data and the infrastructure scenarios")
+    preprocess_parser.add_argument('--workers', type=int, default=1, help="Number of worker processes for the scenario archive (default: 1)")
+    preprocess_parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet', help="Output of the scenarios (default: parquet)")
+    preprocess_parser.add_argument('--force', action='store_true', help="Ignore the manifest and process all inputs again")
+    preprocess_parser.set_defaults(function=preprocess_command)
+
+    compute_parser = subparsers.add_parser('compute', help="Compute the external costs of a run configuration or a batch of modes and method sets")
+    compute_parser.add_argument('--config', default=None, help="Run configuration (.json, .yaml, .yml or .toml, default: the study of main.ipynb)")
+    compute_parser.add_argument('--modes', nargs='+', default=None, help="Modes of a batch, e.g. private_bicycle all_pedelec (instead of --config)")
+    compute_parser.add_argument('--methods', nargs='+', default=None, help="Method sets of a batch, e.g. 1_time_pref causer (instead of --config)")
+    compute_parser.add_argument('--workers', type=int, default=1, help="Number of worker processes, more than 1 calculates the categories in parallel (default: 1)")
+    compute_parser.add_argument('--executor', choices=['thread', 'process'], default=None, help="Executor of the parallel calculation (default: process if --workers > 1)")
+    compute_parser.add_argument('--cache-dir', default=None, help="Directory of the infrastructure scenario result cache")
+    compute_parser.add_argument('--no-cache', action='store_true', help="Neither read nor write the infrastructure scenario result cache")
+    compute_parser.add_argument('--format', choices=output_formats, default='csv', help="Format of the results table (default: csv)")
+    compute_parser.add_argument('--output', default=None, help="Path of the results table (default: results/external_costs_results.<format>)")
+    compute_parser.add_argument('--store', default=default_run_store_path, help=f"Run store the results are added to (default: {default_run_store_path})")
+    compute_parser.add_argument('--no-store', action='store_true', help="Do not add the results to the run store")
+    compute_parser.add_argument('--label', default=None, help="Label of the run in the run store")
+    compute_parser.set_defaults(function=compute_command)
+
+    render_parser = subparsers.add_parser('render', help="Render the figures of main.ipynb from a results table")
+    render_parser.add_argument('results', help="Results table written by 'compute'")
+    render_parser.add_argument('--figures-dir', default=None, help="Directory of the figures (default: python/figures)")
+    render_parser.set_defaults(function=render_command)
+
+    export_parser = subparsers.add_parser('export', help="Export a results table to another format or layout")
+    export_parser.add_argument('results', help="Results table written by 'compute'")
+    export_parser.add_argument('output', help="Path of the exported table")
+    export_parser.add_argument('--format', choices=output_formats, default=None, help="Format of the exported table (default: from the file extension)")
+    export_parser.add_argument('--wide', action='store_true', help="One row per bundle and one column per category")
+    export_parser.add_argument('--unit', choices=['cost per vkm', 'cost per pkm', 'cost per year'], default='cost per pkm', help="Costs of the wide table (default: cost per pkm)")
+    export_parser.set_defaults(function=export_command)
+
+    runs_parser = subparsers.add_parser('runs', help="List the runs of the run store")
+    runs_parser.add_argument('--store', default=default_run_store_path, help=f"Run store (default: {default_run_store_path})")
+    runs_parser.set_defaults(function=runs_command)
+
+    query_parser = subparsers.add_parser('query', help="Query the results of all runs of the run store, e.g. --mode shared_pedelec --category Total")
+    query_parser.add_argument('--mode', default=None, help="Mode of the results (default: all modes)")
+    query_parser.add_argument('--method', default=None, help="Method set of the results of batches (default: all method sets)")
+    query_parser.add_argument('--category', default=None, help="Category of the results, Total for the total costs (default: all categories)")
+    query_parser.add_argument('--bundle', default=None, help="Bundle of the results (default: all bundles)")
+    query_parser.add_argument('--runs', type=int, nargs='+', default=None, help="Runs of the results (default: all runs)")
+    query_parser.add_argument('--output', default=None, help="Write the results to a .csv, .json or .parquet file instead of printing them")
+    query_parser.add_argument('--store', default=default_run_store_path, help=f"Run store (default: {default_run_store_path})")
+    query_parser.set_defaults(function=query_command)
+
+    diff_parser = subparsers.add_parser('diff', help="Compare two runs of the run store category by category")
+    diff_parser.add_argument('run_a', type=int, help="First run")
+    diff_parser.add_argument('run_b', type=int, help="Second run, the differences are run b minus run a")
+    diff_parser.add_argument('--unit', choices=['cost per vkm', 'cost per pkm', 'cost per year'], default='cost per pkm', help="Costs of the comparison (default: cost per pkm)")
+    diff_parser.add_argument('--all', action='store_true', help="Show all categories instead of the changed ones")
+    diff_parser.add_argument('--store', default=default_run_store_path, help=f"Run store (default: {default_run_store_path})")
+    diff_parser.set_defaults(function=diff_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()
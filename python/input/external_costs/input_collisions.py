@@ -1,115 +1,440 @@
 import os
+import copy
 import sys
-import pandas as pd
+import hashlib
+import threading
+import numpy as np
 
 # Construct the path to the 'input' directory and add it to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-class InputCollisions:
-    def __init__(self):
+from input.external_costs.parameter_registry import ParameterView
+from utils.thread_locks import PicklableLocks
+
+# Vehicle type codes of bicycles and pedelecs in the police accident data
+vehicle_type_codes = {
+    'bicycle': [71.0],
+    'pedelec': [3.0, 72.0],
+}
+
+# Columns holding the vehicle type of participants 1-3
+participant_columns = ['BArt01', 'BArt02', 'BArt03']
+
+# Columns of the accident data read by the collisions calculator, all others are pruned on load
+accident_store_columns = ['Epsilon Participant 1', 'Epsilon Participant 2', 'Epsilon Participant 3', 'Accident Costs']
+
+
+class InputCollisions(ParameterView, PicklableLocks):
+    # Process-wide shared instance, see InputCollisions.shared()
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+    _lock_attributes = ('_scenario_lock',)
+
+    # Parameters of the registry exposed as attributes, values and sources in parameters_2022.json
+    parameters = (
+        'annual_mileage',
+        'annual_mileage_Munich',
+        'occupancy_rate',
+    )
+
+    def __init__(self, registry=None):
         """
         Initialize the InputCollisions instance and load accident data with fallback.
+
+        The infrastructure scenario data is loaded lazily on first access of 'scenario_variables'.
+        Mileages and occupancy rates are read from the parameter registry.
+
+        Args:
+            registry (ParameterRegistry): Registry of the parameters (default: the shared registry).
         """
+        super().__init__(registry)
+
         base_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'csv')
+        accident_data_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data_handling', 'accident_data')
+
+        # Processed infrastructure scenarios: columnar scenario store, or one CSV file per scenario as fallback
+        processed_dir = os.path.join(accident_data_path, 'accidents_infrastructure_scenario')
+        self.scenario_store_path = os.path.join(processed_dir, 'processed_cycle_lane.parquet') #TODO: adapt for cycle path scenario
+        self.scenario_csv_dir = os.path.join(processed_dir, 'processed_cycle_lane') #TODO: adapt for cycle path scenario
+        self._scenario_data_hash = None
 
-        # Initialize scenario_variables to store processed scenario data
-        self.scenario_variables = {}
+        # Scenario data is loaded on first access of scenario_variables, scenario_store or scenario_participant_index
+        self._scenario_store = None
+        self._scenario_participant_index = None
+        self._scenario_variables = None
+        self._scenario_lock = threading.Lock()
 
         # Define possible data files with priority (first one found will be used)
-        possible_files = [
+        self.possible_files = [
             os.path.join(base_path, 'accident_data_2022_detailed_processed.csv'),  # Primary file
+            os.path.join(accident_data_path, 'accident_data_2022_detailed_processed.csv'),  # Output of collision_data_adaptations.py
             os.path.join(base_path, 'accidents_dummy_processed.csv'),              # Dummy file as fallback
+            os.path.join(accident_data_path, 'accident_dummy_processed.csv'),  # Dummy file shipped with the repository
         ]
 
         # Load data with fallback mechanism
-        accident_data_detailed_2022 = self.load_data_with_fallback(possible_files)
-        if accident_data_detailed_2022 is None:
-            raise FileNotFoundError("No valid accident data file found. Please provide a valid CSV file.")
+        self.load_accident_data()
+
+    @classmethod
+    def shared(cls):
+        """
+        Get the process-wide shared InputCollisions instance, creating it on first use.
+
+        Returns:
+            InputCollisions: Shared instance, so that the accident data is read once per process.
+        """
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @classmethod
+    def invalidate_shared(cls):
+        """
+        Drop the shared instance, so that the next call of shared() reads all accident data again.
+        """
+        with cls._shared_lock:
+            cls._shared_instance = None
+
+    def with_registry(self, registry):
+        """
+        View on the same accident data with the mileages and occupancy rates of another registry,
+        e.g. the sampled parameters of the Monte Carlo engine, without reading the accident data again.
+
+        Args:
+            registry (ParameterRegistry): Registry of the parameters.
+
+        Returns:
+            InputCollisions: New instance sharing the accident and scenario data of this instance.
+        """
+        input_collisions = copy.copy(self)
+        input_collisions._registry = registry
+        return input_collisions
+
+    @property
+    def scenario_variables(self):
+        """
+        Participant row indexes of the infrastructure scenarios into 'scenario_store', loaded on first access.
+
+        Returns:
+            dict: Row index arrays per scenario, vehicle type and participant.
+        """
+        self.load_scenarios()
+        return self._scenario_variables
+
+    @property
+    def scenario_store(self):
+        """
+        Column-pruned accident data of all infrastructure scenarios, loaded on first access.
+
+        Returns:
+            dict: One array per column in 'accident_store_columns' plus the 'scenario_code' of every row.
+        """
+        self.load_scenarios()
+        return self._scenario_store
+
+    @property
+    def scenario_participant_index(self):
+        """
+        Participant row indexes into 'scenario_store' over all infrastructure scenarios, loaded on first access.
+
+        Returns:
+            dict: Row index arrays per vehicle type and participant.
+        """
+        self.load_scenarios()
+        return self._scenario_participant_index
+
+    def load_scenarios(self):
+        """
+        Load the infrastructure scenario data unless it is already loaded.
+        """
+        with self._scenario_lock:
+            if self._scenario_variables is None:
+                self._scenario_store, self._scenario_participant_index, self._scenario_variables = self.load_infrastructure_scenario_data()
+
+    def invalidate(self):
+        """
+        Discard the loaded infrastructure scenario data, it is loaded again on next access.
+        """
+        with self._scenario_lock:
+            self._scenario_store = None
+            self._scenario_participant_index = None
+            self._scenario_variables = None
+            self._scenario_data_hash = None
+
+    def reload(self):
+        """
+        Read the accident data again and discard the loaded infrastructure scenario data.
+        """
+        self.load_accident_data()
+        self.invalidate()
+
+    def scenario_source_files(self):
+        """
+        Files the infrastructure scenario data is loaded from.
+
+        Returns:
+            list: Paths of the partitions of the scenario store, or of the per-scenario CSV files if it does not exist.
+        """
+        if os.path.isdir(self.scenario_store_path):
+            return [os.path.join(self.scenario_store_path, name) for name in sorted(os.listdir(self.scenario_store_path)) if name.endswith('.parquet')]
+        if os.path.exists(self.scenario_store_path):
+            return [self.scenario_store_path]
+        if os.path.exists(self.scenario_csv_dir):
+            return [os.path.join(self.scenario_csv_dir, name) for name in sorted(os.listdir(self.scenario_csv_dir)) if name.endswith('.csv')]
+        return []
 
-        # Annual mileages in vkm
-        self.annual_mileage_private_bicycle = 1103210000 # Source: D. Schröder, L. Kirn, J. Kinigadner, A. Loder, P. Blum, et al., „Ending the myth of mobility at zero costs: An external cost analysis,“ Research in Transportation Economics, vol. 97, p. 101246, 2022, DOI: 10.1016/j.retrec.2022.101246 + R. Follmer and J. Belz, „Mobilität in Deutschland – MiD Kurzreport Stadt München, Münchner Umland und MVV-Verbundraum,“ 2018.
-        self.annual_mileage_shared_bicycle = 1487992.064 # Source: database 
-        self.annual_mileage_Munich_shared_bicycle = 2066574.21 # Source: database mileage extrapolated for all shared bicycles in Munich
+    def scenario_data_hash(self):
+        """
+        Content hash of the infrastructure scenario data, computed without loading the scenarios.
 
-        self.annual_mileage_private_pedelec = 28290000 # Source: D. Schröder, L. Kirn, J. Kinigadner, A. Loder, P. Blum, et al., „Ending the myth of mobility at zero costs: An external cost analysis,“ Research in Transportation Economics, vol. 97, p. 101246, 2022, DOI: 10.1016/j.retrec.2022.101246 + R. Follmer and J. Belz, „Mobilität in Deutschland – MiD Kurzreport Stadt München, Münchner Umland und MVV-Verbundraum,“ 2018.
-        self.annual_mileage_shared_pedelec = 200096.408 # Source: database 
-        self.annual_mileage_Munich_shared_pedelec = 299626.408 # Source: database extrapolated for all shared pedelecs in Munich
+        Returns:
+            str: SHA-256 hex digest over the names and contents of the scenario source files.
+        """
+        with self._scenario_lock:
+            if self._scenario_data_hash is None:
+                digest = hashlib.sha256()
+                for path in self.scenario_source_files():
+                    digest.update(os.path.basename(path).encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(1 << 20), b''):
+                            digest.update(chunk)
+                self._scenario_data_hash = digest.hexdigest()
+            return self._scenario_data_hash
 
-        # Occupancy rates # Source: D. Schröder, L. Kirn, J. Kinigadner, A. Loder, P. Blum, et al., „Ending the myth of mobility at zero costs: An external cost analysis,“ Research in Transportation Economics, vol. 97, p. 101246, 2022, DOI: 10.1016/j.retrec.2022.101246
-        self.occupancy_rate_private_bicycle = 1.0
-        self.occupancy_rate_shared_bicycle = 1.0
-        self.occupancy_rate_private_pedelec = 1.0
-        self.occupancy_rate_shared_pedelec = 1.0
+    def accident_data_hash(self):
+        """
+        Content hash of the accident data read by the collisions calculator, e.g. for the keys of memoized results.
 
-        # Collision data for bicycle (shared and private)
-        self.rows_participant_1_bicycle = accident_data_detailed_2022[accident_data_detailed_2022['BArt01'] == 71.0]
-        self.rows_participant_2_bicycle = accident_data_detailed_2022[accident_data_detailed_2022['BArt02'] == 71.0]
-        self.rows_participant_3_bicycle = accident_data_detailed_2022[accident_data_detailed_2022['BArt03'] == 71.0]
+        Returns:
+            str: SHA-256 hex digest over the accident store and the participant row indexes.
+        """
+        digest = hashlib.sha256()
+        for column in accident_store_columns:
+            digest.update(self.accident_store[column].tobytes())
+        for vehicle_type, participants in self.participant_index.items():
+            for participant, rows in participants.items():
+                digest.update(f'{vehicle_type}_{participant}'.encode('utf-8'))
+                digest.update(rows.tobytes())
+        return digest.hexdigest()
 
-        # Collision data for pedelec (shared and private)
-        self.rows_participant_1_pedelec = accident_data_detailed_2022[(accident_data_detailed_2022['BArt01'] == 3.0) | (accident_data_detailed_2022['BArt01'] == 72.0)]
-        self.rows_participant_2_pedelec = accident_data_detailed_2022[(accident_data_detailed_2022['BArt02'] == 3.0) | (accident_data_detailed_2022['BArt02'] == 72.0)]
-        self.rows_participant_3_pedelec = accident_data_detailed_2022[(accident_data_detailed_2022['BArt03'] == 3.0) | (accident_data_detailed_2022['BArt03'] == 72.0)]
+    @staticmethod
+    def load_data_with_fallback(possible_files):
+        """
+        Load the first existing accident data file.
 
-        # Load scenario data
-        self.load_infrastructure_scenario_data()
+        Args:
+            possible_files (list): Paths of the accident data files in order of priority.
+
+        Returns:
+            pd.DataFrame: Processed accident data, or None if none of the files exists.
+        """
+        # pandas is imported on first use, so importing the collisions calculator stays fast
+        import pandas as pd
+
+        for path in possible_files:
+            if os.path.exists(path):
+                return pd.read_csv(path)
+        return None
+
+    @staticmethod
+    def build_accident_store(data):
+        """
+        Prune the accident data to the columns read by the collisions calculator.
+
+        Args:
+            data (pd.DataFrame): Processed accident data.
+
+        Returns:
+            dict: One float64 array per column in 'accident_store_columns'.
+        """
+        return {column: data[column].to_numpy(dtype=np.float64) for column in accident_store_columns}
+
+    @staticmethod
+    def build_participant_index(data):
+        """
+        Determine the rows in which a bicycle or pedelec is participant 1, 2 or 3.
+
+        Args:
+            data (pd.DataFrame): Accident data containing the columns BArt01, BArt02 and BArt03.
+
+        Returns:
+            dict: Sorted int32 row index arrays per vehicle type and participant.
+        """
+        participant_index = {}
+        for vehicle_type, codes in vehicle_type_codes.items():
+            participant_index[vehicle_type] = {
+                f'participant_{nr}': np.flatnonzero(np.isin(data[column].to_numpy(), codes)).astype(np.int32)
+                for nr, column in enumerate(participant_columns, start=1)
+            }
+        return participant_index
+
+    def participant_values(self, vehicle_type, participant, column):
+        """
+        Read one column of the base accident data for the rows of a participant.
+
+        Args:
+            vehicle_type (str): 'bicycle' or 'pedelec'.
+            participant (int): Participant number 1, 2 or 3.
+            column (str): Column in 'accident_store_columns'.
+
+        Returns:
+            np.ndarray: Values of the column in the rows where the vehicle type is the given participant.
+        """
+        return self.accident_store[column][self.participant_index[vehicle_type][f'participant_{participant}']]
+
+    def load_accident_data(self):
+        """
+        Load the processed accident data and index the collisions of bicycles and pedelecs.
+
+        Instead of one filtered copy of the data per vehicle type and participant, a single column-pruned
+        store is kept together with the row indexes of every vehicle type and participant.
+        """
+        accident_data_detailed_2022 = self.load_data_with_fallback(self.possible_files)
+        if accident_data_detailed_2022 is None:
+            raise FileNotFoundError("No valid accident data file found. Please provide a valid CSV file.")
+
+        # Collision data for bicycle and pedelec (shared and private)
+        self.accident_store = self.build_accident_store(accident_data_detailed_2022)
+        self.participant_index = self.build_participant_index(accident_data_detailed_2022)
 
     def load_infrastructure_scenario_data(self):
         """
         Load and process the accident data for the infrastructure scenario
         specifically for bicycles and pedelecs.
+
+        The columnar scenario store 'processed_cycle_lane.parquet' is read in one bulk operation.
+        If it does not exist, the directory of per-scenario CSV files is read instead.
+        All scenarios share one column-pruned store, each scenario only holds the row indexes of its participants.
+
+        Returns:
+            tuple: Scenario store with one array per column and the 'scenario_code' of every row,
+                the row index arrays per vehicle type and participant over all scenarios,
+                and the row index arrays per scenario, vehicle type and participant.
         """
-        scenario_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'python', 'data_handling', 'accident_data', 'accidents_infrastructure_scenario', 'processed_cycle_lane') #TODO: adapt for cycle path scenario
+        import pandas as pd
+
+        store_path = self.scenario_store_path
+        scenario_dir = self.scenario_csv_dir
+
+        if os.path.exists(store_path):
+            scenario_data = pd.read_parquet(store_path, columns=['scenario_id'] + participant_columns + accident_store_columns)
+            scenario_codes, scenario_names = pd.factorize(scenario_data['scenario_id'])
+            return self.index_scenarios(scenario_data, scenario_codes, list(scenario_names))
+
+        empty_store = {column: np.empty(0, dtype=np.float64) for column in accident_store_columns}
+        empty_store['scenario_code'] = np.empty(0, dtype=np.int32)
+        empty_index = {vehicle_type: {f'participant_{nr}': np.empty(0, dtype=np.int32) for nr in range(1, 4)} for vehicle_type in vehicle_type_codes}
 
         # Check if directory exists
         if not os.path.exists(scenario_dir):
             print(f"Directory does not exist: {scenario_dir}")
-            return
+            return empty_store, empty_index, {}
 
         # Get all CSV files
-        csv_files = [name for name in os.listdir(scenario_dir) if name.endswith('.csv')]
+        csv_files = self.scenario_source_files()
 
         if not csv_files:
             print("No CSV files found in the directory.")
-            return
+            return empty_store, empty_index, {}
 
-        total_files = len(csv_files)
-        # Commenting out the progress display here
-        # print(f"Found {total_files} CSV files to process.")
+        frames = []
+        scenario_names = []
+        for idx, scenario_path in enumerate(csv_files, start=1):
+            try:
+                frame = pd.read_csv(scenario_path, usecols=participant_columns + accident_store_columns)
+                frame['scenario_code'] = len(scenario_names)
+                frames.append(frame)
+                scenario_names.append(f'CSV_{idx}')
 
-        for idx, filename in enumerate(csv_files, start=1):
-            scenario_path = os.path.join(scenario_dir, filename)
-            # Commenting out per-file progress
-            # print(f"Processing file: {filename}")
+            except Exception as e:
+                print(f"Error processing {os.path.basename(scenario_path)}: {e}")
 
-            try:
-                scenario_data = pd.read_csv(scenario_path)
-
-                # Create a combined structure per CSV that holds accident data for bicycles and pedelecs
-                scenario = {
-                    'bicycle': {
-                        'participant_1': scenario_data[scenario_data['BArt01'] == 71.0],
-                        'participant_2': scenario_data[scenario_data['BArt02'] == 71.0],
-                        'participant_3': scenario_data[scenario_data['BArt03'] == 71.0]
-                    },
-                    'pedelec': {
-                        'participant_1': scenario_data[(scenario_data['BArt01'] == 3.0) | (scenario_data['BArt01'] == 72.0)],
-                        'participant_2': scenario_data[(scenario_data['BArt02'] == 3.0) | (scenario_data['BArt02'] == 72.0)],
-                        'participant_3': scenario_data[(scenario_data['BArt03'] == 3.0) | (scenario_data['BArt03'] == 72.0)]
-                    }
-                }
-
-                self.scenario_variables[f'CSV_{idx}'] = scenario
+        if not frames:
+            return empty_store, empty_index, {}
+
+        scenario_data = pd.concat(frames, ignore_index=True)
+        return self.index_scenarios(scenario_data, scenario_data['scenario_code'].to_numpy(), scenario_names)
+
+    def iter_scenario_batches(self):
+        """
+        Read the infrastructure scenarios one batch at a time without keeping them in memory.
+
+        A batch is one partition of the scenario store, or one file of the per-scenario CSV files.
+        Every scenario is expected to be contained in one partition, as written by collision_data_adaptations.py.
+
+        Yields:
+            tuple: Names of the scenarios in the batch, scenario store of the batch with the position of
+                the scenario of every row in 'scenario_code', and the participant row indexes of the batch.
+        """
+        import pandas as pd
+
+        if os.path.exists(self.scenario_store_path):
+            for path in self.scenario_source_files():
+                scenario_data = pd.read_parquet(path, columns=['scenario_id'] + participant_columns + accident_store_columns)
+                scenario_codes, scenario_names = pd.factorize(scenario_data['scenario_id'])
+                yield (list(scenario_names),) + self.build_scenario_store(scenario_data, scenario_codes)
+            return
 
+        for idx, scenario_path in enumerate(self.scenario_source_files(), start=1):
+            try:
+                scenario_data = pd.read_csv(scenario_path, usecols=participant_columns + accident_store_columns)
             except Exception as e:
-                print(f"Error processing {filename}: {e}")
+                print(f"Error processing {os.path.basename(scenario_path)}: {e}")
+                continue
+            yield ([f'CSV_{idx}'],) + self.build_scenario_store(scenario_data, np.zeros(len(scenario_data), dtype=np.int32))
+
+    @classmethod
+    def build_scenario_store(cls, scenario_data, scenario_codes):
+        """
+        Build the column-pruned store and the participant row indexes of scenario data.
+
+        Args:
+            scenario_data (pd.DataFrame): Accident data of one or more scenarios.
+            scenario_codes (np.ndarray): Position of the scenario of every row.
+
+        Returns:
+            tuple: Scenario store including the 'scenario_code' of every row and the row index arrays
+                per vehicle type and participant.
+        """
+        scenario_store = cls.build_accident_store(scenario_data)
+        scenario_store['scenario_code'] = np.asarray(scenario_codes, dtype=np.int32)
+        return scenario_store, cls.build_participant_index(scenario_data)
+
+    @classmethod
+    def index_scenarios(cls, scenario_data, scenario_codes, scenario_names):
+        """
+        Build the shared scenario store and split the participant row indexes by scenario.
+
+        Args:
+            scenario_data (pd.DataFrame): Accident data of all scenarios.
+            scenario_codes (np.ndarray): Position of the scenario of every row in 'scenario_names'.
+            scenario_names (list): Names of the scenarios.
+
+        Returns:
+            tuple: Scenario store, row index arrays per vehicle type and participant over all scenarios
+                and row index arrays per scenario, vehicle type and participant.
+        """
+        scenario_store, participant_index = cls.build_scenario_store(scenario_data, scenario_codes)
+        scenario_codes = scenario_store['scenario_code']
+
+        scenario_variables = {name: {vehicle_type: {} for vehicle_type in vehicle_type_codes} for name in scenario_names}
+        for vehicle_type, participants in participant_index.items():
+            for participant, rows in participants.items():
+                # Stable sort by scenario keeps the rows of each scenario in ascending order
+                rows = rows[np.argsort(scenario_codes[rows], kind='stable')]
+                boundaries = np.searchsorted(scenario_codes[rows], np.arange(1, len(scenario_names)))
+                for name, scenario_rows in zip(scenario_names, np.split(rows, boundaries)):
+                    scenario_variables[name][vehicle_type][participant] = scenario_rows
+
+        return scenario_store, participant_index, scenario_variables
 
 if __name__ == "__main__":
     collisions = InputCollisions()
-    # Example usage: print out the first scenario
+    # Example usage: print out the participant rows per scenario
     for scenario_name, scenario_data in collisions.scenario_variables.items():
         print(f"Scenario: {scenario_name}")
         print("Bicycle Participant 1:")
-        print(scenario_data['bicycle']['participant_1'].head()) 
+        print(collisions.scenario_store['Accident Costs'][scenario_data['bicycle']['participant_1']][:5])
         print("Pedelec Participant 1:")
-        print(scenario_data['pedelec']['participant_1'].head())  
\ No newline at end of file
+        print(collisions.scenario_store['Accident Costs'][scenario_data['pedelec']['participant_1']][:5])
@@ -0,0 +1,301 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+import numpy as np
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from utils.thread_locks import PicklableLocks
+
+
+# Versioned parameter file of the study, read once per process by ParameterRegistry.shared()
+default_parameters_path = os.path.join(os.path.dirname(__file__), 'parameters_2022.json')
+
+
+# ======================================================================================
+#                   PARAMETER TABLE
+# ======================================================================================
+
+
+class ParameterTable:
+    def __init__(self, name, index, keys, values, unit=None, attribute=None):
+        """
+        Initialize an immutable table of one parameter per key, e.g. per mode or per energy type.
+
+        The values are held in a read-only float64 array in the order of 'keys', so tables can be
+        combined into arrays for batched evaluation. Keys without a value are NaN in the array.
+
+        Args:
+            name (str): Name of the parameter.
+            index (str): Kind of the keys, 'mode', 'energy_type' or 'vehicle_class'.
+            keys (list): Keys of the table.
+            values (dict): Values per key as read from the parameter file, missing keys have no value.
+            unit (str): Unit of the values.
+            attribute (str): Attribute name in the Input classes, with a '{mode}' placeholder for mode tables.
+        """
+        self.name = name
+        self.index = index
+        self.keys = tuple(keys)
+        self.unit = unit
+        self.attribute = attribute or (f'{name}_{{mode}}' if index == 'mode' else name)
+        self._items = {key: values[key] for key in self.keys if key in values}
+
+        self.values = np.array([values.get(key, np.nan) for key in self.keys], dtype=np.float64)
+        self.values.flags.writeable = False
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, key, default=None):
+        """
+        Value of a key as given in the parameter file.
+
+        Args:
+            key (str): Key of the table, e.g. a mode.
+            default: Value if the table has no value for the key.
+
+        Returns:
+            Value of the key, or 'default'.
+        """
+        return self._items.get(key, default)
+
+    def to_dict(self):
+        """
+        Values per key as a new dictionary, in the order of the parameter file.
+
+        Returns:
+            dict: Values of all keys that have a value.
+        """
+        return dict(self._items)
+
+    def take(self, keys):
+        """
+        Values of several keys as array, e.g. of the modes of a batch.
+
+        Args:
+            keys (list): Keys of the table.
+
+        Returns:
+            np.ndarray: float64 values in the order of 'keys', NaN for keys without value.
+        """
+        positions = [self.keys.index(key) for key in keys]
+        return self.values[positions]
+
+
+# ======================================================================================
+#                   PARAMETER REGISTRY
+# ======================================================================================
+
+
+def expand_attributes(registry, names, values=None):
+    """
+    Attribute values of an Input class from the parameters of a registry.
+
+    Mode tables are expanded into one attribute per mode (e.g. 'annual_mileage_private_bicycle'),
+    tables per energy type or vehicle class become dictionaries and scalars keep their name.
+
+    Args:
+        registry (ParameterRegistry): Registry of the parameters.
+        names (tuple): Names of the parameters exposed by the Input class.
+        values (callable): Hook that changes the values of a parameter, called with the name and the value
+            of a scalar or the dictionary of a table, e.g. for the samples of a SampledRegistry (default: registry values).
+
+    Returns:
+        dict: Values per attribute name.
+    """
+    attributes = {}
+    for name in names:
+        if name in registry.scalars:
+            attributes[name] = registry.scalars[name] if values is None else values(name, registry.scalars[name])
+            continue
+
+        table = registry.tables[name]
+        table_values = table.to_dict() if values is None else values(name, table.to_dict())
+        if table.index == 'mode':
+            attributes.update({table.attribute.format(mode=mode): value for mode, value in table_values.items()})
+        else:
+            attributes[table.attribute] = table_values
+    return attributes
+
+
+class ParameterRegistry(PicklableLocks):
+    # Process-wide shared instance, see ParameterRegistry.shared()
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+    _lock_attributes = ('_attributes_lock',)
+
+    def __init__(self, path=default_parameters_path):
+        """
+        Initialize the registry of all input parameters from a versioned parameter file.
+
+        Parameters per mode, energy type or vehicle class become ParameterTables, all others are scalars.
+        The registry is not changed after loading, the Input classes are views on it.
+
+        Args:
+            path (str): Path of the parameter file (.json).
+        """
+        with open(path, 'rb') as f:
+            content = f.read()
+        data = json.loads(content.decode('utf-8'))
+
+        self.path = path
+        self.version = data['version']
+        self.data_hash = hashlib.sha256(content).hexdigest()
+        self.modes = tuple(data['modes'])
+        self.sources = dict(data.get('sources', {}))
+
+        self.tables = {}
+        self.scalars = {}
+        self.units = {}
+        for name, entry in data['parameters'].items():
+            self.units[name] = entry.get('unit')
+            if 'value' in entry:
+                self.scalars[name] = entry['value']
+            else:
+                keys = self.modes if entry['index'] == 'mode' else list(entry['values'])
+                self.tables[name] = ParameterTable(name, entry['index'], keys, entry['values'], entry.get('unit'), entry.get('attribute'))
+
+        # Attribute values of the Input classes per list of parameter names, see attributes()
+        self._attributes = {}
+        self._attributes_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """
+        Get the process-wide shared registry, loading the default parameter file on first use.
+
+        Returns:
+            ParameterRegistry: Shared instance, so that the parameter file is read once per process.
+        """
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @classmethod
+    def invalidate_shared(cls):
+        """
+        Drop the shared registry, so that the next call of shared() reads the parameter file again.
+        """
+        with cls._shared_lock:
+            cls._shared_instance = None
+
+    def table(self, name):
+        """
+        Table of a parameter per mode, energy type or vehicle class.
+
+        Args:
+            name (str): Name of the parameter, e.g. 'annual_mileage'.
+
+        Returns:
+            ParameterTable: Table of the parameter.
+        """
+        return self.tables[name]
+
+    def value(self, name):
+        """
+        Value of a scalar parameter.
+
+        Args:
+            name (str): Name of the parameter, e.g. 'net_loss_factor'.
+
+        Returns:
+            Value as given in the parameter file.
+        """
+        return self.scalars[name]
+
+    def mode_table(self, names, modes=None):
+        """
+        Values of several mode parameters as one array, e.g. for a batched evaluation of all modes.
+
+        Args:
+            names (list): Names of mode parameters.
+            modes (list): Modes of the columns (default: all modes of the registry).
+
+        Returns:
+            np.ndarray: float64 array of shape (len(names), len(modes)), NaN where a mode has no value.
+        """
+        modes = self.modes if modes is None else modes
+        return np.vstack([self.tables[name].take(modes) for name in names])
+
+    def attributes(self, names):
+        """
+        Attribute values of an Input class, built once per list of parameter names, see expand_attributes().
+
+        Args:
+            names (tuple): Names of the parameters exposed by the Input class.
+
+        Returns:
+            dict: Values per attribute name, to be treated as read-only.
+        """
+        names = tuple(names)
+        with self._attributes_lock:
+            if names not in self._attributes:
+                self._attributes[names] = expand_attributes(self, names)
+            return self._attributes[names]
+
+
+# ======================================================================================
+#                   PARAMETER VIEW
+# ======================================================================================
+
+
+class ParameterView:
+    # Names of the registry parameters exposed as attributes, defined by each Input class
+    parameters = ()
+
+    def __init__(self, registry=None):
+        """
+        Initialize a view on the parameters of the registry.
+
+        Parameters are read from the registry on attribute access. Setting an attribute on the view
+        overrides the parameter for this instance only, the registry stays unchanged.
+
+        Args:
+            registry (ParameterRegistry): Registry of the parameters (default: the shared registry).
+        """
+        self._registry = registry
+
+    @property
+    def registry(self):
+        """
+        Registry of the parameters of this view.
+
+        Returns:
+            ParameterRegistry: Registry passed on initialization, or the shared registry.
+        """
+        return self._registry if self._registry is not None else ParameterRegistry.shared()
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set on the instance, so overrides take precedence
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attributes = self.registry.attributes(self.parameters)
+        if name not in attributes:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        value = attributes[name]
+        # Dictionaries are copied, so that changing them does not change the registry
+        return dict(value) if isinstance(value, dict) else value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.registry.attributes(self.parameters)))
+
+    def parameter_values(self):
+        """
+        All parameter attributes of the view, including overrides set on the instance.
+
+        Returns:
+            dict: Values per attribute name.
+        """
+        values = dict(self.registry.attributes(self.parameters))
+        values.update({name: value for name, value in vars(self).items() if name in values})
+        return values
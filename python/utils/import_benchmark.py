@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+
+# Modules of the calculation, input and vehicle packages that are imported in the benchmark
+benchmark_modules = [
+    'calculation.external_costs_calculator',
+    'calculation.external_costs_runner',
+    'calculation.external_costs.air_pollution',
+    'calculation.external_costs.barrier_effects',
+    'calculation.external_costs.climate_change',
+    'calculation.external_costs.collisions',
+    'calculation.external_costs.health_benefits',
+    'calculation.external_costs.land_use',
+    'calculation.external_costs.service_failure',
+    'calculation.external_costs.upstream_processes',
+    'vehicles.mvgbike',
+    'vehicles.tierebike',
+]
+
+# Dependencies that must not be loaded by importing a calculation module (plotting stack and database)
+forbidden_modules = ['matplotlib', 'seaborn', 'scienceplots', 'sqlalchemy']
+
+# Heavy dependencies that are reported, the vehicle modules need pandas for their database queries
+heavy_modules = forbidden_modules + ['pandas']
+
+# Dependencies that the calculation modules load on first use only
+lazy_modules = ['pandas']
+
+# Import time budgets in ms by module prefix, the category calculators import numpy for their kernels
+import_budgets_ms = {
+    'calculation.external_costs_calculator': 100,
+    'calculation.external_costs.': 200,
+}
+
+# Script run in a fresh interpreter, so every import starts without cached modules
+measure_script = '''
+import os, sys, json, time, io, contextlib
+sys.path.insert(0, {python_root!r})
+directory = set(os.listdir('.'))
+output = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(output):
+    __import__({module!r})
+duration = time.perf_counter() - start
+print(json.dumps({{
+    'duration_ms': duration * 1000,
+    'heavy_modules': [name for name in {heavy_modules!r} if name in sys.modules],
+    'printed': bool(output.getvalue()),
+    'created': sorted(set(os.listdir('.')) - directory),
+}}))
+'''
+
+
+def measure_import(module, python_root=os.path.join(os.path.dirname(__file__), '..'), repeat=5):
+    """
+    Measure the import of a module in fresh interpreters.
+
+    Args:
+        module (str): Dotted name of the module.
+        python_root (str): Path of the 'python' directory.
+        repeat (int): Number of imports, the fastest one is reported.
+
+    Returns:
+        dict: Import time in ms, loaded heavy modules, whether anything was printed and the files created in the working directory.
+    """
+    script = measure_script.format(python_root=os.path.abspath(python_root), module=module, heavy_modules=heavy_modules)
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {'error': completed.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run['duration_ms'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the import time and side effects of the calculation modules.")
+    parser.add_argument('modules', nargs='*', default=benchmark_modules, help="Modules to import (default: calculation and vehicle modules)")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of imports per module, the fastest one is reported (default: 5)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        result = measure_import(module, repeat=args.repeat)
+        if 'error' in result:
+            print(f"{module:50s} import failed: {result['error']}")
+            failed = True
+            continue
+
+        side_effects = []
+        if result['printed']:
+            side_effects.append('prints')
+        if result['created']:
+            side_effects.append(f"creates {', '.join(result['created'])}")
+        heavy = ', '.join(result['heavy_modules']) or '-'
+        print(f"{module:50s} {result['duration_ms']:8.1f} ms   heavy: {heavy:30s} {'; '.join(side_effects)}")
+
+        budget_ms = next((budget for prefix, budget in import_budgets_ms.items() if module.startswith(prefix)), None)
+        if budget_ms is not None and result['duration_ms'] > budget_ms:
+            print(f"{'':50s} exceeds the import budget of {budget_ms} ms")
+            failed = True
+        if module.startswith('calculation.') and set(result['heavy_modules']) & set(lazy_modules):
+            print(f"{'':50s} loads {', '.join(set(result['heavy_modules']) & set(lazy_modules))} on import")
+            failed = True
+        if side_effects or set(result['heavy_modules']) & set(forbidden_modules):
+            failed = True
+
+    sys.exit(1 if failed else 0)
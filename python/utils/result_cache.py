@@ -0,0 +1,178 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+
+# Add the path to the 'python' directory for importing necessary modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.thread_locks import PicklableLocks
+
+
+# ======================================================================================
+#                   CONTENT HASHES
+# ======================================================================================
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 hash of a file's content in chunks.
+
+    Args:
+        path (str): Path of the file.
+        chunk_size (int): Number of bytes read at once.
+
+    Returns:
+        str: SHA-256 hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(**parts):
+    """
+    Build a content-addressed cache key from JSON serializable parts (input hashes, parameters, code version).
+
+    Args:
+        **parts: Named parts of the key.
+
+    Returns:
+        str: SHA-256 hex digest of the parts.
+    """
+    serialized = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+# ======================================================================================
+#                   RESULT CACHE
+# ======================================================================================
+
+
+class ResultCache(PicklableLocks):
+    def __init__(self, directory, max_entries=64, max_bytes=256 * 1024 * 1024, enabled=True):
+        """
+        Initialize an on-disk result cache with one JSON file per entry.
+
+        The directory is created on the first write. Reading an entry marks it as recently used,
+        when the size limits are exceeded the least recently used entries are evicted.
+
+        Args:
+            directory (str): Directory of the cache files.
+            max_entries (int): Maximum number of cached entries.
+            max_bytes (int): Maximum total size of the cache files in bytes.
+            enabled (bool): If False, nothing is read from or written to the cache.
+        """
+        self.directory = directory
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        """
+        Path of the cache file of an entry.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            str: Path of the JSON file.
+        """
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key):
+        """
+        Read an entry from the cache (read-through).
+
+        Args:
+            key (str): Cache key, see cache_key().
+
+        Returns:
+            dict: Cached result with DataFrames restored, or None if the key is not cached.
+        """
+        if not self.enabled:
+            return None
+
+        path = self.path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                return None
+
+        # pandas is imported on first use, so importing the cache stays fast
+        import pandas as pd
+
+        return {name: pd.DataFrame(**value['frame']) if isinstance(value, dict) and 'frame' in value else value
+                for name, value in entry['value'].items()}
+
+    def put(self, key, value):
+        """
+        Write an entry to the cache (write-through) and evict the least recently used entries if needed.
+
+        Args:
+            key (str): Cache key, see cache_key().
+            value (dict): Result to cache, values are JSON serializable or DataFrames.
+        """
+        self.put_many({key: value})
+
+    def put_many(self, values):
+        """
+        Write several entries to the cache and evict the least recently used entries once afterwards,
+        e.g. the points of a parameter sweep.
+
+        Args:
+            values (dict): Result to cache per cache key, see put().
+        """
+        if not self.enabled:
+            return
+
+        import pandas as pd
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for key, value in values.items():
+                entry = {
+                    'key': key,
+                    'value': {name: {'frame': frame.to_dict(orient='split')} if isinstance(frame, pd.DataFrame) else frame
+                              for name, frame in value.items()},
+                }
+                path = self.path(key)
+                tmp_path = f'{path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, default=float)
+                os.replace(tmp_path, path)
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the entry and size limits are met.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, name = entries.pop(0)
+            os.remove(os.path.join(self.directory, name))
+            total_bytes -= size
+
+    def clear(self):
+        """
+        Remove all entries of the cache.
+        """
+        with self._lock:
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith('.json'):
+                        os.remove(os.path.join(self.directory, name))
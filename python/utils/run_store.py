@@ -0,0 +1,316 @@
+import os
+import json
+import sqlite3
+import contextlib
+import datetime
+import threading
+
+
+# Run store in the results directory of the working directory, like the results table of the 'compute' command
+default_run_store_path = os.path.join('results', 'run_store.sqlite')
+
+# Columns identifying a result row and cost columns of the stored results
+id_columns = ['bundle', 'mode', 'method', 'category']
+cost_columns = ['cost per vkm', 'cost per pkm', 'cost per year']
+
+# Metadata of a run, see calculation.external_costs_runner.run_metadata()
+metadata_columns = ['parameter_hash', 'parameter_version', 'code_version', 'accident_data_hash', 'scenario_data_hash']
+
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    label TEXT,
+    parameter_hash TEXT,
+    parameter_version TEXT,
+    code_version TEXT,
+    accident_data_hash TEXT,
+    scenario_data_hash TEXT,
+    config TEXT,
+    n_rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    bundle TEXT,
+    mode TEXT,
+    method TEXT,
+    category TEXT NOT NULL,
+    cost_per_vkm REAL,
+    cost_per_pkm REAL,
+    cost_per_year REAL,
+    components TEXT,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS results_mode_category ON results (mode, category, run_id);
+CREATE INDEX IF NOT EXISTS results_bundle_category ON results (bundle, category, run_id);
+"""
+
+
+def column_name(cost_column):
+    """
+    Name of a cost column in the 'results' table, e.g. 'cost_per_pkm' for 'cost per pkm'.
+
+    Args:
+        cost_column (str): Cost column of the results table.
+
+    Returns:
+        str: Column of the 'results' table.
+
+    Raises:
+        ValueError: If the column is not a cost column.
+    """
+    if cost_column not in cost_columns:
+        raise ValueError(f"Unknown cost column '{cost_column}', expected one of {', '.join(cost_columns)}.")
+    return cost_column.replace(' ', '_')
+
+
+# ======================================================================================
+#                   RUN STORE
+# ======================================================================================
+
+
+class RunStore:
+    def __init__(self, path=default_run_store_path):
+        """
+        Initialize a persistent store of evaluated runs in an SQLite database.
+
+        Every run is one row of the catalog table 'runs' with its metadata (parameter hash, code version,
+        data hashes, timestamp) and one tidy row per bundle, mode, method set and category in the table 'results',
+        indexed by mode and by bundle, so the results of one mode or bundle over all runs are found without a full scan.
+        The database file is created on the first write.
+
+        Args:
+            path (str): Path of the database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """
+        Open a connection to the database and create its tables if needed.
+
+        Returns:
+            sqlite3.Connection: Connection to the database.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute('PRAGMA foreign_keys = ON')
+            connection.executescript(schema)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def add_run(self, results, metadata=None, label=None):
+        """
+        Store the results table of a run.
+
+        Args:
+            results (pd.DataFrame): Results table of the 'compute' command, with the columns 'category', the cost columns,
+                optionally 'bundle', 'mode' and 'method', and the cost components.
+            metadata (dict): Metadata of the run, see calculation.external_costs_runner.run_metadata(), the key 'config'
+                holds the run configuration.
+            label (str): Label of the run, e.g. the name of a scenario.
+
+        Returns:
+            int: Identifier of the stored run.
+        """
+        # pandas is imported on first use, so the CLI imports the default path of the run store fast
+        import pandas as pd
+
+        metadata = dict(metadata or {})
+        component_columns = [column for column in results.columns if column not in id_columns + cost_columns]
+
+        rows = []
+        for position, row in enumerate(results.to_dict(orient='records')):
+            # Cost components are only set for the categories that have them
+            components = {column: float(row[column]) for column in component_columns if not pd.isna(row[column])}
+            rows.append((
+                position,
+                *(None if pd.isna(row.get(column)) else str(row[column]) for column in id_columns),
+                *(None if pd.isna(row[column]) else float(row[column]) for column in cost_columns),
+                json.dumps(components) if components else None,
+            ))
+
+        created = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+        config = json.dumps(metadata.get('config'), sort_keys=True, default=str) if metadata.get('config') is not None else None
+
+        # The run and its results are written in one transaction, the connection is closed also on errors
+        with self._lock, contextlib.closing(self.connect()) as connection, connection:
+            cursor = connection.execute(
+                f"INSERT INTO runs (created, label, {', '.join(metadata_columns)}, config, n_rows) VALUES (?, ?, {', '.join('?' * len(metadata_columns))}, ?, ?)",
+                (created, label, *(metadata.get(column) for column in metadata_columns), config, len(rows)))
+            run_id = cursor.lastrowid
+            connection.executemany(
+                'INSERT INTO results (run_id, position, bundle, mode, method, category, cost_per_vkm, cost_per_pkm, cost_per_year, components) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, *row) for row in rows])
+        return run_id
+
+    def runs(self):
+        """
+        Catalog of the stored runs.
+
+        Returns:
+            pd.DataFrame: One row per run with the columns 'run_id', 'created', 'label', the metadata columns and 'n_rows'.
+        """
+        import pandas as pd
+
+        with contextlib.closing(self.connect()) as connection:
+            catalog = pd.read_sql_query(f"SELECT run_id, created, label, {', '.join(metadata_columns)}, n_rows FROM runs ORDER BY run_id", connection)
+        return catalog
+
+    def run_config(self, run_id):
+        """
+        Run configuration of a stored run.
+
+        Args:
+            run_id (int): Identifier of the run.
+
+        Returns:
+            dict: Run configuration, None if the run was stored without one.
+
+        Raises:
+            KeyError: If the run is not in the store.
+        """
+        with contextlib.closing(self.connect()) as connection:
+            row = connection.execute('SELECT config FROM runs WHERE run_id = ?', (int(run_id),)).fetchone()
+        if row is None:
+            raise KeyError(f"Run {run_id} is not in the run store '{self.path}'.")
+        return json.loads(row[0]) if row[0] is not None else None
+
+    def query(self, mode=None, method=None, category=None, bundle=None, run_ids=None):
+        """
+        Query the results of all stored runs, e.g. all 'shared_pedelec' totals across runs.
+
+        Args:
+            mode (str): Mode of the results (default: all modes).
+            method (str): Method set of the results (default: all method sets).
+            category (str): Category of the results, 'Total' for the total costs (default: all categories).
+            bundle (str): Bundle of the results (default: all bundles).
+            run_ids (list): Runs of the results (default: all runs).
+
+        Returns:
+            pd.DataFrame: One row per run and result row with the columns 'run_id', 'created', 'label', 'code_version',
+                'parameter_hash', the identifying columns and the cost columns.
+        """
+        import pandas as pd
+
+        conditions, values = [], []
+        for column, value in [('mode', mode), ('method', method), ('category', category), ('bundle', bundle)]:
+            if value is not None:
+                conditions.append(f'results.{column} = ?')
+                values.append(value)
+        if run_ids is not None:
+            run_ids = [int(run_id) for run_id in run_ids]
+            conditions.append(f"results.run_id IN ({', '.join('?' * len(run_ids))})")
+            values.extend(run_ids)
+
+        sql = ('SELECT results.run_id, runs.created, runs.label, runs.code_version, runs.parameter_hash, '
+               f"results.bundle, results.mode, results.method, results.category, {', '.join(f'results.{column_name(column)}' for column in cost_columns)} "
+               'FROM results JOIN runs ON runs.run_id = results.run_id'
+               + (f" WHERE {' AND '.join(conditions)}" if conditions else '')
+               + ' ORDER BY results.run_id, results.position')
+
+        with contextlib.closing(self.connect()) as connection:
+            results = pd.read_sql_query(sql, connection, params=values)
+        return results.rename(columns={column_name(column): column for column in cost_columns})
+
+    def run_results(self, run_id):
+        """
+        Results table of a stored run, as written by the 'compute' command.
+
+        Args:
+            run_id (int): Identifier of the run.
+
+        Returns:
+            pd.DataFrame: Results table with the identifying columns of the run, the cost columns and the cost components.
+
+        Raises:
+            KeyError: If the run is not in the store.
+        """
+        import pandas as pd
+
+        with contextlib.closing(self.connect()) as connection:
+            stored = connection.execute(
+                f"SELECT {', '.join(id_columns)}, {', '.join(column_name(column) for column in cost_columns)}, components "
+                'FROM results WHERE run_id = ? ORDER BY position', (int(run_id),)).fetchall()
+            exists = connection.execute('SELECT 1 FROM runs WHERE run_id = ?', (int(run_id),)).fetchone()
+        if exists is None:
+            raise KeyError(f"Run {run_id} is not in the run store '{self.path}'.")
+
+        # Identifying columns that are set for the run, e.g. no 'method' for runs of a run configuration
+        run_id_columns = [column for position, column in enumerate(id_columns) if any(row[position] is not None for row in stored)]
+
+        rows = []
+        for row in stored:
+            values = dict(zip(id_columns + cost_columns, row[:-1]))
+            rows.append({
+                **{column: values[column] for column in run_id_columns},
+                **{column: float('nan') if values[column] is None else values[column] for column in cost_columns},
+                **(json.loads(row[-1]) if row[-1] is not None else {}),
+            })
+
+        components = [column for column in dict.fromkeys(column for row in rows for column in row) if column not in run_id_columns + cost_columns]
+        return pd.DataFrame(rows, columns=run_id_columns + cost_columns + components)
+
+    def diff(self, run_a, run_b, unit='cost per pkm'):
+        """
+        Compare two stored runs category by category.
+
+        Args:
+            run_a (int): Identifier of the first run.
+            run_b (int): Identifier of the second run.
+            unit (str): Cost column of the comparison (default: 'cost per pkm').
+
+        Returns:
+            pd.DataFrame: One row per bundle, mode, method set and category of either run (as far as both runs set them) with the
+                columns 'run a', 'run b', 'difference' (run b minus run a) and 'relative difference' (relative to run a),
+                missing rows of a run are NaN.
+
+        Raises:
+            KeyError: If a run is not in the store.
+        """
+        import pandas as pd
+
+        column = column_name(unit)
+        with contextlib.closing(self.connect()) as connection:
+            missing = [run_id for run_id in (run_a, run_b) if connection.execute('SELECT 1 FROM runs WHERE run_id = ?', (int(run_id),)).fetchone() is None]
+            sides = {
+                name: pd.read_sql_query(f'SELECT position, {", ".join(id_columns)}, {column} AS "{name}" FROM results WHERE run_id = ?', connection, params=(int(run_id),))
+                for name, run_id in [('run a', run_a), ('run b', run_b)]
+            }
+        if missing:
+            raise KeyError(f"Run {', '.join(map(str, missing))} is not in the run store '{self.path}'.")
+
+        # Rows are matched by the identifying columns set in both runs, e.g. no 'method' for runs of a run configuration
+        keys = [column for column in id_columns if sides['run a'][column].notna().any() and sides['run b'][column].notna().any()]
+
+        # Rows of run a in their order, then the rows only in run b
+        diff = sides['run a'][['position'] + keys + ['run a']].merge(sides['run b'][['position'] + keys + ['run b']], on=keys, how='outer', suffixes=(' a', ' b'))
+        diff = diff.sort_values(['position a', 'position b'], kind='mergesort', na_position='last')
+        diff = diff[keys + ['run a', 'run b']].reset_index(drop=True)
+        diff['difference'] = diff['run b'] - diff['run a']
+        diff['relative difference'] = diff['difference'] / diff['run a'].where(diff['run a'] != 0)
+        return diff
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pandas as pd
+
+    store = RunStore(os.path.join(tempfile.mkdtemp(), 'run_store.sqlite'))
+    results = pd.DataFrame([
+        {'bundle': '1_time_pref_shared_pedelec', 'mode': 'shared_pedelec', 'category': 'Air Pollution', 'cost per vkm': 0.1, 'cost per pkm': 0.1, 'cost per year': 2.0, 'cost per vkm abrasion': 0.05},
+        {'bundle': '1_time_pref_shared_pedelec', 'mode': 'shared_pedelec', 'category': 'Total', 'cost per vkm': 1.0, 'cost per pkm': 1.0, 'cost per year': 20.0},
+    ])
+    run_a = store.add_run(results, {'code_version': 'example'}, label='study')
+    results.loc[1, 'cost per pkm'] = 1.2
+    run_b = store.add_run(results, {'code_version': 'example'}, label='changed')
+
+    print(store.runs())
+    print(store.query(mode='shared_pedelec', category='Total'))
+    print(store.diff(run_a, run_b))
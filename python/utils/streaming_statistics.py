@@ -0,0 +1,206 @@
+import math
+import random
+import numpy as np
+
+
+# ======================================================================================
+#                   RUNNING MEAN AND VARIANCE
+# ======================================================================================
+
+
+class RunningStatistics:
+    def __init__(self):
+        """
+        Initialize running count, mean, variance, minimum and maximum of a stream of values.
+
+        Batches are combined with the parallel form of Welford's algorithm (Chan et al.),
+        so memory is constant in the number of values and two instances can be merged.
+        Missing values (NaN) are skipped, in line with pandas' mean() and std().
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """
+        Add a batch of values.
+
+        Args:
+            values (array-like): Values to add.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        batch = RunningStatistics()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other):
+        """
+        Merge the statistics of another stream into this one.
+
+        Args:
+            other (RunningStatistics): Statistics to merge.
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self, ddof=1):
+        """
+        Variance of the values.
+
+        Args:
+            ddof (int): Delta degrees of freedom, 1 for the sample variance as in pandas.
+
+        Returns:
+            float: Variance, or NaN if there are not enough values.
+        """
+        if self.count - ddof <= 0:
+            return math.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=1):
+        """
+        Standard deviation of the values.
+
+        Args:
+            ddof (int): Delta degrees of freedom, 1 for the sample standard deviation as in pandas.
+
+        Returns:
+            float: Standard deviation, or NaN if there are not enough values.
+        """
+        return math.sqrt(self.variance(ddof))
+
+
+# ======================================================================================
+#                   QUANTILE SKETCH
+# ======================================================================================
+
+
+class QuantileSketch:
+    def __init__(self, k=200, seed=None):
+        """
+        Initialize a mergeable quantile sketch of a stream of values (KLL sketch).
+
+        Values are kept in compactors of increasing weight. A full compactor is sorted and every
+        other value is promoted to the next compactor with twice the weight, so memory grows only
+        logarithmically with the number of values while rank errors stay around 1/k.
+
+        Args:
+            k (int): Capacity of the top compactor, controls accuracy and memory.
+            seed (int): Seed of the random offsets used in the compaction.
+        """
+        self.k = k
+        self.count = 0
+        self.compactors = [[]]
+        self._random = random.Random(seed)
+
+    def capacity(self, level):
+        """
+        Capacity of the compactor at a level, decreasing geometrically below the top level.
+
+        Args:
+            level (int): Level of the compactor, 0 holds the raw values.
+
+        Returns:
+            int: Number of values the compactor can hold before it is compacted.
+        """
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        """
+        Add a batch of values, missing values (NaN) are skipped.
+
+        Args:
+            values (array-like): Values to add.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.compactors[0].extend(values.tolist())
+        self.count += len(values)
+        self.compress()
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch to merge.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, values in enumerate(other.compactors):
+            self.compactors[level].extend(values)
+        self.count += other.count
+        self.compress()
+
+    def compress(self):
+        """
+        Compact all compactors that exceed their capacity.
+        """
+        level = 0
+        while level < len(self.compactors):
+            if len(self.compactors[level]) >= self.capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                values = sorted(self.compactors[level])
+                # An odd value stays at its level, so the total weight is preserved
+                keep = values.pop() if len(values) % 2 else None
+                self.compactors[level + 1].extend(values[self._random.randint(0, 1)::2])
+                self.compactors[level] = [] if keep is None else [keep]
+            level += 1
+
+    def quantile(self, q):
+        """
+        Approximate quantile of the values.
+
+        Args:
+            q (float): Quantile between 0 and 1.
+
+        Returns:
+            float: Approximate quantile, or NaN if no values were added.
+        """
+        items = sorted((value, 2 ** level) for level, values in enumerate(self.compactors) for value in values)
+        if not items:
+            return math.nan
+        total_weight = sum(weight for _, weight in items)
+        cumulative_weight = 0
+        for value, weight in items:
+            cumulative_weight += weight
+            if cumulative_weight >= q * total_weight:
+                return value
+        return items[-1][0]
+
+
+if __name__ == "__main__":
+    # Compare the streaming statistics of one million values in batches with the exact values
+    rng = np.random.default_rng(2022)
+    values = rng.lognormal(mean=2.0, sigma=0.5, size=1000000)
+
+    statistics = RunningStatistics()
+    sketch = QuantileSketch(seed=2022)
+    for batch in np.array_split(values, 1000):
+        statistics.update(batch)
+        sketch.update(batch)
+
+    print(f"Mean: {statistics.mean:.6f} (exact {values.mean():.6f})")
+    print(f"Std:  {statistics.std():.6f} (exact {values.std(ddof=1):.6f})")
+    for q in [0.05, 0.5, 0.95]:
+        print(f"Quantile {q:.2f}: {sketch.quantile(q):.4f} (exact {np.quantile(values, q):.4f})")
+    print(f"Values kept by the sketch: {sum(len(values) for values in sketch.compactors)}")
@@ -0,0 +1,22 @@
+import threading
+
+
+class PicklableLocks:
+    """
+    Base class of objects with thread locks that are sent to worker processes, e.g. with a calculator.
+
+    Locks cannot be pickled, so the attributes named in '_lock_attributes' are left out of the
+    pickled state and replaced by new locks when the object is unpickled.
+    """
+    _lock_attributes = ('_lock',)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._lock_attributes:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name in self._lock_attributes:
+            setattr(self, name, threading.Lock())
@@ -3,32 +3,55 @@ import os
 import pandas as pd
 import numpy as np
 import sys
+import functools
 from datetime import datetime
 
 cdir = os.path.dirname('')
 python_root = os.path.abspath(os.path.join(cdir, 'python'))
 sys.path.append(python_root)
-print('root: ', python_root)
 
-from utils.Config import DBConfig
-from utils.PSQLCommander import PSQLCommander, substitute_sql_placeholders
-from sqlalchemy.engine import URL, create_engine
-
-# DB connection
+# DB configuration
 conf_path = os.path.abspath(os.path.join(python_root, "../config/db.conf"))
 conf_template_path = os.path.abspath(os.path.join(python_root, "../config/db_template.conf"))
-dbconfig = DBConfig(conf_path, conf_template_path)
-con_url = URL.create(drivername="postgresql",
-                    host=dbconfig.host,
-                    port=dbconfig.port,
-                    username=dbconfig.user,
-                    password=dbconfig.password,
-                    database=dbconfig.name)
 
-engine = create_engine(con_url, echo=True)
-connection = engine.raw_connection()
-cursor= connection.cursor()
-psqlcmd = PSQLCommander(cursor)
+
+@functools.lru_cache(maxsize=None)
+def db_connection():
+    """
+    Open the connection to the database on the first query, so importing the module needs no database.
+
+    Returns:
+        Raw DB-API connection of the database configured in config/db.conf.
+    """
+    from utils.Config import DBConfig
+    from sqlalchemy.engine import URL, create_engine
+
+    dbconfig = DBConfig(conf_path, conf_template_path)
+    con_url = URL.create(drivername="postgresql",
+                        host=dbconfig.host,
+                        port=dbconfig.port,
+                        username=dbconfig.user,
+                        password=dbconfig.password,
+                        database=dbconfig.name)
+
+    engine = create_engine(con_url)
+    return engine.raw_connection()
+
+
+def load_sql(sql_path, placeholders):
+    """
+    Read an SQL file and substitute its placeholders.
+
+    Args:
+        sql_path (str): Path of the SQL file.
+        placeholders (dict): Values of the placeholders.
+
+    Returns:
+        str: SQL query.
+    """
+    from utils.PSQLCommander import substitute_sql_placeholders
+
+    return substitute_sql_placeholders(sql_path, placeholders)
 
 
 ###############################################################
@@ -85,38 +108,38 @@ class MVGBike:
 
     @staticmethod
     def number_vehicles_db():
-        sql_mvg_bicycle_number_vehicles = substitute_sql_placeholders(os.path.join(python_root, "..", "sql", "bicycle", "mvg_rad_number_vehicles.sql"),{})
-        mvg_bicycle_number_vehicles =    pd.read_sql(sql_mvg_bicycle_number_vehicles, connection) 
+        sql_mvg_bicycle_number_vehicles = load_sql(os.path.join(python_root, "..", "sql", "bicycle", "mvg_rad_number_vehicles.sql"),{})
+        mvg_bicycle_number_vehicles =    pd.read_sql(sql_mvg_bicycle_number_vehicles, db_connection()) 
         return mvg_bicycle_number_vehicles.loc[0, 'total_count']
     
     @staticmethod
     def annual_mileage_db():
-        sql_mvg_bicycle_annual_mileage = substitute_sql_placeholders(os.path.join(python_root, "..", "sql", "bicycle", "mvgrad_annual_mileage.sql"),{})
-        mvg_bicycle_annual_mileage =    pd.read_sql(sql_mvg_bicycle_annual_mileage, connection) 
+        sql_mvg_bicycle_annual_mileage = load_sql(os.path.join(python_root, "..", "sql", "bicycle", "mvgrad_annual_mileage.sql"),{})
+        mvg_bicycle_annual_mileage =    pd.read_sql(sql_mvg_bicycle_annual_mileage, db_connection()) 
         return mvg_bicycle_annual_mileage.loc[0, 'annual_mileage_km']
     
     @staticmethod
     def annual_idling_db():
-        sql_mvg_bicycle_idling_hours = substitute_sql_placeholders(os.path.join(python_root, "..", "sql", "bicycle", "mvg_rad_annual_idling.sql"),{})
-        mvg_bicycle_annual_idling_hours = pd.read_sql(sql_mvg_bicycle_idling_hours, connection) 
+        sql_mvg_bicycle_idling_hours = load_sql(os.path.join(python_root, "..", "sql", "bicycle", "mvg_rad_annual_idling.sql"),{})
+        mvg_bicycle_annual_idling_hours = pd.read_sql(sql_mvg_bicycle_idling_hours, db_connection()) 
         return mvg_bicycle_annual_idling_hours.loc[0, 'annual_idling_hours']
     
     @staticmethod
     def annual_usage_time_db():
-        sql_mvg_bicycle_usage_time = substitute_sql_placeholders(os.path.join(python_root, "..", "sql", "bicycle", "mvgrad_annual_usage_time.sql"),{})
-        mvg_bicycle_annual_usage_time = pd.read_sql(sql_mvg_bicycle_usage_time, connection) 
+        sql_mvg_bicycle_usage_time = load_sql(os.path.join(python_root, "..", "sql", "bicycle", "mvgrad_annual_usage_time.sql"),{})
+        mvg_bicycle_annual_usage_time = pd.read_sql(sql_mvg_bicycle_usage_time, db_connection()) 
         return mvg_bicycle_annual_usage_time.loc[0, 'usage_time_2022_h']
     
     @staticmethod
     def annual_parking_cost_db():
-        sql_mvg_bicycle_parking_cost= substitute_sql_placeholders(os.path.join(python_root, "..", "sql", "bicycle", "mvgrad_annual_parking_cost.sql"),{})
-        mvg_bicycle_annual_parking_cost = pd.read_sql(sql_mvg_bicycle_parking_cost, connection) 
+        sql_mvg_bicycle_parking_cost= load_sql(os.path.join(python_root, "..", "sql", "bicycle", "mvgrad_annual_parking_cost.sql"),{})
+        mvg_bicycle_annual_parking_cost = pd.read_sql(sql_mvg_bicycle_parking_cost, db_connection()) 
         return mvg_bicycle_annual_parking_cost.loc[0, 'annual_parking_cost_euro']
     
     @staticmethod
     def annual_parking_cost_stations_db():
-        sql_mvg_bicycle_parking_cost_stations = substitute_sql_placeholders(os.path.join(python_root, "..", "sql", "bicycle", "mvg_rad_stations_LU.sql"),{})
-        mvg_bicycle_annual_parking_cost_stations = pd.read_sql(sql_mvg_bicycle_parking_cost_stations, connection) 
+        sql_mvg_bicycle_parking_cost_stations = load_sql(os.path.join(python_root, "..", "sql", "bicycle", "mvg_rad_stations_LU.sql"),{})
+        mvg_bicycle_annual_parking_cost_stations = pd.read_sql(sql_mvg_bicycle_parking_cost_stations, db_connection()) 
         return mvg_bicycle_annual_parking_cost_stations.loc[0, 'annual_stations_cost_euro']
     
     
\ No newline at end of file